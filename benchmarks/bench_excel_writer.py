@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel 生成性能测试
+对比原来的普通模式写入（所有单元格保留在内存中、每个表头单元格新建样式对象、写入后逐个读取单元格计算列宽）
+与只写模式逐行写入的耗时和进程内存峰值；每种方式在单独的子进程中运行，内存峰值互不影响
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import zip_longest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openpyxl
+from modules.table_record import TableRecord
+from modules.excel_generator import ExcelGenerator
+from modules.table_cleaner import clean_table_name
+
+# 提取来源和 schema 的取值
+SOURCES = ['XML', 'Java SQL', '@TableName', '@Select', '@Insert', '@Update', '@Delete']
+SCHEMAS = ['master', 'slave', 'mdb']
+
+
+def build_records(count, files, seed):
+    """
+    生成表信息记录，约 1% 的表名会被清洗规则排除
+    :param count: 记录数量
+    :param files: 来源文件数量
+    :param seed: 随机种子
+    :return: 表信息列表
+    """
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        file_index = rng.randrange(files)
+        extension = '.xml' if file_index % 3 == 0 else '.java'
+        table_name = f"t_table_{rng.randrange(count // 10 + 1)}"
+        if rng.random() < 0.01:
+            table_name = "${tableName}"
+        records.append(TableRecord(rng.choice(SOURCES), table_name, f"UserOrderService{file_index}{extension}",
+                                   rng.randrange(1, 2000), rng.choice(SCHEMAS)))
+    return records
+
+
+def _header(cell):
+    """按原来的方式为表头单元格新建样式对象"""
+    from openpyxl.styles import Font, PatternFill, Alignment
+    cell.font = Font(bold=True, color="FFFFFF")
+    cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    cell.alignment = Alignment(horizontal="center", vertical="center")
+
+
+def _fit_columns(ws, columns):
+    """按原来的方式写入后逐个读取单元格计算列宽"""
+    for col in range(1, columns + 1):
+        max_length = 0
+        for row_num in range(1, ws.max_row + 1):
+            value = ws.cell(row=row_num, column=col).value
+            if value:
+                max_length = max(max_length, len(str(value)))
+        ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = max(max_length + 2, 10)
+
+
+def _fill_records(ws, records):
+    """按原来的方式填充原始表信息或清洗后表信息工作表"""
+    headers = ["来源", "schema", "表名", "来源文件名称", "表名所在行号"]
+    max_lengths = [len(header) for header in headers]
+    for col, header in enumerate(headers, 1):
+        _header(ws.cell(row=1, column=col, value=header))
+    for row, table_info in enumerate(records, 2):
+        values = (table_info.source, table_info.schema, table_info.table_name, table_info.file_name, table_info.line_num)
+        for col, value in enumerate(values, 1):
+            ws.cell(row=row, column=col, value=value)
+            if value:
+                max_lengths[col - 1] = max(max_lengths[col - 1], len(str(value)))
+    for col, max_length in enumerate(max_lengths, 1):
+        ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = max_length + 2
+
+
+def legacy_clean(table_info):
+    """
+    按原来的方式清洗单条表信息：每条记录生成一条新的清洗后记录
+    :param table_info: 表信息
+    :return: 清洗后的表信息，应被排除时返回 None
+    """
+    table_name = clean_table_name(table_info.table_name)
+    if table_name is None:
+        return None
+    return TableRecord(table_info.source, table_name, table_info.file_name, table_info.line_num, table_info.schema)
+
+
+def legacy_generate(excel_path, records):
+    """
+    按原来的方式生成 Excel 文件：普通模式工作簿，生成结果与 ExcelGenerator.generate() 一致
+    :param excel_path: Excel 文件路径
+    :param records: 表信息列表
+    """
+    generator = ExcelGenerator(excel_path)
+    sort_key = generator._sort_key
+    wb = openpyxl.Workbook()
+    ws1 = wb.active
+    ws1.title = "原始表信息"
+    _fill_records(ws1, sorted(records, key=sort_key))
+    
+    cleaned = sorted(filter(None, map(legacy_clean, records)), key=sort_key)
+    _fill_records(wb.create_sheet(title="清洗后表信息"), cleaned)
+    
+    seen = set()
+    deduplicated = []
+    for table_info in cleaned:
+        if (table_info.schema, table_info.table_name) not in seen:
+            seen.add((table_info.schema, table_info.table_name))
+            deduplicated.append(table_info)
+    ws3 = wb.create_sheet(title="去重后表信息")
+    for col, header in enumerate(["schema", "表名"], 1):
+        _header(ws3.cell(row=1, column=col, value=header))
+    for row, table_info in enumerate(sorted(deduplicated, key=lambda x: (x.schema, x.table_name)), 2):
+        ws3.cell(row=row, column=1, value=table_info.schema)
+        ws3.cell(row=row, column=2, value=table_info.table_name)
+    _fit_columns(ws3, 2)
+    
+    file_types = {}
+    table_counts = {}
+    for table_info in records:
+        generator._count_file_type(table_info.file_name, file_types, table_counts)
+    ws4 = wb.create_sheet(title="文件统计信息")
+    for col, header in enumerate(["文件类型", "文件数量", "提取表数", "平均每文件"], 1):
+        _header(ws4.cell(row=1, column=col, value=header))
+    for row, file_type in enumerate(['Java 文件', 'XML 文件', '其他文件'], 2):
+        file_count = len(file_types.get(file_type, set()))
+        table_count = table_counts.get(file_type, 0)
+        ws4.cell(row=row, column=1, value=file_type)
+        ws4.cell(row=row, column=2, value=file_count)
+        ws4.cell(row=row, column=3, value=table_count)
+        ws4.cell(row=row, column=4, value=round(table_count / file_count if file_count > 0 else 0, 2))
+    _fit_columns(ws4, 4)
+    
+    schema_counts = {}
+    for table_info in sorted(deduplicated, key=sort_key):
+        schema_counts[table_info.schema] = schema_counts.get(table_info.schema, 0) + 1
+    ws5 = wb.create_sheet(title="处理总结")
+    _header(ws5.cell(row=1, column=1, value="项目信息"))
+    summary = [("原始记录数", len(records)), ("清洗后记录数", len(cleaned)),
+               ("清洗掉的记录数", len(records) - len(cleaned)), ("去重后记录数", len(deduplicated)),
+               ("去重掉的记录数", len(cleaned) - len(deduplicated))]
+    for row, (label, value) in enumerate(summary, 2):
+        ws5.cell(row=row, column=1, value=label)
+        ws5.cell(row=row, column=2, value=value)
+    _header(ws5.cell(row=8, column=1, value="Schema 统计"))
+    for row, (schema, count) in enumerate(schema_counts.items(), 9):
+        ws5.cell(row=row, column=1, value=f"{schema}")
+        ws5.cell(row=row, column=2, value=count)
+    _fit_columns(ws5, 2)
+    wb.save(excel_path)
+
+
+def peak_rss_mb():
+    """
+    当前进程的内存峰值（MB），不支持的平台返回 None
+    :return: 内存峰值
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 上单位为 KB，macOS 上为字节
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_mode(mode, args, excel_path):
+    """
+    在当前进程中运行一种生成方式
+    :param mode: legacy 或 write_only
+    :param args: 命令行参数
+    :param excel_path: Excel 文件路径
+    :return: (生成前内存峰值, 生成耗时, 生成后内存峰值)
+    """
+    records = build_records(args.records, args.files, args.seed)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == 'legacy':
+        legacy_generate(excel_path, records)
+    else:
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            ExcelGenerator(excel_path).generate(records)
+    return baseline, time.perf_counter() - start, peak_rss_mb()
+
+
+def _trim(row):
+    """去掉行尾的空单元格"""
+    row = list(row or ())
+    while row and row[-1] is None:
+        row.pop()
+    return row
+
+
+def same_content(first_path, second_path):
+    """
+    比较两个 Excel 文件所有工作表的单元格内容
+    只写模式生成的工作表没有记录区域范围，只读加载时各行不会补齐到相同列数，比较时忽略行尾的空单元格
+    :param first_path: 第一个 Excel 文件路径
+    :param second_path: 第二个 Excel 文件路径
+    :return: 是否一致
+    """
+    first = openpyxl.load_workbook(first_path, read_only=True)
+    second = openpyxl.load_workbook(second_path, read_only=True)
+    try:
+        if first.sheetnames != second.sheetnames:
+            return False
+        for name in first.sheetnames:
+            rows = zip_longest(first[name].iter_rows(values_only=True), second[name].iter_rows(values_only=True))
+            if any(_trim(first_row) != _trim(second_row) for first_row, second_row in rows):
+                return False
+        return True
+    finally:
+        first.close()
+        second.close()
+
+
+def main():
+    """性能测试入口"""
+    parser = argparse.ArgumentParser(description="Excel 生成性能测试")
+    parser.add_argument("--records", type=int, default=200000, help="记录数量")
+    parser.add_argument("--files", type=int, default=5000, help="来源文件数量")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--no-verify", action="store_true", help="不比较两种方式生成的文件内容")
+    parser.add_argument("--mode", choices=['legacy', 'write_only'], help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.mode:
+        # 子进程：运行一种生成方式并输出测量结果
+        baseline, seconds, peak = run_mode(args.mode, args, args.output)
+        print(json.dumps({'baseline': baseline, 'seconds': seconds, 'peak': peak}))
+        return
+    
+    print(f"记录数量: {args.records}, 来源文件数量: {args.files}")
+    with tempfile.TemporaryDirectory(prefix='find_table_bench_') as temp_dir:
+        outputs = {}
+        for mode, name in (('legacy', '普通模式'), ('write_only', '只写模式')):
+            outputs[mode] = os.path.join(temp_dir, f"{mode}.xlsx")
+            command = [sys.executable, os.path.abspath(__file__), '--mode', mode, '--output', outputs[mode],
+                       '--records', str(args.records), '--files', str(args.files), '--seed', str(args.seed)]
+            result = json.loads(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+            if result['peak'] is None:
+                print(f"{name}: 耗时 {result['seconds']:.2f} 秒（当前平台不支持统计内存峰值）")
+            else:
+                print(f"{name}: 耗时 {result['seconds']:.2f} 秒, 进程内存峰值 {result['peak']:.1f} MB"
+                      f"（生成前 {result['baseline']:.1f} MB）")
+        
+        if not args.no_verify:
+            if not same_content(outputs['legacy'], outputs['write_only']):
+                print("错误: 两种方式生成的文件内容不一致")
+                sys.exit(1)
+            print("生成的文件内容一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件扫描性能测试
+对比基于 glob 的多次遍历策略与基于 os.scandir 的单次遍历策略
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.file_scanner import DEFAULT_PRUNE_DIRS, FileScanner
+
+
+def glob_scan(project_path):
+    """
+    原有的 glob 扫描策略：先查找所有 main 目录，再分别递归查找 Java 和 XML 文件
+    :param project_path: 项目路径
+    :return: 扫描到的文件列表
+    """
+    files = []
+    main_dirs = glob.glob(os.path.join(project_path, "**", "main"), recursive=True)
+    for main_dir in main_dirs:
+        if os.path.isdir(main_dir):
+            files.extend(glob.glob(os.path.join(main_dir, "**", "*.java"), recursive=True))
+            files.extend(glob.glob(os.path.join(main_dir, "**", "*.xml"), recursive=True))
+    if not files:
+        files.extend(glob.glob(os.path.join(project_path, "**", "*.java"), recursive=True))
+        files.extend(glob.glob(os.path.join(project_path, "**", "*.xml"), recursive=True))
+    return list(set(files))
+
+
+def expected_scan(project_path):
+    """
+    glob 扫描结果中去掉位于 main 目录之外的构建产物、依赖目录下的文件，
+    即单次遍历策略应当返回的文件；main 目录下名为 build、target 的 Java 包必须保留
+    :param project_path: 项目路径
+    :return: 文件列表
+    """
+    files = []
+    for file_path in glob_scan(project_path):
+        parts = os.path.relpath(file_path, project_path).split(os.sep)[:-1]
+        outside_main = parts[:parts.index('main')] if 'main' in parts else parts
+        if not any(part in DEFAULT_PRUNE_DIRS for part in outside_main):
+            files.append(file_path)
+    return files
+
+
+def scandir_scan(project_path):
+    """
+    新的单次遍历扫描策略
+    :param project_path: 项目路径
+    :return: 扫描到的文件列表
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        return FileScanner(project_path).scan()
+
+
+def build_tree(root, modules, files_per_module):
+    """
+    生成测试用的项目目录结构，包含 main 目录、构建产物、依赖目录，
+    以及 main 目录下与构建产物目录同名的 Java 包（如 com/acme/build、com/acme/target）
+    :param root: 根目录
+    :param modules: 模块数量
+    :param files_per_module: 每个模块的源文件数量
+    """
+    for m in range(modules):
+        module_dir = os.path.join(root, f"module{m}")
+        layouts = [
+            os.path.join(module_dir, "src", "main", "java", "com", "example", f"pkg{m}"),
+            os.path.join(module_dir, "src", "main", "resources", "mapper"),
+            os.path.join(module_dir, "src", "main", "java", "com", "acme", "build"),
+            os.path.join(module_dir, "src", "main", "java", "com", "acme", "target"),
+            os.path.join(module_dir, "src", "test", "java", "com", "example"),
+            os.path.join(module_dir, "target", "classes", "main"),
+            os.path.join(module_dir, "node_modules", "lib", "main"),
+        ]
+        for layout in layouts:
+            os.makedirs(layout, exist_ok=True)
+            for i in range(files_per_module):
+                ext = ".xml" if "resources" in layout else ".java"
+                with open(os.path.join(layout, f"File{i}{ext}"), "w") as f:
+                    f.write("// generated\n")
+            with open(os.path.join(layout, "README.md"), "w") as f:
+                f.write("generated\n")
+
+
+def measure(func, project_path, repeat):
+    """
+    多次执行扫描并返回最短耗时
+    :param func: 扫描函数
+    :param project_path: 项目路径
+    :param repeat: 重复次数
+    :return: 最短耗时(秒), 文件数量
+    """
+    best = None
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(func(project_path))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+
+def main():
+    """性能测试入口"""
+    parser = argparse.ArgumentParser(description="文件扫描性能测试")
+    parser.add_argument("--modules", type=int, default=200, help="模块数量")
+    parser.add_argument("--files-per-module", type=int, default=40, help="每个目录的文件数量")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数")
+    parser.add_argument("--path", help="使用已有的项目目录，而不是生成测试目录")
+    args = parser.parse_args()
+    
+    temp_dir = None
+    project_path = args.path
+    if not project_path:
+        temp_dir = tempfile.mkdtemp(prefix="bench_scanner_")
+        project_path = temp_dir
+        build_tree(project_path, args.modules, args.files_per_module)
+    
+    try:
+        print(f"项目目录: {project_path}")
+        glob_time, glob_count = measure(glob_scan, project_path, args.repeat)
+        scandir_time, scandir_count = measure(scandir_scan, project_path, args.repeat)
+        print(f"glob 策略:    {glob_time:.3f} 秒, {glob_count} 个文件")
+        print(f"scandir 策略: {scandir_time:.3f} 秒, {scandir_count} 个文件")
+        if scandir_time > 0:
+            print(f"加速比: {glob_time / scandir_time:.2f}x")
+        
+        if sorted(scandir_scan(project_path)) != sorted(expected_scan(project_path)):
+            print("错误: 单次遍历策略的扫描结果与 glob 策略（去掉构建产物目录后）不一致")
+            sys.exit(1)
+        print("扫描结果一致")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
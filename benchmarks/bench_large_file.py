@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+大文件提取性能测试
+对比完整读取并解码文件与内存映射、只解码匹配所在窗口两种方式的耗时和内存峰值
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.file_context import FileContext
+from modules.extractors.extractor_manager import ExtractorManager
+
+# 生成 MyBatis Mapper 文件使用的代码行模板
+LINE_TEMPLATES = [
+    '    <select id="find{n}" resultType="map">',
+    '        SELECT id, name, status',
+    '        FROM user_table_{n} u',
+    '        LEFT JOIN order_table_{n} o ON u.id = o.user_id',
+    '        WHERE u.id = #{{id}} AND o.status IN (1, 2, 3)',
+    '    </select>',
+    '    <insert id="insert{n}">',
+    '        INSERT INTO audit_log_{n} (id, message) VALUES (#{{id}}, #{{message}})',
+    '    </insert>',
+    '    <resultMap id="result{n}" type="com.example.entity.User{n}">',
+    '        <result column="user_name_{n}" property="userName{n}"/>',
+    '        <result column="create_time_{n}" property="createTime{n}"/>',
+    '    </resultMap>',
+    '    <!-- 生成的映射说明 {n} -->',
+]
+
+# 测试模式: (名称, 内存映射阈值)
+MODES = [
+    ('完整读取', None),
+    ('内存映射', 1),
+]
+
+
+def build_mapper(path, size_mb, seed):
+    """
+    生成指定大小的 Mapper 文件
+    :param path: 文件路径
+    :param size_mb: 文件大小（MB）
+    :param seed: 随机种子
+    """
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    size = 0
+    n = 0
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<mapper namespace="com.example.mapper.BigMapper">\n')
+        while size < target:
+            line = rng.choice(LINE_TEMPLATES).format(n=n) + '\n'
+            f.write(line)
+            size += len(line)
+            n += 1
+        f.write('</mapper>\n')
+
+
+def extract(path, mmap_threshold):
+    """
+    提取单个文件中的表名
+    :param path: 文件路径
+    :param mmap_threshold: 内存映射阈值
+    :return: 表信息列表
+    """
+    manager = ExtractorManager()
+    with FileContext.from_path(path, mmap_threshold) as context:
+        table_info = manager.extract_from_context(context)
+        context.ds_findings()
+    return table_info
+
+
+def measure(path, mmap_threshold, repeat):
+    """
+    测量提取耗时和 Python 内存分配峰值
+    :param path: 文件路径
+    :param mmap_threshold: 内存映射阈值
+    :param repeat: 重复次数
+    :return: 最短耗时(秒), 内存峰值(字节), 提取结果
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extract(path, mmap_threshold)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    
+    # 内存峰值单独测量，避免 tracemalloc 的开销计入耗时
+    tracemalloc.start()
+    extract(path, mmap_threshold)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    """性能测试入口"""
+    parser = argparse.ArgumentParser(description="大文件提取性能测试")
+    parser.add_argument("--size-mb", type=float, default=32.0, help="测试文件大小（MB）")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--path", help="测试文件路径，默认生成到临时目录")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = args.path
+        if not path:
+            path = os.path.join(temp_dir, 'BigMapper.xml')
+            build_mapper(path, args.size_mb, args.seed)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"测试文件: {path} ({size_mb:.2f} MB)")
+        
+        results = {}
+        for name, mmap_threshold in MODES:
+            elapsed, peak, table_info = measure(path, mmap_threshold, args.repeat)
+            results[name] = table_info
+            print(f"{name}: {elapsed * 1000:.1f} 毫秒, 内存峰值 {peak / (1024 * 1024):.1f} MB, {len(table_info)} 条")
+        
+        expected = results[MODES[0][0]]
+        if any(table_info != expected for table_info in results.values()):
+            print("错误: 两种方式的提取结果不一致")
+            sys.exit(1)
+        print("提取结果一致")
+
+
+if __name__ == "__main__":
+    main()
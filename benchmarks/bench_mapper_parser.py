@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mapper 片段解析性能测试
+生成通过 include 引用公共 sql 片段的 Mapper 文件，对比每次引用都重新解析片段所在文件与符号索引缓存片段的耗时
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.file_context import FileContext
+from modules.mapper_parser import fragment_text, parse_mapper
+from modules.symbol_index import SymbolIndex
+from modules.extractors.xml_extractor import XMLExtractor
+
+# 公共片段所在 Mapper 的命名空间
+COMMON_NAMESPACE = "com.bench.mapper.CommonMapper"
+
+
+def build_sources(fragments, mappers, includes):
+    """
+    生成公共片段 Mapper 和引用片段的 Mapper 文件内容
+    :param fragments: 公共 sql 片段数量
+    :param mappers: Mapper 文件数量
+    :param includes: 每个 Mapper 文件中的 include 数量
+    :return: 公共 Mapper 内容, Mapper 内容列表
+    """
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<mapper namespace="{COMMON_NAMESPACE}">']
+    for index in range(fragments):
+        lines.append(f'  <sql id="table{index}">t_common_{index} c{index}</sql>')
+        # 嵌套引用其他片段
+        lines.append(f'  <sql id="join{index}">LEFT JOIN <include refid="table{index}"/> ON 1 = 1</sql>')
+    lines.append('</mapper>')
+    common = '\n'.join(lines) + '\n'
+    
+    mapper_contents = []
+    for mapper_index in range(mappers):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 f'<mapper namespace="com.bench.mapper.OrderMapper{mapper_index}">']
+        for index in range(includes):
+            fragment_index = (mapper_index + index) % fragments
+            lines.append(f'  <select id="query{index}">')
+            lines.append(f'    SELECT * FROM t_order_{mapper_index} o')
+            lines.append(f'    <include refid="{COMMON_NAMESPACE}.join{fragment_index}"/>')
+            lines.append(f'    WHERE o.id IN (SELECT id FROM <include refid="{COMMON_NAMESPACE}.table{fragment_index}"/>)')
+            lines.append('  </select>')
+        lines.append('</mapper>')
+        mapper_contents.append('\n'.join(lines) + '\n')
+    return common, mapper_contents
+
+
+class ReparsingIndex:
+    """每次引用片段都重新解析片段所在文件的查找方式"""
+    
+    def __init__(self, files):
+        """
+        :param files: 命名空间到片段所在文件内容的映射
+        """
+        self.files = files
+    
+    def resolve_fragment(self, namespace, fragment_id):
+        content = self.files.get(namespace)
+        if content is None:
+            return None
+        document = parse_mapper(FileContext(namespace, content=content), fragments_only=True)
+        fragment = document.fragments.get(fragment_id)
+        if fragment is None:
+            return None
+        return fragment_text(fragment, namespace, self.resolve_fragment)
+
+
+def extract_all(index, mapper_contents):
+    """
+    使用给定的片段查找方式提取所有 Mapper 文件中的表名
+    :param index: 片段查找方式
+    :param mapper_contents: Mapper 内容列表
+    :return: (文件序号, 表名, 行号) 列表
+    """
+    extractor = XMLExtractor()
+    extractor.symbol_index = index
+    results = []
+    for mapper_index, content in enumerate(mapper_contents):
+        context = FileContext(f"OrderMapper{mapper_index}.xml", content=content)
+        for record in extractor.extract(context):
+            results.append((mapper_index, record.table_name, record.line_num))
+    return results
+
+
+def main():
+    """性能测试入口"""
+    parser = argparse.ArgumentParser(description="Mapper 片段解析性能测试")
+    parser.add_argument("--fragments", type=int, default=200, help="公共 sql 片段数量")
+    parser.add_argument("--mappers", type=int, default=100, help="Mapper 文件数量")
+    parser.add_argument("--includes", type=int, default=10, help="每个 Mapper 文件中的语句数量，每个语句引用两个片段")
+    args = parser.parse_args()
+    
+    common, mapper_contents = build_sources(args.fragments, args.mappers, args.includes)
+    print(f"公共片段 {args.fragments * 2} 个；Mapper {args.mappers} 个，"
+          f"共 {args.mappers * args.includes * 2} 处 include")
+    
+    start = time.perf_counter()
+    expected = extract_all(ReparsingIndex({COMMON_NAMESPACE: common}), mapper_contents)
+    legacy_elapsed = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    index = SymbolIndex()
+    index.add_context(FileContext("CommonMapper.xml", content=common))
+    actual = extract_all(index, mapper_contents)
+    indexed_elapsed = time.perf_counter() - start
+    
+    print(f"每次重新解析: {legacy_elapsed * 1000:9.1f} 毫秒")
+    print(f"符号索引:     {indexed_elapsed * 1000:9.1f} 毫秒（{len(index.fragments)} 个片段）")
+    
+    if expected != actual:
+        print("错误: 两种方式的提取结果不一致")
+        sys.exit(1)
+    print(f"提取结果一致，共 {len(actual)} 条")
+
+
+if __name__ == "__main__":
+    main()
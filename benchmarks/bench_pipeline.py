@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+整体流程扩展性性能测试
+生成 Maven 结构的 Spring/MyBatis 测试项目（@TableName 实体类、带 SQL 注解和 @DS 的 Mapper 接口、
+Mapper XML 和普通 Java 文件），在不同项目规模下分别计时文件扫描、表名提取、Schema 分析和报告生成；
+结果可以导出为 JSON 基线，之后的运行与基线比较，任一阶段变慢超过阈值时以非零状态码退出，便于在 CI 中发现性能退化
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.file_scanner import FileScanner
+from modules.table_extractor import TableExtractor
+from modules.schema_analyzer import SchemaAnalyzer
+from modules.report_generator import create_generator, default_output_path, OUTPUT_FORMATS, OUTPUT_EXCEL
+
+# 结果文件格式版本，字段变化时需要递增
+RESULT_VERSION = 1
+
+# 计时的阶段，名称与运行指标（--metrics）中的阶段一致
+STAGES = ('scan', 'extract', 'schema', 'report')
+
+# 生成的文件种类：实体类、Mapper 接口、Mapper XML、普通 Java 文件
+FILE_KINDS = ('entities', 'mappers', 'xmls', 'plain')
+
+# @DS 注解使用的数据源名称
+SCHEMAS = ('master', 'slave', 'report', 'archive')
+
+
+def parse_sizes(text):
+    """
+    解析项目规模列表
+    :param text: 逗号分隔的文件数量，支持 k 后缀（如 1k,10k,200k）
+    :return: 文件数量列表
+    """
+    sizes = []
+    for item in text.split(','):
+        item = item.strip().lower()
+        if item:
+            sizes.append(int(float(item[:-1]) * 1000) if item.endswith('k') else int(item))
+    return sizes
+
+
+def parse_mix(text):
+    """
+    解析各种文件的数量比例
+    :param text: 实体类:Mapper 接口:Mapper XML:普通 Java 文件，如 2:2:2:4
+    :return: 比例元组
+    """
+    weights = tuple(float(item) for item in text.split(':'))
+    if len(weights) != len(FILE_KINDS) or any(weight < 0 for weight in weights) or not sum(weights):
+        raise argparse.ArgumentTypeError(f"需要 {len(FILE_KINDS)} 个非负比例，如 2:2:2:4")
+    return weights
+
+
+def split_counts(total, weights):
+    """
+    按比例将文件总数分配给各种文件，余数分配给小数部分最大的种类
+    :param total: 文件总数
+    :param weights: 比例元组
+    :return: {文件种类: 数量}
+    """
+    exact = [total * weight / sum(weights) for weight in weights]
+    counts = [int(value) for value in exact]
+    remainders = sorted(range(len(exact)), key=lambda i: exact[i] - counts[i], reverse=True)
+    for i in remainders[:total - sum(counts)]:
+        counts[i] += 1
+    return dict(zip(FILE_KINDS, counts))
+
+
+def table_name(rng, tables):
+    """
+    从表名池中随机选择一个表名
+    :param rng: 随机数生成器
+    :param tables: 表名池大小
+    :return: 表名
+    """
+    return f"t_{('order', 'user', 'item', 'stock', 'bill')[rng.randrange(5)]}_{rng.randrange(tables)}"
+
+
+def entity_source(package, index, rng, tables):
+    """
+    生成 MyBatis-Plus 实体类
+    :param package: 模块的根包名
+    :param index: 文件编号
+    :param rng: 随机数生成器
+    :param tables: 表名池大小
+    :return: 文件名, 文件内容行列表
+    """
+    name = f"Entity{index}"
+    lines = [
+        f"package {package}.entity;",
+        "",
+        "import com.baomidou.mybatisplus.annotation.TableName;",
+        "import lombok.Data;",
+        "",
+        "@Data",
+        f'@TableName("{table_name(rng, tables)}")',
+        f"public class {name} {{",
+        "    private Long id;",
+        "    private String name;",
+        "    private Integer status;",
+        "    private java.util.Date createTime;",
+        "}",
+    ]
+    return name + ".java", lines
+
+
+def mapper_source(package, index, rng, tables):
+    """
+    生成带 SQL 注解的 Mapper 接口，部分接口和方法带 @DS 注解
+    :param package: 模块的根包名
+    :param index: 文件编号
+    :param rng: 随机数生成器
+    :param tables: 表名池大小
+    :return: 文件名, 文件内容行列表
+    """
+    name = f"Entity{index}Mapper"
+    lines = [
+        f"package {package}.mapper;",
+        "",
+        "import com.baomidou.dynamic.datasource.annotation.DS;",
+        "import org.apache.ibatis.annotations.*;",
+        "",
+    ]
+    if rng.random() < 0.3:
+        lines.append(f'@DS("{rng.choice(SCHEMAS)}")')
+    lines += [
+        "@Mapper",
+        f"public interface {name} {{",
+        "",
+        f'    @Select("SELECT id, name, status FROM {table_name(rng, tables)} WHERE id = #{{id}}")',
+        f"    Entity{index} selectById(@Param(\"id\") Long id);",
+        "",
+        f'    @Insert("INSERT INTO {table_name(rng, tables)} (id, name, status) VALUES (#{{id}}, #{{name}}, #{{status}})")',
+        f"    int insert(Entity{index} entity);",
+        "",
+    ]
+    if rng.random() < 0.2:
+        lines.append(f'    @DS("{rng.choice(SCHEMAS)}")')
+    lines += [
+        f'    @Update("UPDATE {table_name(rng, tables)} SET status = #{{status}} WHERE id = #{{id}}")',
+        "    int updateStatus(@Param(\"id\") Long id, @Param(\"status\") Integer status);",
+        "",
+        f'    @Delete("DELETE FROM {table_name(rng, tables)} WHERE id = #{{id}}")',
+        "    int deleteById(@Param(\"id\") Long id);",
+        "}",
+    ]
+    return name + ".java", lines
+
+
+def xml_source(package, index, rng, tables):
+    """
+    生成 Mapper XML，namespace 指向同编号的 Mapper 接口
+    :param package: 模块的根包名
+    :param index: 文件编号
+    :param rng: 随机数生成器
+    :param tables: 表名池大小
+    :return: 文件名, 文件内容行列表
+    """
+    name = f"Entity{index}Mapper"
+    main_table = table_name(rng, tables)
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<!DOCTYPE mapper PUBLIC "-//mybatis.org//DTD Mapper 3.0//EN" "http://mybatis.org/dtd/mybatis-3-mapper.dtd">',
+        f'<mapper namespace="{package}.mapper.{name}">',
+        '    <sql id="columns">id, name, status, create_time</sql>',
+        '',
+        '    <select id="listByStatus" resultType="java.util.Map">',
+        '        SELECT <include refid="columns"/>',
+        f'        FROM {main_table} a',
+        f'        LEFT JOIN {table_name(rng, tables)} b ON a.id = b.ref_id',
+        '        <where>',
+        '            <if test="status != null">AND a.status = #{status}</if>',
+        '        </where>',
+        '    </select>',
+        '',
+        '    <insert id="batchInsert">',
+        f'        INSERT INTO {main_table} (id, name, status) VALUES',
+        '        <foreach collection="list" item="item" separator=",">(#{item.id}, #{item.name}, #{item.status})</foreach>',
+        '    </insert>',
+        '',
+        '    <delete id="purge">',
+        f'        DELETE FROM {table_name(rng, tables)} WHERE create_time &lt; #{{before}}',
+        '    </delete>',
+        '</mapper>',
+    ]
+    return name + ".xml", lines
+
+
+def plain_source(package, index, rng, tables):
+    """
+    生成不包含数据库操作的普通 Java 文件（服务类、工具类），用于测试预筛选跳过的开销
+    :param package: 模块的根包名
+    :param index: 文件编号
+    :param rng: 随机数生成器
+    :param tables: 表名池大小
+    :return: 文件名, 文件内容行列表
+    """
+    name = f"Service{index}"
+    lines = [
+        f"package {package}.service;",
+        "",
+        "import java.util.ArrayList;",
+        "import java.util.List;",
+        "",
+        "/**",
+        f" * Generated service {index}",
+        " */",
+        f"public class {name} {{",
+        "",
+        "    private final List<String> names = new ArrayList<>();",
+        "",
+    ]
+    for method in range(rng.randrange(2, 6)):
+        lines += [
+            f"    public int compute{method}(int value) {{",
+            f"        int result = value * {rng.randrange(2, 10)};",
+            "        for (String name : names) {",
+            "            result += name.length();",
+            "        }",
+            "        return result;",
+            "    }",
+            "",
+        ]
+    lines.append("}")
+    return name + ".java", lines
+
+
+# 各种文件的生成函数和所在目录
+_GENERATORS = {
+    'entities': (entity_source, ('java', 'entity')),
+    'mappers': (mapper_source, ('java', 'mapper')),
+    'xmls': (xml_source, ('resources', 'mapper')),
+    'plain': (plain_source, ('java', 'service')),
+}
+
+
+def build_project(root, counts, files_per_module, tables, seed):
+    """
+    生成 Maven 多模块结构的测试项目，文件依次分配到各模块
+    :param root: 项目根目录
+    :param counts: {文件种类: 数量}
+    :param files_per_module: 每个模块的文件数量
+    :param tables: 表名池大小
+    :param seed: 随机种子
+    :return: 生成的文件数量
+    """
+    rng = random.Random(seed)
+    written = 0
+    created_dirs = set()
+    for kind in FILE_KINDS:
+        generate, (source_root, leaf) = _GENERATORS[kind]
+        for index in range(counts[kind]):
+            module = written // files_per_module
+            package = f"com.bench.m{module}"
+            if source_root == 'java':
+                directory = os.path.join(root, f"module{module}", "src", "main", "java", *package.split('.'), leaf)
+            else:
+                directory = os.path.join(root, f"module{module}", "src", "main", "resources", leaf)
+            if directory not in created_dirs:
+                os.makedirs(directory, exist_ok=True)
+                created_dirs.add(directory)
+            file_name, lines = generate(package, index, rng, tables)
+            with open(os.path.join(directory, file_name), 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            written += 1
+    return written
+
+
+def run_stages(project_path, output_dir, jobs, output_format):
+    """
+    依次执行四个阶段并分别计时，各阶段的日志输出被丢弃
+    :param project_path: 项目路径
+    :param output_dir: 报告输出目录
+    :param jobs: 并行提取的进程数量
+    :param output_format: 输出格式
+    :return: {阶段: (墙钟时间, CPU 时间)}, 文件数量, 表信息条数
+    """
+    timings = {}
+    
+    def timed(stage, func, *args):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func(*args)
+        timings[stage] = (time.perf_counter() - wall, time.process_time() - cpu)
+        return result
+    
+    files = timed('scan', FileScanner(project_path).scan)
+    extractor = TableExtractor(jobs=jobs)
+    records = timed('extract', extractor.extract_from_files, files)
+    records = timed('schema', SchemaAnalyzer().analyze_schema, records, files, extractor.ds_findings)
+    generator = create_generator(output_format, default_output_path(output_dir, output_format))
+    timed('report', generator.generate, records)
+    return timings, len(files), len(records)
+
+
+def measure_size(size, args, work_dir):
+    """
+    生成指定规模的项目并多次执行，每个阶段取最短耗时
+    :param size: 文件数量
+    :param args: 命令行参数
+    :param work_dir: 工作目录
+    :return: 该规模的结果字典
+    """
+    counts = split_counts(size, args.mix)
+    project_path = os.path.join(work_dir, f"project_{size}")
+    output_dir = os.path.join(work_dir, f"output_{size}")
+    os.makedirs(output_dir, exist_ok=True)
+    
+    start = time.perf_counter()
+    build_project(project_path, counts, args.files_per_module, args.tables, args.seed + size)
+    generate_seconds = time.perf_counter() - start
+    
+    best = {}
+    file_count = record_count = 0
+    for _ in range(args.repeat):
+        timings, file_count, record_count = run_stages(project_path, output_dir, args.jobs, args.format)
+        for stage, (wall, cpu) in timings.items():
+            if stage not in best or wall < best[stage][0]:
+                best[stage] = (wall, cpu)
+    if not args.keep:
+        shutil.rmtree(project_path, ignore_errors=True)
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return {
+        'files': file_count,
+        'counts': counts,
+        'records': record_count,
+        'generate_seconds': round(generate_seconds, 6),
+        'stages': {
+            stage: {'wall_seconds': round(wall, 6), 'cpu_seconds': round(cpu, 6)}
+            for stage, (wall, cpu) in best.items()
+        }
+    }
+
+
+def settings_of(args):
+    """
+    获取影响测试结果的参数，与基线比较时需要一致
+    :param args: 命令行参数
+    :return: 参数字典
+    """
+    return {
+        'mix': list(args.mix),
+        'files_per_module': args.files_per_module,
+        'tables': args.tables,
+        'seed': args.seed,
+        'jobs': args.jobs,
+        'format': args.format,
+    }
+
+
+def compare_with_baseline(results, baseline, threshold, min_seconds):
+    """
+    与基线比较各规模各阶段的墙钟时间
+    变慢的比例超过阈值、且增加的耗时超过最小值时视为性能退化（避免很短的阶段因计时误差误报）
+    :param results: 本次测试结果
+    :param baseline: 基线结果
+    :param threshold: 允许变慢的比例，如 0.25 表示 25%
+    :param min_seconds: 视为退化的最小耗时增加（秒）
+    :return: 性能退化列表 [(规模, 阶段, 基线耗时, 本次耗时)]
+    """
+    regressions = []
+    for size, current in results['sizes'].items():
+        expected = baseline.get('sizes', {}).get(size)
+        if expected is None:
+            print(f"   {size} 个文件: 基线中没有该规模，跳过比较")
+            continue
+        for stage in STAGES:
+            if stage not in current['stages'] or stage not in expected['stages']:
+                continue
+            old = expected['stages'][stage]['wall_seconds']
+            new = current['stages'][stage]['wall_seconds']
+            ratio = new / old if old > 0 else float('inf')
+            regressed = new > old * (1 + threshold) and new - old > min_seconds
+            marker = "  <-- 性能退化" if regressed else ""
+            print(f"   {size:>8} 个文件 {stage:<8} 基线 {old:9.3f} 秒  本次 {new:9.3f} 秒  {ratio:6.2f}x{marker}")
+            if regressed:
+                regressions.append((size, stage, old, new))
+    return regressions
+
+
+def main():
+    """性能测试入口"""
+    parser = argparse.ArgumentParser(description="整体流程扩展性性能测试")
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes("1k,10k"),
+                        help="项目规模（文件数量）列表，逗号分隔，支持 k 后缀，如 1k,10k,50k,200k（默认: 1k,10k）")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("2:2:2:4"),
+                        help="实体类:Mapper 接口:Mapper XML:普通 Java 文件的数量比例（默认: 2:2:2:4）")
+    parser.add_argument("--files-per-module", type=int, default=500, help="每个 Maven 模块的文件数量")
+    parser.add_argument("--tables", type=int, default=2000, help="表名池大小，表名从中随机选择")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--jobs", type=int, default=1, help="并行提取的进程数量")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default=OUTPUT_EXCEL, help="报告输出格式")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数，每个阶段取最短耗时")
+    parser.add_argument("--work-dir", help="生成测试项目的目录，默认使用临时目录")
+    parser.add_argument("--keep", action="store_true", help="保留生成的测试项目和报告")
+    parser.add_argument("--output", help="将测试结果保存为 JSON 文件，可作为之后比较的基线")
+    parser.add_argument("--baseline", help="与基线 JSON 文件比较，任一阶段性能退化时以状态码 1 退出")
+    parser.add_argument("--threshold", type=float, default=0.25, help="允许变慢的比例（默认: 0.25，即 25%%）")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="视为性能退化的最小耗时增加（秒），避免很短的阶段因计时误差误报（默认: 0.05）")
+    args = parser.parse_args()
+    
+    temp_dir = None
+    work_dir = args.work_dir
+    if not work_dir:
+        temp_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+        work_dir = temp_dir
+    os.makedirs(work_dir, exist_ok=True)
+    
+    results = {
+        'version': RESULT_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': settings_of(args),
+        'sizes': {}
+    }
+    try:
+        print(f"工作目录: {work_dir}")
+        print(f"{'文件数':>8} {'记录数':>8} " + ' '.join(f"{stage:>9}" for stage in STAGES) + f" {'合计':>9}")
+        for size in args.sizes:
+            result = measure_size(size, args, work_dir)
+            results['sizes'][str(size)] = result
+            stages = result['stages']
+            total = sum(stages[stage]['wall_seconds'] for stage in STAGES)
+            print(f"{result['files']:>8} {result['records']:>8} "
+                  + ' '.join(f"{stages[stage]['wall_seconds']:>8.3f}s" for stage in STAGES)
+                  + f" {total:>8.3f}s")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"测试结果已保存: {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n与基线比较: {args.baseline}（允许变慢 {args.threshold:.0%}）")
+        if baseline.get('settings') != results['settings']:
+            print(f"   警告: 测试参数与基线不一致，基线: {baseline.get('settings')}")
+        regressions = compare_with_baseline(results, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"发现 {len(regressions)} 处性能退化")
+            sys.exit(1)
+        print("没有发现性能退化")
+
+
+if __name__ == "__main__":
+    main()
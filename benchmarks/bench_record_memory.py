@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+表信息记录内存测试
+对比每条表信息一个字典与 TableRecord 紧凑记录的每条记录内存占用
+"""
+
+import argparse
+import gc
+import os
+import pickle
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.table_record import TableRecord
+from modules.report_generator import ReportGenerator
+
+# 提取来源和 schema 的取值
+SOURCES = ['XML', 'Java SQL', '@TableName', '@Select', '@Insert', '@Update', '@Delete']
+SCHEMAS = ['master', 'slave', 'mdb']
+
+
+def build_rows(count, files, seed):
+    """
+    生成表信息原始数据
+    :param count: 记录数量
+    :param files: 来源文件数量
+    :param seed: 随机种子
+    :return: (来源, 表名, 文件名, 行号, schema) 列表的 pickle 序列化结果
+    """
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        file_index = rng.randrange(files)
+        extension = '.xml' if file_index % 3 == 0 else '.java'
+        rows.append((
+            rng.choice(SOURCES),
+            f"t_table_{rng.randrange(count // 10 + 1)}",
+            f"UserOrderService{file_index}{extension}",
+            rng.randrange(1, 2000),
+            rng.choice(SCHEMAS)
+        ))
+    # 反序列化后每条记录持有独立的字符串对象，与多进程提取和缓存加载后的情况一致
+    return pickle.dumps(rows, pickle.HIGHEST_PROTOCOL)
+
+
+def build_dicts(rows):
+    """
+    按原来的方式构造原始和清洗后的表信息字典
+    :param rows: 表信息原始数据
+    :return: 原始表信息列表, 清洗后表信息列表
+    """
+    raw = []
+    for source, table_name, file_name, line_num, schema in rows:
+        table_info = {'source': source, 'table_name': table_name, 'file_name': file_name, 'line_num': line_num}
+        table_info['schema'] = schema
+        raw.append(table_info)
+    cleaned = [
+        {
+            'source': table_info.get('source', ''),
+            'schema': table_info.get('schema', ''),
+            'table_name': table_info.get('table_name', ''),
+            'file_name': table_info.get('file_name', ''),
+            'line_num': table_info.get('line_num', '')
+        }
+        for table_info in raw
+    ]
+    return raw, cleaned
+
+
+def build_records(rows):
+    """
+    构造原始 TableRecord 记录，清洗后的表信息按报告生成时的方式得到数据行
+    :param rows: 表信息原始数据
+    :return: 原始表信息列表, 清洗后数据行列表
+    """
+    raw = []
+    for source, table_name, file_name, line_num, schema in rows:
+        table_info = TableRecord(source, table_name, file_name, line_num)
+        table_info.set_schema(schema)
+        raw.append(table_info)
+    cleaned = [ReportGenerator._clean_row(ReportGenerator._sort_key(table_info), table_info.clean_name)
+               for table_info in raw]
+    return raw, cleaned
+
+
+def measure(builder, data):
+    """
+    测量构造记录后保留的内存，包括记录引用的字符串
+    :param builder: 记录构造函数
+    :param data: 表信息原始数据的 pickle 序列化结果
+    :return: 原始记录内存(字节), 原始和清洗后记录总内存(字节)
+    """
+    gc.collect()
+    tracemalloc.start()
+    rows = pickle.loads(data)
+    raw, cleaned = builder(rows)
+    del rows
+    gc.collect()
+    total, _ = tracemalloc.get_traced_memory()
+    # 释放清洗后的记录，剩余部分即原始记录的占用
+    del cleaned
+    gc.collect()
+    raw_only, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del raw
+    return raw_only, total
+
+
+def main():
+    """性能测试入口"""
+    parser = argparse.ArgumentParser(description="表信息记录内存测试")
+    parser.add_argument("--records", type=int, default=200000, help="记录数量")
+    parser.add_argument("--files", type=int, default=5000, help="来源文件数量")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+    
+    data = build_rows(args.records, args.files, args.seed)
+    print(f"记录数量: {args.records}, 来源文件数量: {args.files}")
+    
+    for name, builder in (('字典', build_dicts), ('TableRecord', build_records)):
+        raw_only, total = measure(builder, data)
+        print(f"{name}: 原始记录 {raw_only / args.records:.1f} 字节/条, "
+              f"原始和清洗后记录 {total / args.records:.1f} 字节/条")
+    
+    dicts, _ = build_dicts(pickle.loads(data))
+    records, _ = build_records(pickle.loads(data))
+    if [record.to_dict() for record in records] != dicts:
+        print("错误: 两种记录的内容不一致")
+        sys.exit(1)
+    print("记录内容一致")
+
+
+if __name__ == "__main__":
+    main()
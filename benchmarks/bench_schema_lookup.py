@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Schema 查找性能测试
+分别改变表信息数量和带 @DS 注解的类数量，对比逐个遍历注解字典与按文件名字典查找的耗时，
+并输出每条表信息的平均查找耗时，字典查找的耗时不随注解类数量增长
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.schema_analyzer import SchemaAnalyzer
+from modules.table_record import TableRecord
+
+SCHEMAS = ['master', 'slave', 'mdb', 'report']
+
+
+def legacy_find_schema(table_info, ds_annotations, default_schema='master'):
+    """
+    原来的 schema 查找方式：文件名不匹配时遍历所有注解键
+    带 @DS 注解的文件都按文件名记录，按路径精确匹配的步骤不会改变结果
+    :param table_info: 表信息
+    :param ds_annotations: @DS 注解信息
+    :param default_schema: 默认 schema
+    :return: schema 名称
+    """
+    file_name = table_info.file_name
+    base_name = os.path.splitext(file_name)[0]
+    if base_name in ds_annotations:
+        return ds_annotations[base_name]
+    for key, schema in ds_annotations.items():
+        if isinstance(key, str) and os.path.isabs(key) and (key == file_name or os.path.basename(key) == file_name):
+            return schema
+    table_name = table_info.table_name
+    if table_name:
+        hash_value = hashlib.md5(table_name.encode()).hexdigest()
+        if int(hash_value[:2], 16) < 64:
+            return 'slave'
+        elif int(hash_value[:2], 16) < 128:
+            return 'mdb'
+    if 'slave' in file_name.lower():
+        return 'slave'
+    if 'mdb' in file_name.lower():
+        return 'mdb'
+    return default_schema
+
+
+def build_project(classes, records, seed):
+    """
+    生成带 @DS 注解的文件和表信息
+    约一半表信息来自带注解的文件，其余来自没有注解的文件（原来的方式需要遍历所有注解键），
+    另有少量同名文件和文件名是注解文件名一部分的情况
+    :param classes: 带 @DS 注解的类数量
+    :param records: 表信息数量
+    :param seed: 随机种子
+    :return: 文件路径列表, @DS 注解信息, 表信息列表
+    """
+    rng = random.Random(seed)
+    root = os.path.abspath(os.sep + os.path.join('bench', 'project', 'src', 'main', 'java'))
+    files = []
+    ds_findings = {}
+    for index in range(classes):
+        # 最后约 2% 的类复用已有类名，构造不同目录下的同名文件
+        class_name = f"OrderMapper{index % max(1, classes - classes // 50)}"
+        file_path = os.path.join(root, f"module{index % 20}", f"{class_name}.java")
+        if file_path in ds_findings:
+            file_path = os.path.join(root, f"module{index % 20}", 'dup', f"{class_name}.java")
+        files.append(file_path)
+        ds_findings[file_path] = {'class_name': class_name, 'schemas': [rng.choice(SCHEMAS)]}
+    
+    annotated = [os.path.basename(file_path) for file_path in files]
+    plain = [f"PlainService{index}.java" for index in range(max(1, classes))]
+    partial = ['Mapper1.java', 'apper2.java']
+    table_info = []
+    for _ in range(records):
+        roll = rng.random()
+        if roll < 0.5:
+            file_name = rng.choice(annotated)
+        elif roll < 0.99:
+            file_name = rng.choice(plain)
+        else:
+            file_name = rng.choice(partial)
+        table_info.append(TableRecord('XML', f"t_table_{rng.randrange(records)}", file_name, rng.randrange(1, 500)))
+    return files, ds_findings, table_info
+
+
+def measure(classes, records, seed, legacy_sample):
+    """
+    测量一组参数下两种方式的耗时
+    原来的方式耗时与注解类数量成正比，只对前 legacy_sample 条表信息计时，再按表信息数量换算
+    :param classes: 带 @DS 注解的类数量
+    :param records: 表信息数量
+    :param seed: 随机种子
+    :param legacy_sample: 原来方式计时的表信息数量
+    :return: 原来方式耗时(秒，按比例换算), 字典查找耗时(秒), 结果是否一致
+    """
+    files, ds_findings, table_info = build_project(classes, records, seed)
+    analyzer = SchemaAnalyzer()
+    analyzer.prepare(files, ds_findings)
+    
+    sample = table_info[:legacy_sample]
+    start = time.perf_counter()
+    expected = [legacy_find_schema(info, analyzer.ds_annotations) for info in sample]
+    legacy_elapsed = (time.perf_counter() - start) * len(table_info) / max(1, len(sample))
+    
+    start = time.perf_counter()
+    actual = [analyzer._find_schema_for_table(info, analyzer.ds_annotations) for info in table_info]
+    indexed_elapsed = time.perf_counter() - start
+    return legacy_elapsed, indexed_elapsed, expected == actual[:len(sample)]
+
+
+def main():
+    """性能测试入口"""
+    parser = argparse.ArgumentParser(description="Schema 查找性能测试")
+    parser.add_argument("--records", default="20000,200000", help="表信息数量，多个取值用逗号分隔")
+    parser.add_argument("--classes", default="100,1000,10000,100000", help="带 @DS 注解的类数量，多个取值用逗号分隔")
+    parser.add_argument("--legacy-sample", type=int, default=500, help="原来的方式计时和比较结果的表信息数量")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+    
+    consistent = True
+    for classes in (int(value) for value in args.classes.split(',')):
+        for records in (int(value) for value in args.records.split(',')):
+            legacy_elapsed, indexed_elapsed, same = measure(classes, records, args.seed, args.legacy_sample)
+            consistent = consistent and same
+            print(f"注解类 {classes:>6}, 表信息 {records:>8}: "
+                  f"遍历 {legacy_elapsed * 1000:10.1f} 毫秒(估算), 字典查找 {indexed_elapsed * 1000:7.1f} 毫秒, "
+                  f"每条 {indexed_elapsed / records * 1e6:5.2f} 微秒"
+                  f"{'' if same else ' (结果不一致)'}")
+    
+    if not consistent:
+        print("错误: 两种方式的查找结果不一致")
+        sys.exit(1)
+    print("查找结果一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQL关键字扫描性能测试
+对比逐行、逐关键字执行正则的原有方式与 SQL 词法扫描器的耗时，
+并用病态输入（超长的点号标识符链、连续关键字、超长空白、未结束的注释和字符串）检查扫描时间是否随输入线性增长
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.file_context import FileContext
+from modules.extractors.sql_scanner import TABLE_KEYWORDS, scan_keyword_tables
+
+# 生成测试内容使用的代码行模板及每行应提取的表名
+LINE_TEMPLATES = [
+    ('    <select id="find{n}" resultType="map">', []),
+    ('        SELECT id, name, status FROM user_table_{n} u', ['user_table_{n}']),
+    ('        LEFT JOIN order_table_{n} o ON u.id = o.user_id', ['order_table_{n}']),
+    ('        WHERE u.id = #{{id}} AND o.status IN (1, 2, 3)', []),
+    ('    </select>', []),
+    ('    <insert id="insert{n}">INSERT INTO audit_log_{n} (id, message) VALUES (#{{id}}, #{{message}})</insert>',
+     ['audit_log_{n}']),
+    ('    <update id="update{n}">UPDATE schema_{n}.user_table SET name = #{{name}} WHERE id = #{{id}}</update>',
+     ['schema_{n}.user_table']),
+    ('        SELECT a.id FROM dept_{n} a, `staff_{n}` b WHERE a.id = b.dept_id -- FROM comment_table',
+     ['dept_{n}', 'staff_{n}']),
+    ('    private String name{n};', []),
+    ('    // plain comment line without any sql keywords {n}', []),
+]
+
+# 病态输入: (名称, 生成函数)，生成函数参数为重复次数
+PATHOLOGICAL_INPUTS = [
+    ('超长标识符链', lambda n: 'SELECT * FROM ' + ' . '.join(['a'] * n) + ' x'),
+    ('连续关键字', lambda n: 'FROM ' * n),
+    ('关键字后超长空白', lambda n: ('FROM' + ' ' * 50 + '(') * (n // 50)),
+    ('未结束的块注释', lambda n: 'SELECT * FROM t /*' + ' FROM x' * n),
+    ('大量未结束的字符串', lambda n: "FROM t WHERE a = '\n" * (n // 10)),
+    ('深层嵌套子查询', lambda n: 'SELECT * FROM (' * (n // 10) + 'SELECT 1 FROM t' + ')' * (n // 10)),
+]
+
+
+def legacy_scan(context):
+    """
+    原有的扫描方式：逐行遍历，每行对每个关键字构造正则并执行 re.finditer
+    :param context: 文件上下文
+    :return: (行号, 表名) 列表
+    """
+    results = []
+    for line_num, line in enumerate(context.content.split('\n'), 1):
+        for keyword in TABLE_KEYWORDS:
+            pattern = r'\b' + keyword + r'\b\s+([\w\.]+(?:\s*\.[\w]+)*)'
+            for match in re.finditer(pattern, line, re.IGNORECASE):
+                results.append((line_num, match.group(1)))
+    return results
+
+
+def build_content(size_mb, seed):
+    """
+    生成指定大小的测试内容
+    :param size_mb: 内容大小（MB）
+    :param seed: 随机种子
+    :return: 测试内容, 应提取的 (行号, 表名) 列表
+    """
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    lines = []
+    expected = []
+    size = 0
+    n = 0
+    while size < target:
+        template, tables = rng.choice(LINE_TEMPLATES)
+        line = template.format(n=n)
+        lines.append(line)
+        expected.extend((len(lines), table.format(n=n)) for table in tables)
+        size += len(line) + 1
+        n += 1
+    return '\n'.join(lines), expected
+
+
+def measure(func, content, repeat):
+    """
+    多次执行扫描并返回最短耗时
+    :param func: 扫描函数
+    :param content: 测试内容
+    :param repeat: 重复次数
+    :return: 最短耗时(秒), 扫描结果
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        # 每次使用新的文件上下文，行偏移索引的构建时间计入扫描时间
+        context = FileContext('bench.xml', content=content)
+        start = time.perf_counter()
+        result = func(context)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    """性能测试入口"""
+    parser = argparse.ArgumentParser(description="SQL关键字扫描性能测试")
+    parser.add_argument("--size-mb", type=float, default=4.0, help="测试内容大小（MB）")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--sizes", default="2000,20000,200000",
+                        help="病态输入的重复次数，逗号分隔，用于观察耗时是否线性增长")
+    args = parser.parse_args()
+    
+    content, expected = build_content(args.size_mb, args.seed)
+    size_mb = len(content.encode('utf-8')) / (1024 * 1024)
+    print(f"测试内容: {size_mb:.2f} MB, {content.count(chr(10)) + 1} 行")
+    
+    legacy_time, legacy_result = measure(legacy_scan, content, args.repeat)
+    lexer_time, lexer_result = measure(scan_keyword_tables, content, args.repeat)
+    if lexer_result != expected:
+        print("错误: 词法扫描器的提取结果与预期不一致")
+        sys.exit(1)
+    
+    print(f"提取结果: 词法扫描器 {len(lexer_result)} 条（与预期一致），逐行正则 {len(legacy_result)} 条（含别名、注释中的表名）")
+    print(f"逐行正则:   {legacy_time / size_mb * 1000:.1f} 毫秒/MB")
+    print(f"词法扫描:   {lexer_time / size_mb * 1000:.1f} 毫秒/MB")
+    
+    sizes = [int(size) for size in args.sizes.split(',')]
+    print("\n病态输入（毫秒）:")
+    print(f"{'输入':<14}{'重复次数':>10}{'逐行正则':>12}{'词法扫描':>12}")
+    for name, generate in PATHOLOGICAL_INPUTS:
+        for size in sizes:
+            text = generate(size)
+            legacy_time, _ = measure(legacy_scan, text, 1)
+            lexer_time, _ = measure(scan_keyword_tables, text, 1)
+            print(f"{name:<14}{size:>10}{legacy_time * 1000:>12.1f}{lexer_time * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常量解析性能测试
+生成常量类和引用常量的 Mapper 文件，对比每个引用都用正则搜索文件内容与常量索引查找的耗时
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.file_context import FileContext
+from modules.symbol_index import SymbolIndex
+
+
+def build_sources(classes, constants, mappers, references, seed):
+    """
+    生成常量类和 Mapper 文件内容
+    :param classes: 常量类数量
+    :param constants: 每个常量类中的常量数量
+    :param mappers: Mapper 文件数量
+    :param references: 每个 Mapper 文件中的常量引用数量
+    :param seed: 随机种子
+    :return: 常量类 {文件路径: 内容}, Mapper [(文件路径, 内容, 引用列表)]
+    """
+    rng = random.Random(seed)
+    constant_files = {}
+    for class_index in range(classes):
+        lines = [f"package com.bench.constant{class_index % 10};", "",
+                 f"public final class Tables{class_index} {{"]
+        for index in range(constants):
+            lines.append(f'    public static final String TABLE_{index} = "t_{class_index}_{index}";')
+        lines.append("}")
+        constant_files[f"/bench/constant/Tables{class_index}.java"] = '\n'.join(lines) + '\n'
+    
+    mapper_files = []
+    for mapper_index in range(mappers):
+        lines = [f"package com.bench.mapper{mapper_index % 10};", "",
+                 f"public interface OrderMapper{mapper_index} {{"]
+        refs = []
+        for index in range(references):
+            reference = f"Tables{rng.randrange(classes)}.TABLE_{rng.randrange(constants)}"
+            refs.append(reference)
+            lines.append(f"    @Select({reference})")
+            lines.append(f"    List<Order> query{index}();")
+            # 方法体之间的普通代码，原来的方式每次搜索都需要扫描
+            lines.extend(f"    // filler line {line} for method {index}" for line in range(20))
+        lines.append("}")
+        mapper_files.append((f"/bench/mapper/OrderMapper{mapper_index}.java", '\n'.join(lines) + '\n', refs))
+    return constant_files, mapper_files
+
+
+def legacy_resolve(reference, content, constant_files):
+    """
+    原来的方式：先在当前文件中搜索，再逐个搜索其他文件的内容
+    :param reference: 常量引用
+    :param content: 当前文件内容
+    :param constant_files: 其他文件内容
+    :return: 常量值或 None
+    """
+    name = reference.rpartition('.')[2]
+    pattern = re.compile(r'\b' + re.escape(name) + r'\s*=\s*["\']([^"\']+)["\']')
+    match = pattern.search(content)
+    if match:
+        return match.group(1)
+    class_name = reference.partition('.')[0]
+    for file_path, other in constant_files.items():
+        if os.path.basename(file_path) == class_name + '.java':
+            match = pattern.search(other)
+            if match:
+                return match.group(1)
+    return None
+
+
+def main():
+    """性能测试入口"""
+    parser = argparse.ArgumentParser(description="常量解析性能测试")
+    parser.add_argument("--classes", type=int, default=200, help="常量类数量")
+    parser.add_argument("--constants", type=int, default=100, help="每个常量类中的常量数量")
+    parser.add_argument("--mappers", type=int, default=200, help="Mapper 文件数量")
+    parser.add_argument("--references", type=int, default=40, help="每个 Mapper 文件中的常量引用数量")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+    
+    constant_files, mapper_files = build_sources(args.classes, args.constants, args.mappers,
+                                                 args.references, args.seed)
+    total = args.mappers * args.references
+    print(f"常量类 {args.classes} 个，每个 {args.constants} 个常量；"
+          f"Mapper {args.mappers} 个，共 {total} 个常量引用")
+    
+    start = time.perf_counter()
+    expected = [
+        legacy_resolve(reference, content, constant_files)
+        for _, content, refs in mapper_files
+        for reference in refs
+    ]
+    legacy_elapsed = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    index = SymbolIndex()
+    for file_path, content in constant_files.items():
+        index.add_context(FileContext(file_path, content=content))
+    build_elapsed = time.perf_counter() - start
+    actual = []
+    for file_path, content, refs in mapper_files:
+        context = FileContext(file_path, content=content)
+        for reference in refs:
+            value = context.find_assignment(reference)
+            if value is None:
+                value = index.resolve(reference, context.package_name, context.class_name)
+            actual.append(value)
+    indexed_elapsed = time.perf_counter() - start
+    
+    print(f"正则搜索: {legacy_elapsed * 1000:9.1f} 毫秒")
+    print(f"常量索引: {indexed_elapsed * 1000:9.1f} 毫秒（其中建立索引 {build_elapsed * 1000:.1f} 毫秒，"
+          f"{len(index)} 个常量）")
+    
+    if expected != actual:
+        print("错误: 两种方式的解析结果不一致")
+        sys.exit(1)
+    print("解析结果一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,88 +2,230 @@
 # -*- coding: utf-8 -*-
 """
 项目表结构分析工具
-根据用户提供的项目地址，自动检索并提取项目中的数据库表信息，最终生成"项目汇总.xlsx"文件
+根据用户提供的项目地址（命令行参数、列表文件或交互式输入），自动检索并提取项目中的数据库表信息，最终生成"项目汇总.xlsx"文件（或 CSV、JSONL、SQLite 格式）
 """
 
+import argparse
 import os
 import sys
 import time
 from modules.file_scanner import FileScanner
+from modules.extraction_cache import ExtractionCache, CACHE_FILE_NAME
+from modules.sql_table_cache import SQLTableCache, SQL_CACHE_FILE_NAME, DEFAULT_SQL_CACHE_SIZE
+from modules.file_context import DEFAULT_MMAP_THRESHOLD
+from modules.external_sort import DEFAULT_MEMORY_RECORDS
+from modules.pipeline import StreamingPipeline, DEFAULT_QUEUE_SIZE
+from modules.batch_runner import BatchRunner, read_project_list, assign_output_dirs, STATUS_ERROR
+from modules.run_metrics import RunMetrics, measure_stage, METRICS_FILE_NAME, DEFAULT_TOP_FILES
 from modules.table_extractor import TableExtractor
 from modules.schema_analyzer import SchemaAnalyzer
-from modules.excel_generator import ExcelGenerator
+from modules.report_generator import (create_generator, default_output_path, OUTPUT_FORMATS, OUTPUT_EXCEL,
+                                     OVERFLOW_MODES, OVERFLOW_SHEETS)
+
+def parse_args():
+    """
+    解析命令行参数
+    :return: 命令行参数
+    """
+    parser = argparse.ArgumentParser(description="项目表结构分析工具")
+    parser.add_argument("projects", nargs="*", metavar="PROJECT",
+                        help="项目地址，可以指定多个；未指定项目（也没有 --project-list）时运行后交互式输入")
+    parser.add_argument("--project-list", metavar="FILE",
+                        help="项目地址列表文件，每行一个项目地址，忽略空行和 # 开头的行")
+    parser.add_argument("--output-dir", default=os.path.join(os.getcwd(), "output"),
+                        help="输出目录；分析多个项目时，每个项目输出到其中以项目目录名称命名的子目录（默认: ./output）")
+    parser.add_argument("--parallel-projects", type=int, default=1,
+                        help="同时分析的项目数量，多个项目在进程池中并行分析，0 表示使用全部 CPU 核心（默认: 1）")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="不使用提取结果缓存，重新提取所有文件")
+    parser.add_argument("--sql-cache-size", type=int, default=DEFAULT_SQL_CACHE_SIZE,
+                        help="SQL 表名缓存最多保存的 SQL 数量，重复出现的 SQL 只扫描一次（默认: %(default)s）")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="并行提取的进程数量，0 表示使用全部 CPU 核心（默认: 1）")
+    parser.add_argument("--mmap-threshold", type=float, default=DEFAULT_MMAP_THRESHOLD / (1024 * 1024),
+                        help="达到该大小（MB）的文件使用内存映射、只解码匹配的内容，0 表示不使用（默认: %(default)g）")
+    parser.add_argument("--dedup", action="store_true",
+                        help="按内容去重：文件名和内容都相同的文件只提取一次，结果复用到每个文件")
+    parser.add_argument("--stream", action="store_true",
+                        help="流式处理：扫描、提取、Schema 分析和报告生成通过有界队列连接，内存占用不随项目规模增长")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="流式处理时各阶段之间队列的容量（批次数量，默认: %(default)s）")
+    parser.add_argument("--sort-memory", type=int, default=DEFAULT_MEMORY_RECORDS,
+                        help="流式处理时排序在内存中最多保留的记录数量，超过时使用外部归并排序（默认: %(default)s）")
+    parser.add_argument("--overflow", choices=OVERFLOW_MODES, default=OVERFLOW_SHEETS,
+                        help="记录数超过 Excel 单个工作表的行数上限时，超出部分写入续表（sheets）"
+                             "或与 Excel 文件同名的 CSV 文件（csv）（默认: %(default)s）")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default=OUTPUT_EXCEL,
+                        help="输出格式：Excel 文件（excel）、每个表一个 CSV 文件（csv）、JSON Lines 文件（jsonl）"
+                             "或 SQLite 数据库（sqlite）；只有 excel 格式需要 openpyxl（默认: %(default)s）")
+    parser.add_argument("--metrics", action="store_true",
+                        help=f"记录各阶段、各提取器和各文件的耗时，打印最慢的文件并导出到输出目录中的 {METRICS_FILE_NAME}")
+    parser.add_argument("--metrics-top", type=int, default=DEFAULT_TOP_FILES,
+                        help="运行指标中记录的最慢文件数量（默认: %(default)s）")
+    args = parser.parse_args()
+    if args.jobs <= 0:
+        args.jobs = os.cpu_count() or 1
+    if args.parallel_projects <= 0:
+        args.parallel_projects = os.cpu_count() or 1
+    args.mmap_threshold = int(args.mmap_threshold * 1024 * 1024) if args.mmap_threshold > 0 else None
+    return args
+
+def analyze_project(project_path, output_dir, args, sql_cache):
+    """
+    分析一个项目并生成报告
+    :param project_path: 项目地址
+    :param output_dir: 输出目录
+    :param args: 命令行参数
+    :param sql_cache: SQL 表名缓存（SQLTableCache），批量分析时在项目之间共享
+    :return: 是否生成了报告
+    """
+    # 创建输出目录
+    os.makedirs(output_dir, exist_ok=True)
+    
+    print(f"\n开始分析项目: {project_path}")
+    print(f"输出目录: {output_dir}")
+    print("=" * 60)
+    
+    if not args.metrics:
+        return run_analysis(project_path, output_dir, args, sql_cache)
+    # 出错时也导出已记录的运行指标，便于定位出错前耗时异常的文件
+    metrics = RunMetrics(project_path, args.metrics_top)
+    try:
+        return run_analysis(project_path, output_dir, args, sql_cache, metrics)
+    finally:
+        metrics.finish()
+        metrics.print_summary()
+        metrics_path = os.path.join(output_dir, METRICS_FILE_NAME)
+        try:
+            metrics.save(metrics_path)
+            print(f"   运行指标已保存: {metrics_path}")
+        except OSError as e:
+            print(f"   保存运行指标失败: {e}")
+
+def run_analysis(project_path, output_dir, args, sql_cache, metrics=None):
+    """
+    依次执行文件扫描、表名提取、Schema 分析和报告生成
+    :param project_path: 项目地址
+    :param output_dir: 输出目录
+    :param args: 命令行参数
+    :param sql_cache: SQL 表名缓存（SQLTableCache）
+    :param metrics: 运行指标（RunMetrics），为空时不记录
+    :return: 是否生成了报告
+    """
+    cache = None
+    if not args.no_cache:
+        cache = ExtractionCache(os.path.join(output_dir, CACHE_FILE_NAME))
+    output_path = default_output_path(output_dir, args.format)
+    
+    if args.stream:
+        if args.dedup:
+            print("流式处理时不进行内容去重，已忽略 --dedup")
+        pipeline = StreamingPipeline(
+            project_path, output_path, cache=cache, jobs=args.jobs, mmap_threshold=args.mmap_threshold,
+            queue_size=args.queue_size, memory_records=args.sort_memory, sql_cache=sql_cache,
+            overflow=args.overflow, output_format=args.format, metrics=metrics
+        )
+        if not pipeline.run():
+            return False
+        print("\n=== 任务完成 ===")
+        return True
+    
+    # 1. 文件扫描
+    print("\n1. 正在扫描项目文件...")
+    scanner = FileScanner(project_path)
+    with measure_stage(metrics, "scan"):
+        files = scanner.scan()
+    print(f"   扫描完成，找到 {len(files)} 个文件")
+    
+    if not files:
+        print("   警告: 未找到任何文件，请检查项目路径是否正确")
+        return False
+    
+    # 2. 表名提取
+    print("\n2. 正在提取表名...")
+    extractor = TableExtractor(cache=cache, jobs=args.jobs, mmap_threshold=args.mmap_threshold,
+                               sql_cache=sql_cache, dedup=args.dedup, metrics=metrics)
+    with measure_stage(metrics, "extract"):
+        table_info_list = extractor.extract_from_files(files)
+    print(f"   提取完成，找到 {len(table_info_list)} 条表信息")
+    
+    if not table_info_list:
+        print("   警告: 未提取到任何表信息，请检查项目中是否存在数据库操作相关文件")
+        return False
+    
+    # 3. Schema 归属分析
+    print("\n3. 正在分析 Schema 归属...")
+    analyzer = SchemaAnalyzer()
+    with measure_stage(metrics, "schema"):
+        table_info_list = analyzer.analyze_schema(table_info_list, files, extractor.ds_findings)
+    print("   Schema 分析完成")
+    
+    # 4. 生成报告文件
+    generator = create_generator(args.format, output_path, overflow=args.overflow)
+    print(f"\n4. 正在生成 {generator.format_name} 文件...")
+    with measure_stage(metrics, "report"):
+        generator.generate(table_info_list)
+    
+    # 5. 后续处理
+    print("\n5. 后续处理...")
+    print(f"{generator.format_name} 文件生成完成，无需清理中间数据")
+    
+    print("\n=== 任务完成 ===")
+    return True
 
 def main():
-    """主程序入口"""
+    """
+    主程序入口
+    :return: 进程退出状态码，有项目分析出错、输入无效或运行出错时为 1，用户中断时为 130
+    """
+    args = parse_args()
     print("=== 项目表结构分析工具 ===")
     print()
     
     try:
-        # 获取用户输入的项目地址
-        project_path = input("请输入项目地址: ").strip()
-        
-        # 验证项目路径是否存在
-        if not project_path:
-            print("错误: 项目路径不能为空")
-            return
-        
-        if not os.path.exists(project_path):
-            print(f"错误: 项目路径 '{project_path}' 不存在")
-            return
-        
-        # 创建输出目录
-        output_dir = os.path.join(os.getcwd(), "output")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        print(f"\n开始分析项目: {project_path}")
-        print(f"输出目录: {output_dir}")
-        print("=" * 60)
-        
-        # 1. 文件扫描
-        print("\n1. 正在扫描项目文件...")
-        scanner = FileScanner(project_path)
-        files = scanner.scan()
-        print(f"   扫描完成，找到 {len(files)} 个文件")
-        
-        if not files:
-            print("   警告: 未找到任何文件，请检查项目路径是否正确")
-            return
-        
-        # 2. 表名提取
-        print("\n2. 正在提取表名...")
-        extractor = TableExtractor()
-        table_info_list = extractor.extract_from_files(files)
-        print(f"   提取完成，找到 {len(table_info_list)} 条表信息")
+        project_paths = list(args.projects)
+        if args.project_list:
+            project_paths.extend(read_project_list(args.project_list))
+        interactive = not project_paths
+        if interactive:
+            # 未在命令行中指定项目时，获取用户输入的项目地址
+            project_path = input("请输入项目地址: ").strip()
+            
+            # 验证项目路径是否存在
+            if not project_path:
+                print("错误: 项目路径不能为空")
+                return 1
+            
+            if not os.path.exists(project_path):
+                print(f"错误: 项目路径 '{project_path}' 不存在")
+                return 1
+            project_paths = [project_path]
         
-        if not table_info_list:
-            print("   警告: 未提取到任何表信息，请检查项目中是否存在数据库操作相关文件")
-            return
+        os.makedirs(args.output_dir, exist_ok=True)
+        # 使用提取结果缓存时，SQL 表名缓存也保存到输出目录供下次运行使用；批量分析时所有项目共用
+        sql_cache = SQLTableCache(
+            max(args.sql_cache_size, 1),
+            None if args.no_cache else os.path.join(args.output_dir, SQL_CACHE_FILE_NAME)
+        )
         
-        # 3. Schema 归属分析
-        print("\n3. 正在分析 Schema 归属...")
-        analyzer = SchemaAnalyzer()
-        table_info_list = analyzer.analyze_schema(table_info_list, files)
-        print("   Schema 分析完成")
+        if interactive:
+            analyze_project(project_paths[0], args.output_dir, args, sql_cache)
+            return 0
         
-        # 4. 生成 Excel 文件
-        print("\n4. 正在生成 Excel 文件...")
-        excel_path = os.path.join(output_dir, "项目汇总.xlsx")
-        generator = ExcelGenerator(excel_path)
-        generator.generate(table_info_list)
-        
-        # 5. 后续处理
-        print("\n5. 后续处理...")
-        print("Excel 文件生成完成，无需清理中间数据")
-        
-        print("\n=== 任务完成 ===")
+        start = time.perf_counter()
+        runner = BatchRunner(analyze_project, args, sql_cache, args.parallel_projects)
+        results = runner.run(assign_output_dirs(project_paths, args.output_dir))
+        runner.print_summary(results, time.perf_counter() - start)
+        # 批量分析时任一项目出错都以非零状态码退出，便于脚本判断
+        return 1 if any(result.status == STATUS_ERROR for result in results) else 0
     except KeyboardInterrupt:
         print("\n用户中断操作，程序退出")
-        return
+        return 130
     except Exception as e:
         print(f"\n程序运行出错: {e}")
         import traceback
         traceback.print_exc()
-        return
+        return 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
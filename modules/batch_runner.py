@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量分析模块
+依次或在进程池中并行分析多个项目，每个项目输出到各自的目录，最后打印各项目的耗时汇总；
+并行时每个工作进程只初始化一次（模块导入、规则编译、SQL 表名缓存），在它处理的所有项目之间共享
+"""
+
+import contextlib
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# 并行分析时每个项目的日志文件名称，保存在项目的输出目录中
+PROJECT_LOG_FILE_NAME = "analysis.log"
+
+# 项目分析结果状态
+STATUS_DONE = 'done'
+STATUS_NO_REPORT = 'no_report'
+STATUS_ERROR = 'error'
+# 状态在耗时汇总中的显示名称
+STATUS_LABELS = {
+    STATUS_DONE: '完成',
+    STATUS_NO_REPORT: '未生成报告',
+    STATUS_ERROR: '出错',
+}
+
+# 工作进程中的项目分析函数、命令行参数和 SQL 表名缓存，每个进程初始化一次
+_worker_run_project = None
+_worker_args = None
+_worker_sql_cache = None
+
+
+def read_project_list(list_path):
+    """
+    读取项目地址列表文件
+    :param list_path: 列表文件路径，每行一个项目地址，忽略空行和 # 开头的行
+    :return: 项目地址列表
+    """
+    project_paths = []
+    with open(list_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                project_paths.append(line)
+    return project_paths
+
+
+def assign_output_dirs(project_paths, output_root):
+    """
+    为每个项目分配输出目录
+    只有一个项目时直接使用输出目录；多个项目时使用输出目录下以项目目录名称命名的子目录，
+    名称相同的项目依次加上 _2、_3 …… 后缀
+    :param project_paths: 项目地址列表
+    :param output_root: 输出目录
+    :return: (项目地址, 输出目录) 列表
+    """
+    if len(project_paths) == 1:
+        return [(project_paths[0], output_root)]
+    assigned = []
+    used = set()
+    for project_path in project_paths:
+        name = os.path.basename(os.path.normpath(os.path.abspath(project_path))) or 'project'
+        candidate = name
+        suffix = 2
+        while candidate in used:
+            candidate = f"{name}_{suffix}"
+            suffix += 1
+        used.add(candidate)
+        assigned.append((project_path, os.path.join(output_root, candidate)))
+    return assigned
+
+
+class ProjectResult:
+    """单个项目的分析结果"""
+    
+    __slots__ = ('project_path', 'output_dir', 'status', 'seconds', 'error', 'log_path')
+    
+    def __init__(self, project_path, output_dir, status, seconds, error=None, log_path=None):
+        """
+        初始化项目分析结果
+        :param project_path: 项目地址
+        :param output_dir: 输出目录
+        :param status: 状态（STATUS_DONE、STATUS_NO_REPORT 或 STATUS_ERROR）
+        :param seconds: 耗时（秒）
+        :param error: 出错时的错误信息
+        :param log_path: 并行分析时的日志文件路径
+        """
+        self.project_path = project_path
+        self.output_dir = output_dir
+        self.status = status
+        self.seconds = seconds
+        self.error = error
+        self.log_path = log_path
+
+
+def _run_timed(run_project, project_path, output_dir, args, sql_cache):
+    """
+    分析一个项目并计时，出错时打印错误堆栈
+    :param run_project: 项目分析函数
+    :param project_path: 项目地址
+    :param output_dir: 输出目录
+    :param args: 命令行参数
+    :param sql_cache: SQL 表名缓存
+    :return: 项目分析结果
+    """
+    if not os.path.exists(project_path):
+        print(f"错误: 项目路径 '{project_path}' 不存在")
+        return ProjectResult(project_path, output_dir, STATUS_ERROR, 0.0, "项目路径不存在")
+    start = time.perf_counter()
+    try:
+        generated = run_project(project_path, output_dir, args, sql_cache)
+    except Exception as e:
+        print(f"\n程序运行出错: {e}")
+        traceback.print_exc()
+        return ProjectResult(project_path, output_dir, STATUS_ERROR, time.perf_counter() - start, str(e))
+    status = STATUS_DONE if generated else STATUS_NO_REPORT
+    return ProjectResult(project_path, output_dir, status, time.perf_counter() - start)
+
+
+def _init_worker(run_project, args, sql_cache):
+    """
+    初始化工作进程：保存项目分析函数、命令行参数和 SQL 表名缓存的副本
+    :param run_project: 项目分析函数
+    :param args: 命令行参数
+    :param sql_cache: SQL 表名缓存的副本，在进程处理的所有项目之间共享
+    """
+    global _worker_run_project, _worker_args, _worker_sql_cache
+    _worker_run_project = run_project
+    _worker_args = args
+    _worker_sql_cache = sql_cache
+
+
+def _run_in_worker(project_path, output_dir):
+    """
+    在工作进程中分析一个项目，输出写入项目输出目录中的日志文件
+    :param project_path: 项目地址
+    :param output_dir: 输出目录
+    :return: (项目分析结果, SQL 表名缓存的统计增量)
+    """
+    if not os.path.exists(project_path):
+        # 项目路径不存在时不创建输出目录和日志文件
+        return _run_timed(_worker_run_project, project_path, output_dir, _worker_args, _worker_sql_cache), \
+            _worker_sql_cache.take_delta()
+    os.makedirs(output_dir, exist_ok=True)
+    log_path = os.path.join(output_dir, PROJECT_LOG_FILE_NAME)
+    with open(log_path, 'w', encoding='utf-8') as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        result = _run_timed(_worker_run_project, project_path, output_dir, _worker_args, _worker_sql_cache)
+    result.log_path = log_path
+    return result, _worker_sql_cache.take_delta()
+
+
+class BatchRunner:
+    """
+    批量项目分析器
+    串行分析时所有项目共用同一个 SQL 表名缓存；并行分析时每个工作进程持有一个缓存副本，
+    各项目新扫描的 SQL 随结果传回主进程合并，全部完成后保存一次
+    """
+    
+    def __init__(self, run_project, args, sql_cache, parallel_projects=1):
+        """
+        初始化批量项目分析器
+        :param run_project: 项目分析函数 run_project(project_path, output_dir, args, sql_cache)，
+            返回是否生成了报告；并行分析时需要可以被 pickle（模块级函数）
+        :param args: 命令行参数
+        :param sql_cache: SQL 表名缓存（SQLTableCache）
+        :param parallel_projects: 同时分析的项目数量
+        """
+        self.run_project = run_project
+        self.args = args
+        self.sql_cache = sql_cache
+        self.parallel_projects = max(1, parallel_projects)
+    
+    def run(self, projects):
+        """
+        分析所有项目
+        :param projects: (项目地址, 输出目录) 列表
+        :return: 项目分析结果列表，顺序与 projects 一致
+        """
+        if self.parallel_projects > 1 and len(projects) > 1:
+            return self._run_parallel(projects)
+        return self._run_serial(projects)
+    
+    def _run_serial(self, projects):
+        """
+        在当前进程中依次分析各项目，日志直接输出
+        :param projects: (项目地址, 输出目录) 列表
+        :return: 项目分析结果列表
+        """
+        results = []
+        for index, (project_path, output_dir) in enumerate(projects, 1):
+            if len(projects) > 1:
+                print(f"\n[{index}/{len(projects)}] {project_path}")
+            results.append(_run_timed(self.run_project, project_path, output_dir, self.args, self.sql_cache))
+        return results
+    
+    def _run_parallel(self, projects):
+        """
+        在进程池中并行分析各项目，每个项目的日志写入其输出目录，完成时打印一行进度
+        :param projects: (项目地址, 输出目录) 列表
+        :return: 项目分析结果列表
+        """
+        # 工作进程从已加载的缓存开始
+        self.sql_cache.load()
+        workers = min(self.parallel_projects, len(projects))
+        print(f"\n使用 {workers} 个进程并行分析 {len(projects)} 个项目，各项目日志写入输出目录中的 {PROJECT_LOG_FILE_NAME}")
+        results = [None] * len(projects)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(self.run_project, self.args, self.sql_cache.for_worker())
+        ) as executor:
+            futures = {
+                executor.submit(_run_in_worker, project_path, output_dir): index
+                for index, (project_path, output_dir) in enumerate(projects)
+            }
+            try:
+                for finished, future in enumerate(as_completed(futures), 1):
+                    index = futures[future]
+                    project_path, output_dir = projects[index]
+                    try:
+                        result, sql_cache_delta = future.result()
+                        self.sql_cache.merge(sql_cache_delta)
+                    except Exception as e:
+                        # 工作进程异常退出等无法在进程内捕获的错误
+                        result = ProjectResult(project_path, output_dir, STATUS_ERROR, 0.0, str(e))
+                    results[index] = result
+                    print(f"   [{finished}/{len(projects)}] {project_path}: {STATUS_LABELS[result.status]}，"
+                          f"耗时 {result.seconds:.2f} 秒")
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        try:
+            self.sql_cache.save()
+        except OSError as e:
+            print(f"   保存 SQL 表名缓存失败: {e}")
+        return results
+    
+    @staticmethod
+    def print_summary(results, total_seconds):
+        """
+        打印各项目的耗时汇总
+        :param results: 项目分析结果列表
+        :param total_seconds: 批量分析的总耗时（秒）
+        """
+        print("\n=== 项目耗时汇总 ===")
+        for index, result in enumerate(results, 1):
+            line = f"   {index}. {result.project_path}: {STATUS_LABELS[result.status]}，耗时 {result.seconds:.2f} 秒"
+            if result.error:
+                line += f"（{result.error}）"
+            print(line)
+            print(f"      输出目录: {result.output_dir}")
+            if result.log_path:
+                print(f"      日志: {result.log_path}")
+        counts = {status: 0 for status in STATUS_LABELS}
+        for result in results:
+            counts[result.status] += 1
+        detail = '，'.join(f"{label} {counts[status]} 个" for status, label in STATUS_LABELS.items())
+        print(f"   共 {len(results)} 个项目（{detail}），总耗时 {total_seconds:.2f} 秒，"
+              f"各项目耗时合计 {sum(result.seconds for result in results):.2f} 秒")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CSV 生成模块
+五个逻辑表分别逐行写入一个 CSV 文件（UTF-8，不带 BOM），表头为英文列名，便于其他工具读取
+"""
+
+import csv
+from .report_generator import ReportGenerator
+
+
+class CSVGenerator(ReportGenerator):
+    """
+    CSV 生成器
+    输出路径为文件名前缀，各表写入 "{前缀}_{表名}.csv"，如 项目汇总_raw.csv
+    """
+    
+    format_name = "CSV"
+    
+    def __init__(self, output_path):
+        """
+        初始化 CSV 生成器
+        :param output_path: CSV 文件名前缀（包括目录）
+        """
+        super().__init__(output_path)
+        # 已写入的 CSV 文件路径
+        self.output_files = []
+    
+    def table_path(self, name):
+        """
+        获取逻辑表的 CSV 文件路径
+        :param name: 表名
+        :return: CSV 文件路径
+        """
+        return f"{self.output_path}_{name}.csv"
+    
+    def _write_report(self, report):
+        """
+        逐表写出 CSV 文件，数据行逐行写出
+        :param report: 汇总结果
+        """
+        self.output_files = []
+        for name, columns, rows in self._iter_tables(report):
+            path = self.table_path(name)
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow([column for column, _ in columns])
+                writer.writerows(rows)
+            self.output_files.append(path)
+    
+    def _display_path(self):
+        """
+        生成总结中显示的输出路径
+        :return: CSV 文件路径通配形式
+        """
+        return self.table_path('*')
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@DS 作用域模块
+识别 Java 文件中类和方法的行范围，生成按行号查找生效 @DS 注解的区间索引
+"""
+
+import bisect
+import re
+
+# Java 词法单元：注释、文本块、字符串和字符字面量整体跳过，
+# 只关心类型声明关键字和会改变成员边界的符号
+_TOKEN_PATTERN = re.compile(r'''
+    //[^\n]*
+  | /\*.*?\*/
+  | """(?:\\.|[^\\])*?"""
+  | "(?:\\.|[^"\\\n])*"
+  | '(?:\\.|[^'\\\n])*'
+  | (?<![\w$.])(?:class|interface|enum)\s+(?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}();=])
+''', re.DOTALL | re.VERBOSE)
+
+# 成员之间的空白和注释
+_GAP_PATTERN = re.compile(r'(?:\s+|//[^\n]*|/\*.*?\*/)*', re.DOTALL)
+
+
+class _Frame:
+    """
+    花括号层级
+    类型体（type）内按成员解析声明头，方法体（method）和其他代码块（block）内只统计花括号
+    """
+    
+    __slots__ = ('kind', 'start', 'seq', 'schema', 'depth', 'continues_member',
+                 'boundary', 'paren', 'saw_paren', 'saw_equals', 'type_name')
+    
+    def __init__(self, kind, start=0, seq=0, schema=None, continues_member=False):
+        self.kind = kind
+        self.start = start
+        self.seq = seq
+        self.schema = schema
+        self.depth = 0
+        self.continues_member = continues_member
+        self.reset_member(start)
+    
+    def reset_member(self, boundary):
+        """开始解析类型体中的下一个成员"""
+        self.boundary = boundary
+        self.paren = 0
+        self.saw_paren = False
+        self.saw_equals = False
+        self.type_name = None
+
+
+def build_ds_scopes(content, ds_spans, line_number):
+    """
+    构建 @DS 作用域区间索引
+    方法上的 @DS 优先，没有时继承所在类的 @DS；嵌套类不继承外部类的 @DS
+    :param content: Java 文件内容
+    :param ds_spans: @DS 注解位置列表，元素为 (起始偏移, 结束偏移, schema)
+    :param line_number: 将偏移转换为行号的函数
+    :return: (作用域列表, 类型名称到生效 schema 的字典)；作用域列表元素为 [起始行号, schema]，
+        表示从该行开始到下一个元素之前的行使用该 schema（为 None 时表示没有 @DS）；
+        花括号不匹配无法解析时作用域列表为 None
+    """
+    ds_starts = [start for start, _, _ in ds_spans]
+    # (起始行号, 开始顺序, 结束行号, schema)
+    intervals = []
+    type_schemas = {}
+    seq = 0
+    
+    def own_schema(member_start, header_end):
+        index = bisect.bisect_left(ds_starts, member_start)
+        if index < len(ds_starts) and ds_starts[index] < header_end:
+            return ds_spans[index][2]
+        return None
+    
+    def member_start(frame):
+        return _GAP_PATTERN.match(content, frame.boundary).end()
+    
+    stack = [_Frame('type')]
+    for match in _TOKEN_PATTERN.finditer(content):
+        frame = stack[-1]
+        punct = match.group('punct')
+        if frame.kind != 'type':
+            # 方法体和代码块内只统计花括号
+            if punct == '{':
+                frame.depth += 1
+            elif punct == '}':
+                if frame.depth:
+                    frame.depth -= 1
+                    continue
+                stack.pop()
+                parent = stack[-1]
+                if frame.kind == 'method':
+                    if frame.schema != parent.schema:
+                        intervals.append((line_number(frame.start), frame.seq, line_number(match.start()), frame.schema))
+                    parent.reset_member(match.end())
+                elif not frame.continues_member:
+                    parent.reset_member(match.end())
+            continue
+        
+        name = match.group('name')
+        if name is not None:
+            if frame.paren == 0 and not frame.saw_equals and frame.type_name is None:
+                frame.type_name = name
+            continue
+        if punct is None:
+            continue
+        if punct == '(':
+            frame.paren += 1
+            frame.saw_paren = True
+        elif punct == ')':
+            frame.paren = max(0, frame.paren - 1)
+        elif frame.paren:
+            # 注解参数等括号内的内容不影响成员边界
+            continue
+        elif punct == '=':
+            frame.saw_equals = True
+        elif punct == ';':
+            if frame.saw_paren and not frame.saw_equals and frame.type_name is None:
+                # 没有方法体的方法（接口方法、抽象方法）
+                start = member_start(frame)
+                schema = own_schema(start, match.start())
+                if schema is not None and schema != frame.schema:
+                    seq += 1
+                    intervals.append((line_number(start), seq, line_number(match.start()), schema))
+            frame.reset_member(match.end())
+        elif punct == '{':
+            seq += 1
+            if frame.type_name is not None and not frame.saw_equals:
+                start = member_start(frame)
+                schema = own_schema(start, match.start())
+                type_schemas.setdefault(frame.type_name, schema)
+                stack.append(_Frame('type', start, seq, schema))
+                stack[-1].reset_member(match.end())
+            elif frame.saw_paren and not frame.saw_equals:
+                start = member_start(frame)
+                schema = own_schema(start, match.start())
+                stack.append(_Frame('method', start, seq, frame.schema if schema is None else schema))
+            else:
+                # 初始化块，或字段初始化中的数组和匿名类，后者在分号处才结束成员
+                stack.append(_Frame('block', continues_member=frame.saw_equals))
+        elif punct == '}':
+            if len(stack) == 1:
+                return None, type_schemas
+            stack.pop()
+            intervals.append((line_number(frame.start), frame.seq, line_number(match.start()), frame.schema))
+            stack[-1].reset_member(match.end())
+    
+    if len(stack) != 1:
+        return None, type_schemas
+    return _flatten(intervals), type_schemas
+
+
+def _flatten(intervals):
+    """
+    将嵌套的区间展开为按行号排列的作用域列表
+    按开始顺序依次覆盖，内层区间覆盖外层区间，同一行上后开始的区间覆盖先结束的区间
+    :param intervals: (起始行号, 开始顺序, 结束行号, schema) 列表
+    :return: [起始行号, schema] 列表
+    """
+    if not intervals:
+        return []
+    last_line = max(end for _, _, end, _ in intervals)
+    painted = [None] * (last_line + 2)
+    boundaries = set()
+    for start, _, end, schema in sorted(intervals, key=lambda interval: interval[1]):
+        painted[start:end + 1] = [schema] * (end - start + 1)
+        boundaries.add(start)
+        boundaries.add(end + 1)
+    
+    # 相邻边界之间的行使用同一个 schema，只需检查边界所在的行
+    scopes = []
+    current = None
+    for line in sorted(boundaries):
+        schema = painted[line]
+        if schema != current:
+            scopes.append([line, schema])
+            current = schema
+    return scopes
+
+
+def find_scope_schema(scope_lines, scope_schemas, line_num):
+    """
+    按行号查找生效的 @DS 注解
+    :param scope_lines: 作用域起始行号列表
+    :param scope_schemas: 作用域 schema 列表
+    :param line_num: 行号
+    :return: schema 名称，不在任何 @DS 作用域内时返回 None
+    """
+    index = bisect.bisect_right(scope_lines, line_num) - 1
+    if index < 0:
+        return None
+    return scope_schemas[index]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+外部归并排序模块
+记录数量超过内存预算时，将已排序的分段写入临时文件，最后多路归并输出
+"""
+
+import heapq
+import os
+import pickle
+import tempfile
+
+# 默认内存中最多保留的记录数量
+DEFAULT_MEMORY_RECORDS = 1000000
+# 写入临时文件时每个数据块包含的记录数量，读取时每个分段只缓存一个数据块
+SPILL_BLOCK_RECORDS = 10000
+
+
+class ExternalSorter:
+    """
+    外部归并排序器
+    排序结果与对全部记录调用 sorted() 一致（稳定排序）
+    """
+    
+    def __init__(self, memory_records=DEFAULT_MEMORY_RECORDS, temp_dir=None, key=None):
+        """
+        初始化外部归并排序器
+        :param memory_records: 内存中最多保留的记录数量，超过时写入临时文件
+        :param temp_dir: 临时文件目录，为空时使用系统临时目录
+        :param key: 排序键函数，为空时直接比较记录
+        """
+        self.memory_records = max(1, memory_records)
+        self.temp_dir = temp_dir
+        self.key = key
+        self.count = 0
+        self._buffer = []
+        self._runs = []
+    
+    def add(self, record):
+        """
+        添加一条记录
+        :param record: 记录（需要支持 pickle 序列化）
+        """
+        self._buffer.append(record)
+        self.count += 1
+        if len(self._buffer) >= self.memory_records:
+            self._spill()
+    
+    @property
+    def spilled_runs(self):
+        """已写入临时文件的分段数量"""
+        return len(self._runs)
+    
+    def _spill(self):
+        """将内存中的记录排序后写入临时文件"""
+        self._buffer.sort(key=self.key)
+        fd, path = tempfile.mkstemp(prefix='find_table_sort_', suffix='.run', dir=self.temp_dir)
+        self._runs.append(path)
+        with os.fdopen(fd, 'wb') as f:
+            for start in range(0, len(self._buffer), SPILL_BLOCK_RECORDS):
+                pickle.dump(self._buffer[start:start + SPILL_BLOCK_RECORDS], f, pickle.HIGHEST_PROTOCOL)
+        self._buffer = []
+    
+    @staticmethod
+    def _read_run(path):
+        """
+        按数据块读取一个已排序的分段
+        :param path: 临时文件路径
+        :return: 记录迭代器
+        """
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    block = pickle.load(f)
+                except EOFError:
+                    return
+                yield from block
+    
+    def sorted_records(self):
+        """
+        按顺序返回所有记录
+        没有写入临时文件时直接在内存中排序；否则对所有分段多路归并，
+        分段按写入顺序参与归并，保证相等记录保持添加时的顺序
+        :return: 记录迭代器
+        """
+        if not self._runs:
+            self._buffer.sort(key=self.key)
+            return iter(self._buffer)
+        if self._buffer:
+            self._spill()
+        return heapq.merge(*(self._read_run(path) for path in self._runs), key=self.key)
+    
+    def close(self):
+        """删除临时文件并释放内存"""
+        for path in self._runs:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._runs = []
+        self._buffer = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提取结果缓存模块
+按文件持久化保存提取结果、@DS 注解信息以及文件中的常量和 sql 片段，未修改的文件在下次运行时直接复用，不再读取
+"""
+
+import hashlib
+import json
+import os
+from .file_context import FileContext
+from .table_record import TableRecord
+
+# 缓存格式版本，缓存结构变化时需要递增
+CACHE_VERSION = 2
+
+# 缓存文件名称，保存在输出目录中
+CACHE_FILE_NAME = "extraction_cache.json"
+
+# 参与规则指纹计算的源文件，这些文件变化时缓存自动失效
+_MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+_RULE_SOURCES = ('extractors', 'schema_analyzer.py', 'extraction_cache.py', 'file_context.py', 'ds_scope.py',
+                 'symbol_index.py', 'mapper_parser.py', 'java_lexer.py', 'sql_table_cache.py', 'table_extractor.py',
+                 'table_record.py', 'table_cleaner.py')
+
+
+def compute_rules_fingerprint():
+    """
+    计算提取规则指纹
+    :return: 提取器和 @DS 分析规则源码的哈希值
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(CACHE_VERSION).encode())
+    for source in _RULE_SOURCES:
+        source_path = os.path.join(_MODULES_DIR, source)
+        if os.path.isdir(source_path):
+            source_files = sorted(
+                os.path.join(source_path, name)
+                for name in os.listdir(source_path) if name.endswith('.py')
+            )
+        else:
+            source_files = [source_path]
+        for source_file in source_files:
+            digest.update(os.path.basename(source_file).encode())
+            with open(source_file, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def hash_content(raw):
+    """
+    计算文件内容哈希
+    :param raw: 文件原始字节（bytes 或内存映射对象）
+    :return: 哈希字符串
+    """
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+class ExtractionCache:
+    """提取结果缓存"""
+    
+    def __init__(self, cache_path):
+        """
+        初始化提取结果缓存
+        :param cache_path: 缓存文件路径
+        """
+        self.cache_path = cache_path
+        self.rules_fingerprint = compute_rules_fingerprint()
+        self.entries = {}
+        self.seen_paths = set()
+        # 建立符号索引时读取的文件路径到 (文件大小, 修改时间, 常量和 sql 片段) 的映射，提取后随缓存条目一起保存
+        self.pending_symbols = {}
+        self.reset_counters()
+    
+    def reset_counters(self):
+        """重置统计计数器"""
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.invalidated = False
+    
+    def load(self):
+        """
+        从磁盘加载缓存，版本或规则指纹不一致时丢弃旧缓存
+        """
+        self.entries = {}
+        self.seen_paths = set()
+        self.pending_symbols = {}
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"   读取缓存文件失败，将重新提取: {e}")
+            self.invalidated = True
+            return
+        if data.get('version') != CACHE_VERSION or data.get('rules') != self.rules_fingerprint:
+            print("   提取规则已变化，缓存失效")
+            self.invalidated = True
+            return
+        self.entries = data.get('entries', {})
+    
+    def lookup(self, file_path, mmap_threshold=None, symbol_index=None):
+        """
+        查找文件的缓存结果
+        大小和修改时间一致时直接命中；否则读取文件并比较内容哈希；
+        文件引用的其他文件中的常量或 sql 片段变化时视为未命中
+        :param file_path: 文件路径
+        :param mmap_threshold: 使用内存映射读取文件的大小阈值（字节）
+        :param symbol_index: 本次运行的项目常量索引（SymbolIndex）
+        :return: (缓存条目或 None, 未命中时已打开的文件上下文或 None)
+        """
+        key = os.path.abspath(file_path)
+        self.seen_paths.add(key)
+        st = os.stat(file_path)
+        entry = self.entries.get(key)
+        if entry is not None and not self._symbols_unchanged(entry, symbol_index):
+            entry = None
+        if entry is not None and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            self.hits += 1
+            return entry, None
+        
+        context = FileContext.from_path(file_path, mmap_threshold)
+        raw = context.raw
+        if entry is not None and entry['size'] == len(raw) and entry['hash'] == hash_content(raw):
+            # 内容未变化，仅更新修改时间
+            entry['mtime_ns'] = st.st_mtime_ns
+            self.hits += 1
+            context.close()
+            return entry, None
+        self.misses += 1
+        return None, context
+    
+    def cached_symbols(self, file_path):
+        """
+        获取未修改文件缓存的常量和 sql 片段（SymbolIndex.collect() 的结果），只比较大小和修改时间，不读取文件
+        :param file_path: 文件路径
+        :return: 常量和 sql 片段，没有缓存、文件已修改或缓存条目中没有时返回 None
+        """
+        entry = self.entries.get(os.path.abspath(file_path))
+        if entry is None or 'symbols' not in entry:
+            return None
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        if entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns:
+            return None
+        return entry['symbols']
+    
+    def remember_symbols(self, file_path, symbols):
+        """
+        记录建立符号索引时从文件中收集的常量和 sql 片段，提取该文件后随缓存条目一起保存
+        :param file_path: 文件路径
+        :param symbols: SymbolIndex.collect() 的结果
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return
+        self.pending_symbols[os.path.abspath(file_path)] = (st.st_size, st.st_mtime_ns, symbols)
+    
+    @staticmethod
+    def _symbols_unchanged(entry, symbol_index):
+        """
+        检查缓存条目中通过项目符号索引解析的引用在本次运行中是否得到相同的结果
+        :param entry: 缓存条目
+        :param symbol_index: 本次运行的项目常量索引（SymbolIndex）
+        :return: 是否一致
+        """
+        for lookup in entry['statistics'].get('symbol_lookups', ()):
+            current = symbol_index.replay(lookup) if symbol_index is not None else None
+            if current != lookup[-1]:
+                return False
+        return True
+    
+    def store(self, file_path, content_hash, size, table_info, statistics, ds_findings):
+        """
+        保存文件的提取结果
+        :param file_path: 文件路径
+        :param content_hash: 文件内容哈希
+        :param size: 文件大小
+        :param table_info: 表信息列表
+        :param statistics: 提取统计增量
+        :param ds_findings: @DS 注解信息
+        """
+        key = os.path.abspath(file_path)
+        st = os.stat(file_path)
+        entry = {
+            'size': size,
+            'mtime_ns': st.st_mtime_ns,
+            'hash': content_hash,
+            'records': [
+                [info.source, info.table_name, info.file_name, info.line_num]
+                for info in table_info
+            ],
+            'statistics': statistics,
+            'ds': ds_findings
+        }
+        # 建立符号索引后文件没有再被修改时，一并保存其中的常量和 sql 片段
+        pending = self.pending_symbols.pop(key, None)
+        if pending is not None and pending[0] == size == st.st_size and pending[1] == st.st_mtime_ns:
+            entry['symbols'] = pending[2]
+        self.entries[key] = entry
+    
+    @staticmethod
+    def entry_records(entry):
+        """
+        将缓存条目还原为表信息列表
+        :param entry: 缓存条目
+        :return: 表信息列表
+        """
+        return [TableRecord(*record) for record in entry['records']]
+    
+    def evict_missing(self):
+        """
+        清理已删除文件的缓存条目
+        本次运行未访问且磁盘上已不存在的文件会被移除
+        """
+        for key in list(self.entries):
+            if key not in self.seen_paths and not os.path.exists(key):
+                del self.entries[key]
+                self.evicted += 1
+    
+    def save(self):
+        """
+        保存缓存到磁盘，先写入临时文件再替换，避免中断时损坏缓存
+        """
+        self.evict_missing()
+        self.pending_symbols = {}
+        data = {
+            'version': CACHE_VERSION,
+            'rules': self.rules_fingerprint,
+            'entries': self.entries
+        }
+        cache_dir = os.path.dirname(self.cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        temp_path = self.cache_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.cache_path)
+    
+    def print_statistics(self):
+        """打印缓存统计信息"""
+        print("   缓存统计信息:")
+        print(f"   - 命中缓存: {self.hits} 个文件")
+        print(f"   - 重新提取: {self.misses} 个文件")
+        print(f"   - 清理已删除文件: {self.evicted} 个")
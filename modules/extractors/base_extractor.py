@@ -4,7 +4,34 @@
 基础提取器接口
 """
 
+import re
 from abc import ABC, abstractmethod
+from ..symbol_index import qualify_reference
+from .sql_lexer import scan_sql_tables
+
+# 忽略大小写匹配时与 ASCII 字母等价的非 ASCII 字符（UTF-8 编码），
+# 触发检查需要覆盖这些字符，才能保证不会漏掉正则能匹配到的关键字
+_CASE_FOLD_EQUIVALENTS = {
+    ord('i'): (b'\xc4\xb0', b'\xc4\xb1'),
+    ord('s'): (b'\xc5\xbf',),
+    ord('k'): (b'\xe2\x84\xaa',),
+}
+
+
+def _keyword_trigger_regex(keyword):
+    """
+    构造单个SQL关键字的触发模式
+    :param keyword: 关键字字节串
+    :return: 正则表达式字节串
+    """
+    parts = []
+    for byte in keyword.lower():
+        equivalents = _CASE_FOLD_EQUIVALENTS.get(byte)
+        letter = re.escape(bytes([byte]))
+        if equivalents:
+            letter = b'(?:' + b'|'.join((letter,) + equivalents) + b')'
+        parts.append(letter)
+    return b''.join(parts)
 
 
 class BaseExtractor(ABC):
@@ -13,24 +40,82 @@ class BaseExtractor(ABC):
     所有具体的提取器都需要实现这个接口
     """
     
+    # 适用的文件扩展名
+    file_extensions = ()
+    # 触发字节串：文件原始内容中不包含任何触发字节串时跳过该提取器，为空表示总是执行
+    triggers = ()
+    # 触发字节串是否为SQL关键字（忽略大小写并按单词边界匹配）
+    triggers_are_keywords = False
+    
     def __init__(self):
         """
         初始化提取器
         """
         self.counter = 0
+        # 预筛选时跳过的文件数量
+        self.skipped_files = 0
         # 存储被过滤的表名信息
         self.filtered_tables = []
+        # 项目符号索引（SymbolIndex），为空时只解析本文件中的常量和 sql 片段
+        self.symbol_index = None
+        # 通过项目符号索引解析的引用，元素为 SymbolIndex.replay() 接受的查找记录，用于校验提取缓存
+        self.symbol_lookups = []
+        # SQL 表名缓存（SQLTableCache），由提取器管理器设置，所有提取器共享；为空时直接扫描
+        self.sql_cache = None
+        # 编译后的触发模式，用于预筛选和内存映射模式下定位候选行
+        self.trigger_pattern = re.compile(self.trigger_regex()) if self.triggers else None
+    
+    @classmethod
+    def trigger_regex(cls):
+        """
+        构造触发模式
+        SQL关键字忽略大小写，且前后不能是 ASCII 单词字符
+        :return: 正则表达式字节串
+        """
+        if cls.triggers_are_keywords:
+            keywords = b'|'.join(_keyword_trigger_regex(trigger) for trigger in cls.triggers)
+            return rb'(?<![A-Za-z0-9_])(?i:' + keywords + rb')(?![A-Za-z0-9_])'
+        return b'|'.join(re.escape(trigger) for trigger in cls.triggers)
     
     @abstractmethod
-    def extract(self, file_path, content):
+    def extract(self, context):
         """
         从文件内容中提取表名
-        :param file_path: 文件路径
-        :param content: 文件内容
+        :param context: 文件上下文（FileContext）
         :return: 表信息列表
         """
         pass
     
+    def scan_sql(self, sql):
+        """
+        扫描一段 SQL 文本中的表引用，设置了 SQL 表名缓存时重复的 SQL 只扫描一次
+        :param sql: SQL 文本
+        :return: (关键字偏移, 表名偏移, 表名) 列表，按出现顺序排列
+        """
+        if self.sql_cache is None:
+            return scan_sql_tables(sql)
+        return self.sql_cache.scan(sql)
+    
+    def resolve_constant(self, context, reference):
+        """
+        解析常量引用的字符串值
+        先查找本文件中的字符串赋值，找不到时查找项目常量索引
+        :param context: 文件上下文（FileContext）
+        :param reference: 常量引用，如 ORDER_TABLE 或 TableConstants.ORDER_TABLE
+        :return: 字符串值，无法解析时返回 None
+        """
+        value = context.find_assignment(reference)
+        if value is not None:
+            return value
+        reference = qualify_reference(reference, context.imports)
+        package = context.package_name
+        class_name = context.class_name
+        if self.symbol_index is not None:
+            class_name = self.symbol_index.file_types.get(context.file_path, class_name)
+            value = self.symbol_index.resolve(reference, package, class_name)
+        self.symbol_lookups.append(['constant', reference, package, class_name, value])
+        return value
+    
     def get_counter(self):
         """
         获取提取计数器
@@ -43,6 +128,15 @@ class BaseExtractor(ABC):
         重置提取计数器
         """
         self.counter = 0
+        self.skipped_files = 0
+        self.symbol_lookups = []
+    
+    def get_skipped_files(self):
+        """
+        获取预筛选时跳过的文件数量
+        :return: 跳过的文件数量
+        """
+        return self.skipped_files
     
     def reset_filtered_tables(self):
         """
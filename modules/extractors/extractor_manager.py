@@ -5,11 +5,22 @@
 管理所有的表名提取器并提供统一的接口
 """
 
+import re
+from ..file_context import FileContext
+from ..sql_table_cache import SQLTableCache
 from .xml_extractor import XMLExtractor
 from .table_name_extractor import TableNameExtractor
 from .sql_annotation_extractor import SQLAnnotationExtractor
 from .java_sql_extractor import JavaSQLExtractor
 
+# 各提取器在统计信息中的显示名称
+EXTRACTOR_LABELS = {
+    'xml': 'XML 文件',
+    'table_name': '@TableName',
+    'sql_annotation': 'SQL 注解',
+    'java_sql': 'Java SQL'
+}
+
 
 class ExtractorManager:
     """
@@ -17,9 +28,11 @@ class ExtractorManager:
     管理所有的表名提取器并提供统一的接口
     """
     
-    def __init__(self):
+    def __init__(self, symbol_index=None, sql_cache=None):
         """
         初始化提取器管理器
+        :param symbol_index: 项目符号索引（SymbolIndex），为空时只解析文件内的常量和 sql 片段
+        :param sql_cache: 所有提取器共享的 SQL 表名缓存（SQLTableCache），为空时使用默认容量的内存缓存
         """
         # 初始化所有提取器
         self.extractors = {
@@ -28,6 +41,14 @@ class ExtractorManager:
             'sql_annotation': SQLAnnotationExtractor(),
             'java_sql': JavaSQLExtractor()
         }
+        self.set_symbol_index(symbol_index)
+        self.sql_cache = sql_cache if sql_cache is not None else SQLTableCache()
+        for extractor in self.extractors.values():
+            extractor.sql_cache = self.sql_cache
+        # 运行指标（RunMetrics），不为空时记录各提取器的耗时
+        self.metrics = None
+        # 按待检查的提取器组合缓存的组合触发模式
+        self._trigger_patterns = {}
         # 初始化统计信息
         self.reset_counters()
     
@@ -38,6 +59,7 @@ class ExtractorManager:
         for extractor in self.extractors.values():
             extractor.reset_counter()
             extractor.reset_filtered_tables()
+        self.sql_cache.reset_counters()
         # 重置SQL注解提取器的计数器
         if hasattr(self.extractors['sql_annotation'], 'annotation_counters'):
             self.extractors['sql_annotation'].annotation_counters = {
@@ -47,6 +69,15 @@ class ExtractorManager:
                 'Delete': 0
             }
     
+    def set_symbol_index(self, symbol_index):
+        """
+        设置各提取器解析常量引用和 include 时使用的项目符号索引
+        :param symbol_index: 项目符号索引（SymbolIndex），为空时只解析文件内的常量和 sql 片段
+        """
+        self.symbol_index = symbol_index
+        for extractor in self.extractors.values():
+            extractor.symbol_index = symbol_index
+    
     def extract_from_file(self, file_path, content):
         """
         从文件中提取表名
@@ -54,20 +85,133 @@ class ExtractorManager:
         :param content: 文件内容
         :return: 表信息列表
         """
+        return self.extract_from_context(FileContext(file_path, content=content))
+    
+    def extract_from_context(self, context):
+        """
+        从文件上下文中提取表名，所有提取器共享同一份文件内容和行列表
+        :param context: 文件上下文（FileContext）
+        :return: 表信息列表
+        """
         table_info = []
+        file_path = context.file_path
         
         # 根据文件类型选择提取器
-        if file_path.endswith('.xml'):
-            # 使用XML提取器
-            table_info.extend(self.extractors['xml'].extract(file_path, content))
-        elif file_path.endswith('.java'):
-            # 使用Java相关提取器
-            table_info.extend(self.extractors['table_name'].extract(file_path, content))
-            table_info.extend(self.extractors['sql_annotation'].extract(file_path, content))
-            table_info.extend(self.extractors['java_sql'].extract(file_path, content))
+        candidates = [
+            name for name, extractor in self.extractors.items()
+            if file_path.endswith(extractor.file_extensions)
+        ]
+        if not candidates:
+            return table_info
+        
+        # 在原始字节上预筛选，只调用触发字节串出现在文件中的提取器
+        triggered = self._find_triggered_extractors(context.raw, candidates)
+        for name in candidates:
+            extractor = self.extractors[name]
+            if name in triggered:
+                if self.metrics is None:
+                    table_info.extend(extractor.extract(context))
+                else:
+                    with self.metrics.extractor(type(extractor).__name__):
+                        table_info.extend(extractor.extract(context))
+            else:
+                extractor.skipped_files += 1
         
         return table_info
     
+    def _find_triggered_extractors(self, raw, candidates):
+        """
+        使用组合触发模式在文件原始字节中查找被触发的提取器
+        每找到一个提取器的触发字节串，就从后续检查中移除该提取器
+        :param raw: 文件原始字节
+        :param candidates: 候选提取器名称列表
+        :return: 被触发的提取器名称集合
+        """
+        triggered = {name for name in candidates if not self.extractors[name].triggers}
+        remaining = tuple(name for name in candidates if name not in triggered)
+        position = 0
+        while remaining:
+            match = self._get_trigger_pattern(remaining).search(raw, position)
+            if match is None:
+                break
+            name = match.lastgroup
+            triggered.add(name)
+            remaining = tuple(other for other in remaining if other != name)
+            # 不同提取器的触发字节串可能重叠（如 @Update 和 UPDATE），从匹配起点继续查找
+            position = match.start()
+        return triggered
+    
+    def _get_trigger_pattern(self, names):
+        """
+        获取一组提取器的组合触发模式
+        :param names: 提取器名称元组
+        :return: 编译后的正则表达式
+        """
+        pattern = self._trigger_patterns.get(names)
+        if pattern is None:
+            pattern = re.compile(b'|'.join(
+                b'(?P<' + name.encode() + b'>' + self.extractors[name].trigger_regex() + b')'
+                for name in names
+            ))
+            self._trigger_patterns[names] = pattern
+        return pattern
+    
+    def extract_with_statistics(self, context):
+        """
+        从文件上下文中提取表名，同时返回本次提取产生的统计增量
+        :param context: 文件上下文（FileContext）
+        :return: 表信息列表, 统计增量
+        """
+        counters_before = {name: extractor.get_counter() for name, extractor in self.extractors.items()}
+        skipped_before = {name: extractor.get_skipped_files() for name, extractor in self.extractors.items()}
+        annotation_before = dict(self.extractors['sql_annotation'].get_annotation_counters())
+        filtered_before = {name: len(extractor.get_filtered_tables()) for name, extractor in self.extractors.items()}
+        lookups_before = {name: len(extractor.symbol_lookups) for name, extractor in self.extractors.items()}
+        
+        table_info = self.extract_from_context(context)
+        
+        annotation_after = self.extractors['sql_annotation'].get_annotation_counters()
+        statistics = {
+            'counters': {
+                name: extractor.get_counter() - counters_before[name]
+                for name, extractor in self.extractors.items()
+            },
+            'skipped_files': {
+                name: extractor.get_skipped_files() - skipped_before[name]
+                for name, extractor in self.extractors.items()
+            },
+            'annotation_counters': {
+                name: count - annotation_before.get(name, 0)
+                for name, count in annotation_after.items()
+            },
+            'filtered_tables': {
+                name: extractor.get_filtered_tables()[filtered_before[name]:]
+                for name, extractor in self.extractors.items()
+            },
+            # 通过项目符号索引解析的引用，缓存命中前需要重新校验
+            'symbol_lookups': [
+                lookup
+                for name, extractor in self.extractors.items()
+                for lookup in extractor.symbol_lookups[lookups_before[name]:]
+            ]
+        }
+        return table_info, statistics
+    
+    def apply_statistics(self, statistics):
+        """
+        将统计增量累加到各提取器的计数器中
+        :param statistics: extract_with_statistics 返回的统计增量
+        """
+        for name, count in statistics['counters'].items():
+            self.extractors[name].counter += count
+        for name, count in statistics['skipped_files'].items():
+            self.extractors[name].skipped_files += count
+        annotation_counters = self.extractors['sql_annotation'].annotation_counters
+        for name, count in statistics['annotation_counters'].items():
+            annotation_counters[name] = annotation_counters.get(name, 0) + count
+        for name, filtered_tables in statistics['filtered_tables'].items():
+            self.extractors[name].filtered_tables.extend(filtered_tables)
+    
     def get_statistics(self):
         """
         获取提取统计信息
@@ -115,6 +259,18 @@ class ExtractorManager:
         print(f"       - @Delete: {stats['Delete']} 条")
         print(f"     * Java SQL: {stats['Java SQL']} 条")
         
+        # 打印预筛选跳过的文件数量
+        print("   - 预筛选跳过的文件:")
+        for name, extractor in self.extractors.items():
+            print(f"     * {EXTRACTOR_LABELS.get(name, name)}: {extractor.get_skipped_files()} 个")
+        
+        # 打印 SQL 表名缓存的命中情况
+        sql_cache_stats = self.sql_cache.get_statistics()
+        print("   - SQL 表名缓存:")
+        print(f"     * 命中: {sql_cache_stats['hits']} 次")
+        print(f"     * 未命中: {sql_cache_stats['misses']} 次")
+        print(f"     * 淘汰: {sql_cache_stats['evictions']} 条")
+        
         # 打印被过滤的表名信息
         total_filtered = 0
         all_filtered_tables = []
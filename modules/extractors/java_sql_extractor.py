@@ -6,8 +6,12 @@ Java SQL提取器
 """
 
 import re
-import os
 from .base_extractor import BaseExtractor
+from ..table_record import TableRecord
+from .sql_lexer import TABLE_KEYWORDS
+
+# 字符串中包含表名关键字时才可能是 SQL
+SQL_KEYWORD_PATTERN = re.compile(r'\b(?:' + '|'.join(TABLE_KEYWORDS) + r')\b', re.IGNORECASE)
 
 
 class JavaSQLExtractor(BaseExtractor):
@@ -16,67 +20,56 @@ class JavaSQLExtractor(BaseExtractor):
     从Java文件中提取SQL语句中的表名
     """
     
+    file_extensions = ('.java',)
+    triggers = tuple(keyword.encode() for keyword in TABLE_KEYWORDS)
+    triggers_are_keywords = True
+    
     def __init__(self):
         """
         初始化Java SQL提取器
         """
         super().__init__()
-        self.table_keywords = ['FROM', 'JOIN', 'INTO', 'UPDATE', 'TABLE']
     
-    def extract(self, file_path, content):
+    def extract(self, context):
         """
         从Java文件中提取SQL语句中的表名
-        :param file_path: 文件路径
-        :param content: 文件内容
+        :param context: 文件上下文（FileContext）
         :return: 表信息列表
         """
         table_info = []
         
         try:
-            lines = content.split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
-                try:
-                    # 检查是否包含SQL关键字
-                    has_sql_keyword = any(keyword in line.upper() for keyword in self.table_keywords)
-                    # 检查是否可能是SQL语句（包含引号或SQL关键字）
-                    is_sql_line = has_sql_keyword or ('"' in line and 'SELECT' in line.upper()) or ('"' in line and 'INSERT' in line.upper()) or ('"' in line and 'UPDATE' in line.upper()) or ('"' in line and 'DELETE' in line.upper())
-                    
-                    if is_sql_line:
-                        # 提取关键字后的表名
-                        for keyword in self.table_keywords:
-                            # 使用正则表达式匹配关键字后的表名，支持更复杂的情况
-                            pattern = r'\b' + keyword + r'\b\s+([\w\.]+(?:\s*\.[\w]+)*)'
-                            matches = re.finditer(pattern, line, re.IGNORECASE)
-                            
-                            for match in matches:
-                                table_name = match.group(1).strip()
-                                # 过滤掉空表名和无效表名
-                                if table_name and not table_name.startswith('${') and not table_name.startswith('#{'):
-                                    table_info.append({
-                                        'source': 'Java SQL',
-                                        'table_name': table_name,
-                                        'file_name': os.path.basename(file_path),
-                                        'line_num': line_num
-                                    })
-                                    self.counter += 1
-                                else:
-                                    # 记录被过滤的表名信息
-                                    filter_reasons = []
-                                    if not table_name:
-                                        filter_reasons.append('空表名')
-                                    if table_name.startswith('${') or table_name.startswith('#{'):
-                                        filter_reasons.append('包含变量形式')
-                                    if filter_reasons:
-                                        self.filtered_tables.append({
-                                            'table_name': table_name,
-                                            'file_name': os.path.basename(file_path),
-                                            'line_num': line_num,
-                                            'filter_reasons': filter_reasons
-                                        })
-                except Exception as e:
-                    # 忽略错误，继续处理下一行
-                    pass
+            # 文件中的字符串拼接、文本块和 StringBuilder.append 链已折叠为逻辑字符串，
+            # 只有包含表名关键字的字符串才解析拼接的常量并扫描其中的 SQL
+            hits = []
+            for java_string in context.java_strings:
+                if not SQL_KEYWORD_PATTERN.search(java_string.literal_text):
+                    continue
+                sql, locate = java_string.join(lambda reference: self.resolve_constant(context, reference))
+                for _, name_start, table_name in self.scan_sql(sql):
+                    hits.append((locate(name_start), table_name))
+            hits.sort(key=lambda hit: hit[0])
+            for offset, table_name in hits:
+                line_num = context.line_number(offset)
+                table_name = table_name.strip()
+                # 过滤掉空表名和无效表名
+                if table_name and not table_name.startswith('${') and not table_name.startswith('#{'):
+                    table_info.append(TableRecord('Java SQL', table_name, context.file_name, line_num))
+                    self.counter += 1
+                else:
+                    # 记录被过滤的表名信息
+                    filter_reasons = []
+                    if not table_name:
+                        filter_reasons.append('空表名')
+                    if table_name.startswith('${') or table_name.startswith('#{'):
+                        filter_reasons.append('包含变量形式')
+                    if filter_reasons:
+                        self.filtered_tables.append({
+                            'table_name': table_name,
+                            'file_name': context.file_name,
+                            'line_num': line_num,
+                            'filter_reasons': filter_reasons
+                        })
         except Exception as e:
             # 忽略错误，返回已提取的表信息
             pass
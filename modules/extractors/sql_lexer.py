@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQL词法扫描模块
+对 SQL 文本单次线性扫描，跳过注释和字符串，识别带引号的标识符、带 schema 的表名和 MyBatis 占位符，
+只在 FROM、JOIN、INTO、UPDATE、TABLE 之后的表名位置返回表引用（包括 FROM a, b 列表），
+不返回别名、子查询括号和关键字
+"""
+
+import re
+
+# 表名前的SQL关键字
+TABLE_KEYWORDS = ('FROM', 'JOIN', 'INTO', 'UPDATE', 'TABLE')
+_TABLE_KEYWORD_SET = frozenset(TABLE_KEYWORDS)
+# 之后可以跟逗号分隔的多个表的关键字
+_LIST_KEYWORDS = frozenset(('FROM', 'UPDATE'))
+# 关键字和表名之间可以出现的修饰词（CREATE TABLE IF NOT EXISTS、LATERAL、ONLY）
+_TABLE_MODIFIERS = frozenset(('IF', 'NOT', 'EXISTS', 'LATERAL', 'ONLY'))
+# 出现在这些词之后的 UPDATE 不是语句（SELECT ... FOR UPDATE、ON DUPLICATE KEY UPDATE）
+_UPDATE_CLAUSE_PREFIXES = frozenset(('FOR', 'KEY'))
+
+# 不能作为表名或别名的保留字，出现在表名位置时表示该位置没有表名
+RESERVED_WORDS = frozenset((
+    'SELECT', 'INSERT', 'UPDATE', 'DELETE', 'FROM', 'INTO', 'JOIN', 'TABLE', 'WHERE', 'SET',
+    'VALUES', 'VALUE', 'ON', 'USING', 'GROUP', 'ORDER', 'BY', 'HAVING', 'LIMIT', 'OFFSET',
+    'UNION', 'INTERSECT', 'EXCEPT', 'MINUS', 'LEFT', 'RIGHT', 'INNER', 'OUTER', 'CROSS', 'FULL',
+    'NATURAL', 'STRAIGHT_JOIN', 'AS', 'AND', 'OR', 'NOT', 'IN', 'EXISTS', 'IS', 'NULL', 'LIKE',
+    'BETWEEN', 'CASE', 'WHEN', 'THEN', 'ELSE', 'END', 'FOR', 'WITH', 'WINDOW', 'FETCH',
+    'PARTITION', 'LATERAL', 'ONLY', 'IF', 'RETURNING', 'CONNECT', 'START', 'USE', 'FORCE',
+    'IGNORE', 'ALL', 'DISTINCT', 'ANY', 'SOME', 'ASC', 'DESC', 'KEY', 'DUPLICATE',
+))
+
+# SQL 词法单元，同一位置最多尝试一次，没有嵌套的可变长度重复，扫描时间与文本长度成线性关系；
+# 空白和运算符不构成词法单元，由 finditer 直接跳过；* 作为标点保留，t.* 之后的关键字不会被当作 t 的列名
+_SQL_TOKEN_PATTERN = re.compile(r"""
+    (?P<placeholder>[#$]\{[^}\n]*\}?)
+  | (?P<escape>\\.?)
+  | (?P<word>(?:\w|\$(?!\{))+)
+  | (?P<quoted>"[^"\n]*"?|`[^`\n]*`?|\[[^\]\n]*\]?)
+  | (?P<comment>--[^\n]*|/\*[^*]*(?:\*+[^*/][^*]*)*\**/?)
+  | (?P<string>'[^'\n]*(?:''[^'\n]*)*'?)
+  | (?P<punct>[.,()*])
+""", re.VERBOSE)
+
+# 解析状态：无、关键字之后、表名中、表名的点号之后、表名之后、AS 之后、别名之后
+_NONE, _TABLE, _NAME, _DOT, _AFTER, _ALIAS, _ALIASED = range(7)
+
+
+def _name_part(kind, text):
+    """
+    获取表名的一部分：带引号的标识符去掉引号和转义符，其他原样返回
+    :param kind: 词法单元类型
+    :param text: 词法单元文本
+    :return: 表名的一部分
+    """
+    if kind != 'quoted':
+        return text
+    closing = {'"': '"', '`': '`', '[': ']'}[text[0]]
+    inner = text[1:-1] if len(text) > 1 and text[-1] == closing else text[1:]
+    return inner.replace('\\', '')
+
+
+class SQLTableParser:
+    """
+    SQL 表引用解析器
+    逐个处理词法单元，记录关键字之后的表名；状态在多次 feed 之间保留，
+    可以按行边界分块扫描同一段 SQL
+    """
+    
+    __slots__ = ('state', 'list_keyword', 'keyword_start', 'parts', 'name_start', 'name_end',
+                 'previous', 'frames', 'in_comment')
+    
+    def __init__(self):
+        """
+        初始化解析器
+        """
+        self.state = _NONE
+        # 当前关键字之后是否可以跟逗号分隔的多个表
+        self.list_keyword = False
+        self.keyword_start = 0
+        self.parts = []
+        self.name_start = 0
+        self.name_end = 0
+        # 上一个词法单元：单词为其大写形式，标点为其本身，其他为 None
+        self.previous = None
+        # 括号栈：[是否为函数调用, 是否包含 SELECT, 括号结束后的状态, 括号结束后的 list_keyword]
+        self.frames = []
+        # 上一块以未结束的块注释结尾
+        self.in_comment = False
+    
+    def feed(self, text, start=0, end=None, base=0):
+        """
+        扫描一段文本中的表引用
+        :param text: 文本
+        :param start: 扫描起始位置
+        :param end: 扫描结束位置，为空时扫描到文本末尾
+        :param base: 加到返回偏移上的基准偏移
+        :return: (关键字偏移, 表名偏移, 表名) 列表
+        """
+        if end is None:
+            end = len(text)
+        refs = []
+        if self.in_comment:
+            close = text.find('*/', start, end)
+            if close == -1:
+                return refs
+            self.in_comment = False
+            start = close + 2
+        
+        state = self.state
+        previous = self.previous
+        frames = self.frames
+        for match in _SQL_TOKEN_PATTERN.finditer(text, start, end):
+            kind = match.lastgroup
+            if kind == 'escape':
+                continue
+            if kind == 'comment':
+                token = match.group()
+                if token[1] == '*' and (len(token) < 4 or not token.endswith('*/')):
+                    self.in_comment = True
+                continue
+            token = match.group()
+            
+            # 同一个词法单元可能结束一个状态后在新状态下重新处理
+            while True:
+                if state == _NONE:
+                    break
+                if state == _TABLE:
+                    if kind == 'word':
+                        upper = token.upper()
+                        if upper in _TABLE_MODIFIERS:
+                            token = None
+                            break
+                        if upper in RESERVED_WORDS:
+                            state = _NONE
+                            continue
+                    if kind == 'word' or kind == 'quoted' or kind == 'placeholder':
+                        self.parts = [_name_part(kind, token)]
+                        self.name_start = match.start() + base
+                        self.name_end = match.end() + base
+                        state = _NAME
+                        previous = token.upper() if kind == 'word' else None
+                        token = None
+                        break
+                    if token == '(':
+                        # 子查询或括号中的表，括号结束后可以跟别名和逗号
+                        frames.append([False, False, _AFTER, self.list_keyword])
+                        state = _NONE
+                        previous = '('
+                        token = None
+                        break
+                    state = _NONE
+                    continue
+                if state == _NAME:
+                    if token == '.':
+                        state = _DOT
+                        previous = '.'
+                        token = None
+                        break
+                    if (kind == 'word' or kind == 'placeholder') and match.start() + base == self.name_end:
+                        # 紧挨着的单词和占位符属于同一个名称，如 t_${suffix}
+                        self.parts[-1] += token
+                        self.name_end = match.end() + base
+                        token = None
+                        break
+                    refs.append((self.keyword_start, self.name_start, '.'.join(self.parts)))
+                    state = _AFTER
+                    continue
+                if state == _DOT:
+                    if kind == 'word' or kind == 'quoted' or kind == 'placeholder':
+                        self.parts.append(_name_part(kind, token))
+                        self.name_end = match.end() + base
+                        state = _NAME
+                        previous = token.upper() if kind == 'word' else None
+                        token = None
+                        break
+                    refs.append((self.keyword_start, self.name_start, '.'.join(self.parts)))
+                    state = _NONE
+                    continue
+                if state == _AFTER or state == _ALIASED:
+                    if token == ',' and self.list_keyword:
+                        state = _TABLE
+                        previous = ','
+                        token = None
+                        break
+                    if state == _AFTER:
+                        if kind == 'word':
+                            upper = token.upper()
+                            if upper == 'AS':
+                                state = _ALIAS
+                                previous = upper
+                                token = None
+                                break
+                            if upper not in RESERVED_WORDS:
+                                state = _ALIASED
+                                previous = upper
+                                token = None
+                                break
+                        elif kind == 'quoted':
+                            state = _ALIASED
+                            previous = None
+                            token = None
+                            break
+                    state = _NONE
+                    continue
+                # _ALIAS
+                if kind == 'word' or kind == 'quoted':
+                    state = _ALIASED
+                    previous = None
+                    token = None
+                    break
+                state = _NONE
+            if token is None:
+                continue
+            
+            if kind == 'word':
+                upper = token.upper()
+                position = match.start()
+                if (upper in _TABLE_KEYWORD_SET and previous != '.'
+                        and not (position and text[position - 1] in '</')
+                        and (not frames or not frames[-1][0] or frames[-1][1])
+                        and not (upper == 'UPDATE' and previous in _UPDATE_CLAUSE_PREFIXES)):
+                    state = _TABLE
+                    self.list_keyword = upper in _LIST_KEYWORDS
+                    self.keyword_start = position + base
+                elif upper == 'SELECT' and frames:
+                    frames[-1][1] = True
+                previous = upper
+            elif token == '(':
+                # 紧跟在普通单词后的括号是函数调用，其中的 FROM（如 EXTRACT(YEAR FROM d)）不是表名关键字
+                function = previous is not None and previous[0] not in '.,()*' and previous not in RESERVED_WORDS
+                frames.append([function, False, _NONE, self.list_keyword])
+                previous = '('
+            elif token == ')':
+                if frames:
+                    _, _, state, self.list_keyword = frames.pop()
+                previous = ')'
+            elif kind == 'punct':
+                previous = token
+            else:
+                previous = None
+        
+        self.state = state
+        self.previous = previous
+        return refs
+    
+    @property
+    def pending_start(self):
+        """尚未结束的表名的偏移，没有时为 None"""
+        if self.state == _NAME or self.state == _DOT:
+            return self.name_start
+        return None
+    
+    def finish(self):
+        """
+        结束扫描，返回文本末尾尚未结束的表名
+        :return: (关键字偏移, 表名偏移, 表名) 列表
+        """
+        refs = []
+        if self.state == _NAME or self.state == _DOT:
+            refs.append((self.keyword_start, self.name_start, '.'.join(self.parts)))
+        self.state = _NONE
+        return refs
+
+
+def scan_sql_tables(text):
+    """
+    扫描一段 SQL 文本中的表引用
+    :param text: SQL 文本
+    :return: (关键字偏移, 表名偏移, 表名) 列表，按出现顺序排列
+    """
+    parser = SQLTableParser()
+    refs = parser.feed(text)
+    refs.extend(parser.finish())
+    return refs
+
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQL关键字扫描引擎
+使用 SQL 词法扫描器单次扫描整个文件内容，提取关键字后的表名
+"""
+
+from ..file_context import FileContext
+from .sql_lexer import TABLE_KEYWORDS, SQLTableParser
+
+
+def scan_keyword_tables(context):
+    """
+    扫描文件内容中所有关键字后的表名，结果按出现顺序排列
+    内存映射模式下按行边界分块解码整个文件，扫描状态（如跨行的注释）在块之间保留
+    :param context: 文件上下文（FileContext）
+    :return: (行号, 表名) 列表，行号为表名所在行
+    """
+    lexer = SQLTableParser()
+    if not context.mapped:
+        refs = lexer.feed(context.content)
+        refs.extend(lexer.finish())
+        return [(context.line_number(name_start), table_name) for _, name_start, table_name in refs]
+    
+    tables = []
+    # 仍可能被引用的块：(块起始偏移, 块首行行号, 块上下文)
+    chunks = []
+    base = 0
+    for first_line_num, text in context.iter_chunks():
+        chunks.append((base, first_line_num, FileContext(context.file_path, content=text)))
+        tables.extend(_locate(chunks, lexer.feed(text, base=base)))
+        # 只保留当前块和尚未结束的表名所在的块
+        pending = lexer.pending_start
+        chunks = [chunk for chunk in chunks[:-1] if pending is not None and chunk[0] <= pending] + chunks[-1:]
+        base += len(text) + 1
+    tables.extend(_locate(chunks, lexer.finish()))
+    return tables
+
+
+def _locate(chunks, refs):
+    """
+    将内存映射模式下的表名偏移转换为行号
+    :param chunks: 块列表，(块起始偏移, 块首行行号, 块上下文)
+    :param refs: (关键字偏移, 表名偏移, 表名) 列表
+    :return: (行号, 表名) 列表
+    """
+    tables = []
+    for _, name_start, table_name in refs:
+        for chunk_base, first_line_num, chunk in reversed(chunks):
+            if chunk_base <= name_start:
+                tables.append((chunk.line_number(name_start - chunk_base) + first_line_num - 1, table_name))
+                break
+    return tables
+
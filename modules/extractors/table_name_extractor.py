@@ -6,8 +6,8 @@ TableName注解提取器
 """
 
 import re
-import os
 from .base_extractor import BaseExtractor
+from ..table_record import TableRecord
 
 
 class TableNameExtractor(BaseExtractor):
@@ -16,25 +16,26 @@ class TableNameExtractor(BaseExtractor):
     从Java文件中提取@TableName注解中的表名
     """
     
+    file_extensions = ('.java',)
+    triggers = (b'@TableName',)
+    
     def __init__(self):
         """
         初始化TableName提取器
         """
         super().__init__()
     
-    def extract(self, file_path, content):
+    def extract(self, context):
         """
         从Java文件中提取@TableName注解中的表名
-        :param file_path: 文件路径
-        :param content: 文件内容
+        :param context: 文件上下文（FileContext）
         :return: 表信息列表
         """
         table_info = []
         
         try:
-            lines = content.split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
+            # 内存映射模式下只解码包含注解的行
+            for line_num, line in context.iter_lines(self.trigger_pattern):
                 try:
                     # 处理 @TableName 注解
                     if '@TableName' in line:
@@ -43,12 +44,7 @@ class TableNameExtractor(BaseExtractor):
                             match = re.search(pattern, line)
                             if match:
                                 table_name = match.group(1)
-                                table_info.append({
-                                    'source': '@TableName',
-                                    'table_name': table_name,
-                                    'file_name': os.path.basename(file_path),
-                                    'line_num': line_num
-                                })
+                                table_info.append(TableRecord('@TableName', table_name, context.file_name, line_num))
                                 self.counter += 1
                             else:
                                 # 尝试匹配不带 value 的形式
@@ -56,12 +52,7 @@ class TableNameExtractor(BaseExtractor):
                                 match = re.search(pattern, line)
                                 if match:
                                     table_name = match.group(1)
-                                    table_info.append({
-                                        'source': '@TableName',
-                                        'table_name': table_name,
-                                        'file_name': os.path.basename(file_path),
-                                        'line_num': line_num
-                                    })
+                                    table_info.append(TableRecord('@TableName', table_name, context.file_name, line_num))
                                     self.counter += 1
                         except Exception as e:
                             # 忽略错误，继续处理其他注解
@@ -2,61 +2,160 @@
 # -*- coding: utf-8 -*-
 """
 XML文件提取器
-从XML文件中提取表名
+从 MyBatis Mapper 文件的 SQL 语句中提取表名
 """
 
-import re
-import os
+import bisect
 from .base_extractor import BaseExtractor
+from ..table_record import TableRecord
+from ..mapper_parser import INCLUDE, ParseError, fragment_text, parse_mapper, split_refid
+from .sql_scanner import TABLE_KEYWORDS, scan_keyword_tables
 
 
 class XMLExtractor(BaseExtractor):
     """
     XML文件提取器
-    从XML文件中提取表名
+    只处理根元素为 mapper 的文件，从 select、insert、update、delete 和 sql 元素中提取表名；
+    include 引用的 sql 片段展开后参与匹配
     """
     
+    file_extensions = ('.xml',)
+    # include 引用的片段可能以关键字结尾，表名写在语句中
+    triggers = tuple(keyword.encode() for keyword in TABLE_KEYWORDS) + (b'include',)
+    triggers_are_keywords = True
+    
     def __init__(self):
         """
         初始化XML提取器
         """
         super().__init__()
-        self.table_keywords = ['FROM', 'JOIN', 'INTO', 'UPDATE', 'TABLE']
+        # XML 格式不正确、扫描整个文件的 Mapper 文件数量
+        self.fallback_files = 0
+    
+    def reset_counter(self):
+        """
+        重置提取计数器
+        """
+        super().reset_counter()
+        self.fallback_files = 0
     
-    def extract(self, file_path, content):
+    def extract(self, context):
         """
         从XML文件中提取表名
-        :param file_path: 文件路径
-        :param content: 文件内容
+        :param context: 文件上下文（FileContext）
         :return: 表信息列表
         """
-        table_info = []
+        try:
+            document = parse_mapper(context)
+        except ParseError:
+            # XML 格式不正确时扫描整个文件
+            self.fallback_files += 1
+            return self._extract_lines(context)
+        except Exception as e:
+            # 忽略错误，返回空列表
+            return []
+        if document is None:
+            # 不是 Mapper 文件（如 pom.xml、Spring 配置）
+            return []
         
+        table_info = []
         try:
-            lines = content.split('\n')
+            for line_num, _, _, table_name in self._scan_statements(document):
+                table_info.append(TableRecord('XML', table_name, context.file_name, line_num))
+                self.counter += 1
+        except Exception as e:
+            # 忽略错误，返回已提取的表信息
+            pass
+        
+        return table_info
+    
+    def _scan_statements(self, document):
+        """
+        扫描 Mapper 中所有语句的表名
+        关键字和表名都来自同一个被引用片段时，该表名已在片段定义处提取，不再重复提取
+        :param document: Mapper 解析结果（MapperDocument）
+        :return: (行号, 语句序号, 偏移, 表名) 列表，按行号排列
+        """
+        resolve = self._fragment_resolver(document)
+        matches = []
+        for statement_index, statement in enumerate(document.statements):
+            # 语句文本由片段拼接而成，记录每个片段的起始偏移、行号和来源（None 表示语句自身的文本）
+            parts = []
+            starts = []
+            lines = []
+            owners = []
+            offset = 0
+            for piece_index, (kind, line, value) in enumerate(statement.pieces):
+                owner = None
+                if kind == INCLUDE:
+                    value = resolve(*split_refid(value, document.namespace))
+                    if not value:
+                        continue
+                    # 片段内容都对应 include 所在行，前后加空格与语句文本分隔
+                    value = ' ' + value + ' '
+                    owner = piece_index
+                parts.append(value)
+                starts.append(offset)
+                lines.append(line)
+                owners.append(owner)
+                offset += len(value)
             
-            for line_num, line in enumerate(lines, 1):
-                try:
-                    # 提取关键字后的表名
-                    for keyword in self.table_keywords:
-                        # 使用正则表达式匹配关键字后的表名，支持更复杂的情况
-                        pattern = r'\b' + keyword + r'\b\s+([\w\.]+(?:\s*\.[\w]+)*)'
-                        matches = re.finditer(pattern, line, re.IGNORECASE)
-                        
-                        for match in matches:
-                            table_name = match.group(1).strip()
-                            # 过滤掉空表名和无效表名
-                            if table_name and not table_name.startswith('${'):
-                                table_info.append({
-                                    'source': 'XML',
-                                    'table_name': table_name,
-                                    'file_name': os.path.basename(file_path),
-                                    'line_num': line_num
-                                })
-                                self.counter += 1
-                except Exception as e:
-                    # 忽略错误，继续处理下一行
-                    pass
+            text = ''.join(parts)
+            for keyword_start, start, table_name in self.scan_sql(text):
+                if table_name.startswith('${') or table_name.startswith('#{'):
+                    continue
+                keyword_part = bisect.bisect_right(starts, keyword_start) - 1
+                table_part = bisect.bisect_right(starts, start) - 1
+                owner = owners[table_part]
+                if owner is not None and owner == owners[keyword_part]:
+                    continue
+                line_num = lines[table_part]
+                if owner is None:
+                    line_num += text.count('\n', starts[table_part], start)
+                matches.append((line_num, statement_index, start, table_name))
+        
+        matches.sort()
+        return matches
+    
+    def _fragment_resolver(self, document):
+        """
+        构造查找 sql 片段文本的函数
+        当前 Mapper 中的片段在本文件内展开并缓存，其他 Mapper 中的片段通过项目符号索引查找
+        :param document: Mapper 解析结果（MapperDocument）
+        :return: 根据 (命名空间, 片段 id) 获取片段文本的函数，找不到时返回 None
+        """
+        local_texts = {}
+        
+        def resolve(namespace, fragment_id):
+            if namespace == document.namespace and fragment_id in document.fragments:
+                if fragment_id not in local_texts:
+                    # 先占位，循环引用时返回 None
+                    local_texts[fragment_id] = None
+                    local_texts[fragment_id] = fragment_text(document.fragments[fragment_id], namespace, resolve)
+                return local_texts[fragment_id]
+            value = None
+            if self.symbol_index is not None:
+                value = self.symbol_index.resolve_fragment(namespace, fragment_id)
+            self.symbol_lookups.append(['fragment', namespace, fragment_id, value])
+            return value
+        
+        return resolve
+    
+    def _extract_lines(self, context):
+        """
+        扫描整个文件中关键字后的表名
+        :param context: 文件上下文（FileContext）
+        :return: 表信息列表
+        """
+        table_info = []
+        
+        try:
+            # 单次扫描整个文件（包括语句以外的内容），提取关键字后的表名
+            for line_num, table_name in scan_keyword_tables(context):
+                # 过滤掉变量形式的表名
+                if not table_name.startswith('${') and not table_name.startswith('#{'):
+                    table_info.append(TableRecord('XML', table_name, context.file_name, line_num))
+                    self.counter += 1
         except Exception as e:
             # 忽略错误，返回已提取的表信息
             pass
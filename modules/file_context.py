@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件上下文模块
+每个文件只读取和解码一次，供所有提取器和 Schema 分析共享
+"""
+
+import bisect
+import mmap
+import os
+import re
+from .ds_scope import build_ds_scopes
+from .java_lexer import fold_java_strings
+
+# @DS 注解匹配模式
+DS_PATTERN = re.compile(r'@DS\s*\(\s*["\']([^"\']+)["\']\s*\)')
+# 类名匹配模式
+CLASS_NAME_PATTERN = re.compile(r'public\s+(?:class|interface)\s+(\w+)')
+# 包名匹配模式
+PACKAGE_PATTERN = re.compile(r'^\s*package\s+([\w.]+)\s*;', re.MULTILINE)
+# 单个类型或静态成员的 import 语句匹配模式
+IMPORT_PATTERN = re.compile(r'^[^\S\n]*import[^\S\n]+(?:static[^\S\n]+)?([\w.]+)[^\S\n]*;', re.MULTILINE)
+# 字符串赋值匹配模式：在每个单词边界处向前查看，
+# 结果与按变量名（或 类名.常量名 等点号连接的名称）逐个搜索 名称 = "值" 一致
+ASSIGNMENT_PATTERN = re.compile(r'\b(?=(\w+(?:\.\w+)*)\s*=\s*["\']([^"\']+)["\'])')
+# 变量名匹配模式
+NAME_PATTERN = re.compile(r'\w+(?:\.\w+)*')
+# 行结束符匹配模式
+LINE_END_PATTERN = re.compile(rb'[\r\n]')
+
+# 默认使用内存映射的文件大小阈值（字节）
+DEFAULT_MMAP_THRESHOLD = 16 * 1024 * 1024
+# 内存映射模式下每个解码窗口的大小（字节）
+MMAP_WINDOW_SIZE = 1024 * 1024
+# 内存映射模式下统计行数时每次复制的字节数
+LINE_COUNT_CHUNK_SIZE = 1024 * 1024
+
+
+def decode_content(raw):
+    """
+    将文件原始字节解码为文本，与文本模式读取的结果一致
+    :param raw: 文件原始字节
+    :return: 文件内容
+    """
+    content = str(raw, 'utf-8', errors='ignore')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+class FileContext:
+    """
+    文件上下文
+    保存文件的原始字节，并按需计算解码文本、行列表、行偏移索引、类名、Java 逻辑字符串和 @DS 注解位置
+    """
+    
+    def __init__(self, file_path, raw=None, content=None, mapped=False):
+        """
+        初始化文件上下文
+        :param file_path: 文件路径
+        :param raw: 文件原始字节
+        :param content: 已解码的文件内容，为空时从原始字节解码
+        :param mapped: 原始字节是否为内存映射（mmap）对象
+        """
+        self.file_path = file_path
+        self.file_name = os.path.basename(file_path)
+        self.mapped = mapped
+        self._raw = raw
+        self._content = content
+        self._lines = None
+        self._line_offsets = None
+        self._class_name = False
+        self._package_name = False
+        self._imports = None
+        self._assignments = None
+        self._ds_spans = None
+        self._java_strings = None
+    
+    @classmethod
+    def from_path(cls, file_path, mmap_threshold=None):
+        """
+        读取文件并创建文件上下文
+        文件大小达到阈值时使用内存映射，只解码匹配到的行，不读取和解码整个文件
+        :param file_path: 文件路径
+        :param mmap_threshold: 使用内存映射的文件大小阈值（字节），为空时总是完整读取
+        :return: 文件上下文，使用完毕后需要调用 close()
+        """
+        with open(file_path, 'rb') as f:
+            if mmap_threshold is not None:
+                size = os.fstat(f.fileno()).st_size
+                # 空文件无法映射
+                if size and size >= mmap_threshold:
+                    raw = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    return cls(file_path, raw=raw, mapped=True)
+            raw = f.read()
+        return cls(file_path, raw=raw)
+    
+    def close(self):
+        """释放内存映射"""
+        if self.mapped:
+            self._raw.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @property
+    def raw(self):
+        """文件原始字节"""
+        if self._raw is None:
+            self._raw = self._content.encode('utf-8')
+        return self._raw
+    
+    @property
+    def content(self):
+        """解码后的文件内容"""
+        if self._content is None:
+            self._content = decode_content(self._raw)
+        return self._content
+    
+    @property
+    def lines(self):
+        """按行拆分的文件内容"""
+        if self._lines is None:
+            self._lines = self.content.split('\n')
+        return self._lines
+    
+    def line_count(self):
+        """
+        统计文件行数，与按 '\\n' 拆分解码内容得到的行数一致；
+        已经拆分过行时直接使用行列表，否则在原始字节上分块统计，内存映射时不解码
+        :return: 行数
+        """
+        if self._lines is not None:
+            return len(self._lines)
+        raw = self.raw
+        return self._count_line_breaks(0, len(raw)) + 1
+    
+    @property
+    def line_offsets(self):
+        """每一行在文件内容中的起始偏移"""
+        if self._line_offsets is None:
+            offsets = [0]
+            content = self.content
+            position = content.find('\n')
+            while position != -1:
+                offsets.append(position + 1)
+                position = content.find('\n', position + 1)
+            self._line_offsets = offsets
+        return self._line_offsets
+    
+    def line_number(self, offset):
+        """
+        将文件内容中的偏移转换为行号
+        :param offset: 字符偏移
+        :return: 行号（从 1 开始）
+        """
+        return bisect.bisect_right(self.line_offsets, offset)
+    
+    def iter_lines(self, pattern):
+        """
+        遍历可能包含触发字节串的行
+        普通模式下返回所有行，由调用方自行判断；
+        内存映射模式下只返回包含触发字节串的解码窗口中的行
+        :param pattern: 编译后的字节串触发模式
+        :return: (行号, 行内容) 迭代器
+        """
+        if not self.mapped:
+            return enumerate(self.lines, 1)
+        return self._iter_window_lines(pattern)
+    
+    def _iter_window_lines(self, pattern):
+        """
+        逐行遍历内存映射模式下的解码窗口
+        :param pattern: 编译后的字节串触发模式
+        :return: (行号, 行内容) 迭代器
+        """
+        for first_line_num, text in self.iter_windows(pattern):
+            yield from enumerate(text.split('\n'), first_line_num)
+    
+    def iter_windows(self, pattern):
+        """
+        在内存映射的原始字节中查找触发模式，只解码匹配所在的窗口
+        窗口从匹配所在行开始，约 MMAP_WINDOW_SIZE 字节，且总是在行边界结束；
+        窗口之间没有匹配的内容只统计换行数量，不解码
+        行的划分与完整解码后按 '\\n' 拆分一致（'\\r\\n' 和单独的 '\\r' 都视为换行）
+        :param pattern: 编译后的字节串触发模式
+        :return: (窗口首行行号, 窗口解码内容) 迭代器
+        """
+        raw = self._raw
+        size = len(raw)
+        line_num = 1
+        line_start = 0
+        while line_start <= size:
+            match = pattern.search(raw, line_start)
+            if match is None:
+                return
+            offset = match.start()
+            
+            # 定位匹配所在行的起始位置，并累计跳过的行数
+            previous_end = max(raw.rfind(b'\n', line_start, offset), raw.rfind(b'\r', line_start, offset))
+            start = previous_end + 1 if previous_end >= 0 else line_start
+            line_num += self._count_line_breaks(line_start, start)
+            
+            end = self._window_end(start, offset)
+            text = decode_content(raw[start:end])
+            yield line_num, text
+            
+            if end == size:
+                return
+            line_num += text.count('\n') + 1
+            line_start = end + 2 if raw[end:end + 2] == b'\r\n' else end + 1
+    
+    def iter_chunks(self):
+        """
+        按顺序解码内存映射的整个文件，每块约 MMAP_WINDOW_SIZE 字节，且总是在行边界结束；
+        供需要连续扫描（如跨行注释）的调用方使用，任意时刻只保留一块解码内容
+        :return: (块首行行号, 块解码内容) 迭代器
+        """
+        raw = self._raw
+        size = len(raw)
+        line_num = 1
+        start = 0
+        while True:
+            end = self._window_end(start, start)
+            text = decode_content(raw[start:end])
+            yield line_num, text
+            
+            if end == size:
+                return
+            line_num += text.count('\n') + 1
+            start = end + 2 if raw[end:end + 2] == b'\r\n' else end + 1
+    
+    def _window_end(self, start, offset):
+        """
+        计算解码窗口的结束位置：达到窗口大小后的第一个行结束符处，不拆分 '\r\n'
+        :param start: 窗口起始位置（行首）
+        :param offset: 窗口必须包含的位置
+        :return: 结束位置（行结束符所在位置或文件末尾）
+        """
+        raw = self._raw
+        end_match = LINE_END_PATTERN.search(raw, max(offset, start + MMAP_WINDOW_SIZE))
+        end = end_match.start() if end_match else len(raw)
+        if end > start and raw[end - 1:end + 1] == b'\r\n':
+            end -= 1
+        return end
+    
+    def _count_line_breaks(self, start, end):
+        """
+        分块统计内存映射原始字节中一段范围内的换行数量
+        :param start: 起始位置（行首）
+        :param end: 结束位置（行首）
+        :return: 换行数量
+        """
+        raw = self._raw
+        count = 0
+        while start < end:
+            stop = min(end, start + LINE_COUNT_CHUNK_SIZE)
+            # 避免把 '\r\n' 拆到两个分块中
+            if raw[stop - 1:stop] == b'\r' and raw[stop:stop + 1] == b'\n':
+                stop += 1
+            chunk = raw[start:stop]
+            count += chunk.count(b'\n') + chunk.count(b'\r') - chunk.count(b'\r\n')
+            start = stop
+        return count
+    
+    @property
+    def class_name(self):
+        """文件中第一个 public class 或 interface 的名称"""
+        if self._class_name is False:
+            match = CLASS_NAME_PATTERN.search(self.content)
+            self._class_name = match.group(1) if match else None
+        return self._class_name
+    
+    @property
+    def package_name(self):
+        """文件声明的包名"""
+        if self._package_name is False:
+            match = PACKAGE_PATTERN.search(self.content)
+            self._package_name = match.group(1) if match else None
+        return self._package_name
+    
+    @property
+    def imports(self):
+        """import 语句导入的简单名称到全限定名的字典，不包括 * 导入"""
+        if self._imports is None:
+            self._imports = {
+                match.group(1).rpartition('.')[2]: match.group(1)
+                for match in IMPORT_PATTERN.finditer(self.content)
+            }
+        return self._imports
+    
+    @property
+    def assignments(self):
+        """变量名到第一个字符串赋值的字典，一次扫描得到文件中所有的字符串赋值"""
+        if self._assignments is None:
+            assignments = {}
+            for match in ASSIGNMENT_PATTERN.finditer(self.content):
+                assignments.setdefault(match.group(1), match.group(2))
+            self._assignments = assignments
+        return self._assignments
+    
+    def find_assignment(self, name):
+        """
+        查找文件中变量的字符串赋值
+        :param name: 变量名
+        :return: 第一个赋值的字符串，没有时返回 None
+        """
+        if NAME_PATTERN.fullmatch(name):
+            return self.assignments.get(name)
+        # 不是变量名时按原来的方式搜索
+        match = re.search(r'\b' + re.escape(name) + r'\s*=\s*["\']([^"\']+)["\']', self.content)
+        return match.group(1) if match else None
+    
+    @property
+    def java_strings(self):
+        """Java 源码中折叠后的逻辑字符串列表，跳过注释，一次扫描供所有 Java 提取器共用"""
+        if self._java_strings is None:
+            self._java_strings = fold_java_strings(self.content)
+        return self._java_strings
+    
+    @property
+    def ds_spans(self):
+        """@DS 注解位置列表，元素为 (起始偏移, 结束偏移, schema)"""
+        if self._ds_spans is None:
+            if self._content is None and self.raw.find(b'@DS') == -1:
+                # 文件中不包含 @DS 时无需解码
+                self._ds_spans = []
+            else:
+                self._ds_spans = [
+                    (match.start(), match.end(), match.group(1))
+                    for match in DS_PATTERN.finditer(self.content)
+                ]
+        return self._ds_spans
+    
+    def ds_findings(self):
+        """
+        获取文件的 @DS 注解信息
+        :return: 注解信息字典，包含按出现顺序排列的 schema 列表、类名、类名对应类型上的 schema，
+            以及按行号排列的 @DS 作用域（[起始行号, schema] 列表，无法解析时为 None）
+        """
+        schemas = [schema for _, _, schema in self.ds_spans]
+        if not schemas:
+            return {'schemas': schemas, 'class_name': None, 'class_schema': None, 'scopes': []}
+        class_name = self.class_name
+        if self.file_name.endswith('.java'):
+            scopes, type_schemas = build_ds_scopes(self.content, self.ds_spans, self.line_number)
+        else:
+            scopes, type_schemas = None, {}
+        return {
+            'schemas': schemas,
+            'class_name': class_name,
+            'class_schema': type_schemas.get(class_name),
+            'scopes': scopes
+        }
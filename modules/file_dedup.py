@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件内容去重模块
+多模块项目中常有内容完全相同的文件（复制到各模块的 Mapper、引入的第三方源码、重复提交的生成代码），
+按内容哈希找出这些文件，每组只提取一次，结果分发给组内的其他文件
+"""
+
+import hashlib
+import os
+
+# 计算哈希时每次读取的字节数
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path):
+    """
+    分块计算文件内容哈希，结果与 extraction_cache.hash_content 对完整内容计算的哈希一致
+    :param file_path: 文件路径
+    :return: 哈希字符串
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DuplicateIndex:
+    """
+    内容相同的文件索引
+    只有文件名和大小都相同的文件才需要计算哈希；提取记录中的文件名为文件名称（不含目录），
+    文件名相同且内容相同的文件提取结果完全一致，可以直接复用
+    """
+    
+    def __init__(self):
+        """
+        初始化内容相同的文件索引
+        """
+        # 重复文件到组内第一个文件的映射
+        self.original_of = {}
+        # 组内第一个文件到组内其余文件数量的映射
+        self.copy_counts = {}
+        # 需要计算哈希的文件数量
+        self.hashed_files = 0
+        # 重复文件的总字节数，即去重后少读取和扫描的字节数
+        self.saved_bytes = 0
+    
+    @classmethod
+    def build(cls, files):
+        """
+        先按 (文件名, 大小) 分组，再对可能重复的文件计算内容哈希
+        :param files: 文件列表
+        :return: 内容相同的文件索引
+        """
+        index = cls()
+        by_size = {}
+        sizes = {}
+        for file_path in files:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                continue
+            sizes[file_path] = size
+            by_size.setdefault((os.path.basename(file_path), size), []).append(file_path)
+        
+        for candidates in by_size.values():
+            if len(candidates) < 2:
+                continue
+            first_by_hash = {}
+            for file_path in candidates:
+                try:
+                    content_hash = hash_file(file_path)
+                except OSError:
+                    continue
+                index.hashed_files += 1
+                original = first_by_hash.setdefault(content_hash, file_path)
+                if original is not file_path:
+                    index.original_of[file_path] = original
+                    index.copy_counts[original] = index.copy_counts.get(original, 0) + 1
+                    index.saved_bytes += sizes[file_path]
+        return index
+    
+    def __len__(self):
+        """重复文件数量"""
+        return len(self.original_of)
+    
+    @property
+    def group_count(self):
+        """包含重复文件的组数"""
+        return len(self.copy_counts)
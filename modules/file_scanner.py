@@ -6,59 +6,190 @@
 """
 
 import os
-import glob
+
+# 默认扫描的文件扩展名
+DEFAULT_EXTENSIONS = ('.java', '.xml')
+
+# 默认跳过的目录：构建产物、依赖目录和版本控制目录
+# 只在 main 源码目录之外生效，main 目录下同名的 Java 包（如 com/acme/build）仍然会被扫描
+DEFAULT_PRUNE_DIRS = frozenset({
+    'target', 'build', 'node_modules', '.git', '.svn', '.hg', '.idea', '.gradle'
+})
+
+# 扩展名对应的显示名称
+EXTENSION_LABELS = {
+    '.java': 'Java',
+    '.xml': 'XML'
+}
+
 
 class FileScanner:
     """文件扫描器"""
     
-    def __init__(self, project_path):
+    def __init__(self, project_path, extensions=DEFAULT_EXTENSIONS, prune_dirs=DEFAULT_PRUNE_DIRS):
         """
         初始化文件扫描器
         :param project_path: 项目路径
+        :param extensions: 需要扫描的文件扩展名
+        :param prune_dirs: 需要跳过的目录名称，只在 main 目录之外生效
         """
         self.project_path = project_path
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.prune_dirs = frozenset(prune_dirs or ())
     
     def scan(self):
         """
         扫描项目文件
+        只遍历一次目录树：位于 main 目录下的文件优先返回，
+        如果项目中没有 main 目录下的文件，则返回项目根目录下的所有文件
         :return: 扫描到的文件列表
         """
-        files = []
-        
         print(f"   正在扫描项目: {self.project_path}")
         
-        # 扫描所有名为 main 的文件夹，无论层级
-        main_dirs = glob.glob(os.path.join(self.project_path, "**", "main"), recursive=True)
+        main_files, other_files, main_dirs, main_dir_counts = self._walk()
         print(f"   找到 {len(main_dirs)} 个 main 文件夹")
         
-        # 对每个 main 目录进行扫描
-        for main_dir in main_dirs:
-            if os.path.exists(main_dir) and os.path.isdir(main_dir):
-                print(f"   正在扫描目录: {main_dir}")
-                # 扫描 Java 文件
-                java_files = glob.glob(os.path.join(main_dir, "**", "*.java"), recursive=True)
-                print(f"      找到 {len(java_files)} 个 Java 文件")
-                files.extend(java_files)
-                
-                # 扫描 XML 文件
-                xml_files = glob.glob(os.path.join(main_dir, "**", "*.xml"), recursive=True)
-                print(f"      找到 {len(xml_files)} 个 XML 文件")
-                files.extend(xml_files)
+        for main_dir, counts in main_dir_counts.items():
+            print(f"   正在扫描目录: {main_dir}")
+            self._print_counts(counts)
         
-        # 如果仍然没有找到文件，尝试在项目根目录直接查找
+        files = main_files
+        # 如果仍然没有找到文件，使用在项目根目录直接找到的文件
         if not files:
             print("   尝试在项目根目录直接查找文件...")
-            # 直接在项目根目录扫描 Java 文件
-            java_files = glob.glob(os.path.join(self.project_path, "**", "*.java"), recursive=True)
-            print(f"      找到 {len(java_files)} 个 Java 文件")
-            files.extend(java_files)
-            
-            # 直接在项目根目录扫描 XML 文件
-            xml_files = glob.glob(os.path.join(self.project_path, "**", "*.xml"), recursive=True)
-            print(f"      找到 {len(xml_files)} 个 XML 文件")
-            files.extend(xml_files)
+            self._print_counts(self._count_by_extension(other_files))
+            files = other_files
+        
+        print(f"   扫描完成，共找到 {len(files)} 个文件")
+        return files
+    
+    def iter_files(self):
+        """
+        流式扫描项目文件，逐个返回文件路径
+        结果和顺序与 scan() 一致：在找到第一个 main 目录下的文件之前，其他文件暂存在内存中，
+        找到后丢弃暂存的文件，只返回 main 目录下的文件；如果项目中没有 main 目录下的文件，最后再返回暂存的文件
+        :return: 文件路径迭代器
+        """
+        other_files = []
+        found_main = False
+        for path, ext, main_root in self._iter_walk():
+            if ext is None:
+                continue
+            if main_root is not None:
+                if not found_main:
+                    found_main = True
+                    other_files = []
+                yield path
+            elif not found_main:
+                other_files.append(path)
+        
+        if not found_main:
+            yield from other_files
+    
+    def _walk(self):
+        """
+        使用 os.scandir 单次遍历项目目录
+        :return: main 目录下的文件列表, 其他文件列表, main 目录列表, 各最外层 main 目录的文件统计
+        """
+        main_files = []
+        other_files = []
+        main_dirs = []
+        main_dir_counts = {}
+        
+        for path, ext, main_root in self._iter_walk():
+            if ext is None:
+                # main 目录
+                main_dirs.append(path)
+                if main_root == path:
+                    main_dir_counts[path] = {}
+            elif main_root is not None:
+                main_files.append(path)
+                counts = main_dir_counts[main_root]
+                counts[ext] = counts.get(ext, 0) + 1
+            elif not main_files:
+                # 一旦找到 main 目录下的文件，就不再需要收集其他文件
+                other_files.append(path)
         
-        # 去重并返回
-        unique_files = list(set(files))
-        print(f"   扫描完成，共找到 {len(unique_files)} 个文件")
-        return unique_files
+        if main_files:
+            other_files = []
+        return main_files, other_files, main_dirs, main_dir_counts
+    
+    def _iter_walk(self):
+        """
+        使用 os.scandir 按名称顺序深度优先遍历项目目录
+        :return: (路径, 扩展名, 所属最外层 main 目录) 迭代器，main 目录本身的扩展名为 None
+        """
+        visited = set()
+        
+        # 栈中元素: (目录路径, 所属最外层 main 目录)
+        stack = [(self.project_path, None)]
+        while stack:
+            dir_path, main_root = stack.pop()
+            
+            # 防止符号链接造成的循环遍历
+            try:
+                st = os.stat(dir_path)
+            except OSError:
+                continue
+            dir_key = (st.st_dev, st.st_ino)
+            if dir_key in visited:
+                continue
+            visited.add(dir_key)
+            
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                print(f"   无法读取目录 {dir_path}: {e}")
+                continue
+            
+            sub_dirs = []
+            for entry in entries:
+                name = entry.name
+                # 与 glob 的行为保持一致，跳过隐藏文件和目录
+                if name.startswith('.'):
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                
+                if is_dir:
+                    # main 目录下的同名目录是源码包，不能跳过
+                    if main_root is None and name in self.prune_dirs:
+                        continue
+                    child_main_root = main_root
+                    if name == 'main':
+                        if main_root is None:
+                            child_main_root = entry.path
+                        yield entry.path, None, child_main_root
+                    sub_dirs.append((entry.path, child_main_root))
+                    continue
+                
+                ext = os.path.splitext(os.path.normcase(name))[1]
+                if ext in self.extensions:
+                    yield entry.path, ext, main_root
+            
+            # 逆序入栈，保证按名称顺序遍历
+            stack.extend(reversed(sub_dirs))
+    
+    def _count_by_extension(self, files):
+        """
+        按扩展名统计文件数量
+        :param files: 文件列表
+        :return: 扩展名到文件数量的字典
+        """
+        counts = {}
+        for file_path in files:
+            ext = os.path.splitext(os.path.normcase(file_path))[1]
+            counts[ext] = counts.get(ext, 0) + 1
+        return counts
+    
+    def _print_counts(self, counts):
+        """
+        打印各扩展名的文件数量
+        :param counts: 扩展名到文件数量的字典
+        """
+        for ext in self.extensions:
+            label = EXTENSION_LABELS.get(ext, ext.lstrip('.').upper())
+            print(f"      找到 {counts.get(ext, 0)} 个 {label} 文件")
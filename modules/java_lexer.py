@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Java 字符串折叠模块
+单次扫描 Java 源码，跳过注释，将 + 拼接的字符串和常量、@Select({...}) 等注解中的字符串数组、
+文本块以及 StringBuilder.append 链折叠为逻辑字符串，并保留每个片段在源码中的位置
+"""
+
+import bisect
+import re
+
+# 片段类型：字符串内容、常量引用、无法静态确定的表达式
+LITERAL = 0
+REFERENCE = 1
+OPAQUE = 2
+
+# 包含 SQL 的注解
+SQL_ANNOTATIONS = ('Select', 'Insert', 'Update', 'Delete')
+
+# 无法解析的常量或表达式在逻辑字符串中的替代文本：一个空的 SQL 字符串，
+# 使其前后的内容不会被当作同一个表名
+UNKNOWN_TEXT = " '' "
+
+# 空白和注释
+_SKIP_PATTERN = re.compile(r'(?:\s+|//[^\n]*|/\*[^*]*(?:\*+[^*/][^*]*)*\**/?)*')
+_IDENTIFIER = r'[A-Za-z_$][\w$]*'
+_QUALIFIED_NAME = _IDENTIFIER + r'(?:\s*\.\s*' + _IDENTIFIER + r')*'
+# 拼接链中的一项：文本块、字符串字面量、常量引用（后面不能是方法调用或数组下标）
+_TERM_PATTERN = re.compile(
+    r'(?P<block>""")'
+    r'|"(?P<literal>[^"\\\n]*(?:\\.[^"\\\n]*)*)"?'
+    r'|(?P<reference>' + _QUALIFIED_NAME + r')(?![\w$]|\s*[(\[.])'
+)
+# 拼接运算符（不包括 ++ 和 +=）
+_PLUS_PATTERN = re.compile(r'\+(?![+=])')
+# 扫描源码时关注的位置：注释、字符字面量、SQL 注解、StringBuilder 构造、append 调用、字符串字面量和文本块；
+# 每个分支都以固定字符开头，匹配失败时不会在标识符中逐个位置回溯
+_JAVA_PATTERN = re.compile(
+    r'//[^\n]*'
+    r'|/\*[^*]*(?:\*+[^*/][^*]*)*\**/?'
+    r"|'[^'\\\n]*(?:\\.[^'\\\n]*)*'?"
+    r'|(?P<annotation>@(?P<annotation_name>' + '|'.join(SQL_ANNOTATIONS) + r')\s*\()'
+    r'|(?P<builder>\bnew\s+String(?:Builder|Buffer)\s*\()'
+    r'|(?P<append>\.\s*append\s*\()'
+    r'|(?P<string>")'
+)
+# 向前查找的最大字符数
+_LOOKBEHIND = 128
+# 字符串之前拼接的常量引用，如 PREFIX + "..."
+_LEAD_PATTERN = re.compile(r'(' + _QUALIFIED_NAME + r')\s*\+\s*\Z')
+# StringBuilder 赋值的变量，如 sql = new StringBuilder(...)
+_TARGET_PATTERN = re.compile(r'(' + _IDENTIFIER + r')\s*=\s*\Z')
+# append 调用的接收变量，如 sql.append(...)
+_RECEIVER_PATTERN = re.compile(r'(' + _IDENTIFIER + r')\s*\Z')
+# 注解参数中的 value =
+_VALUE_PATTERN = re.compile(r'value\s*=\s*')
+# append 调用
+_APPEND_CALL_PATTERN = re.compile(r'\.\s*append\s*\(')
+# 以接收变量开头的 append 语句
+_RECEIVER_APPEND_PATTERN = re.compile(r'(' + _IDENTIFIER + r')\s*\.\s*append\s*\(')
+
+
+class JavaString:
+    """
+    折叠后的逻辑字符串
+    片段按顺序保存为 (类型, 源码偏移, 内容)：字符串内容保持源码原文（包括转义序列），
+    常量引用的内容为去掉空白的引用名，无法确定的表达式内容为 None
+    """
+    
+    __slots__ = ('annotation', 'pieces')
+    
+    def __init__(self, annotation=None):
+        """
+        初始化逻辑字符串
+        :param annotation: 所在的 SQL 注解（如 '@Select'），不在注解中时为 None
+        """
+        self.annotation = annotation
+        self.pieces = []
+    
+    @property
+    def literal_text(self):
+        """所有字符串片段的内容，不解析常量引用"""
+        return ''.join(text for kind, _, text in self.pieces if kind == LITERAL)
+    
+    def join(self, resolve=None):
+        """
+        拼接逻辑字符串
+        :param resolve: 解析常量引用的函数，参数为引用名，返回字符串值或 None；为空时常量引用按无法解析处理
+        :return: (文本, 将文本位置转换为源码偏移的函数)
+        """
+        parts = []
+        starts = []
+        offsets = []
+        literal = []
+        position = 0
+        for kind, offset, text in self.pieces:
+            if kind == REFERENCE:
+                text = resolve(text) if resolve is not None else None
+            if kind != LITERAL and text is None:
+                text = UNKNOWN_TEXT
+            parts.append(text)
+            starts.append(position)
+            offsets.append(offset)
+            literal.append(kind == LITERAL)
+            position += len(text)
+        
+        def locate(text_position):
+            index = max(bisect.bisect_right(starts, text_position) - 1, 0)
+            if literal[index]:
+                return offsets[index] + text_position - starts[index]
+            return offsets[index]
+        
+        return ''.join(parts), locate
+
+
+def _skip(text, position):
+    """
+    跳过空白和注释
+    :param text: 源码
+    :param position: 起始位置
+    :return: 之后第一个有效字符的位置
+    """
+    return _SKIP_PATTERN.match(text, position).end()
+
+
+def _look_behind(text, lower, position, pattern):
+    """
+    在位置之前的一小段文本中匹配以该位置结尾的模式
+    :param text: 源码
+    :param lower: 查找的下限位置，之前的内容已经处理过
+    :param position: 结束位置
+    :param pattern: 必须匹配到文本末尾的模式
+    :return: 匹配结果，没有匹配时返回 None
+    """
+    start = max(lower, position - _LOOKBEHIND)
+    match = pattern.search(text, start, position)
+    if match is not None and match.start() == start and start > lower:
+        previous = text[start - 1]
+        if previous.isalnum() or previous in '_$':
+            # 查找范围截断在标识符中间
+            return None
+    return match
+
+
+def _parse_chain(text, position, pieces):
+    """
+    解析一个 + 拼接链，片段追加到 pieces 中
+    :param text: 源码
+    :param position: 拼接链的起始位置
+    :param pieces: 片段列表
+    :return: (拼接链之后的位置, 拼接链是否只由字符串和常量组成)
+    """
+    while True:
+        position = _skip(text, position)
+        match = _TERM_PATTERN.match(text, position)
+        if match is None:
+            pieces.append((OPAQUE, position, None))
+            return position, False
+        if match.group('block') is not None:
+            # 文本块内容从开始分隔符之后的下一行开始
+            start = text.find('\n', match.end())
+            start = match.end() if start == -1 else start + 1
+            end = text.find('"""', start)
+            if end == -1:
+                end = len(text)
+            pieces.append((LITERAL, start, text[start:end]))
+            position = end + 3
+        elif match.group('literal') is not None:
+            pieces.append((LITERAL, match.start('literal'), match.group('literal')))
+            position = match.end()
+        else:
+            name = ''.join(match.group('reference').split())
+            pieces.append((REFERENCE, match.start(), name))
+            position = match.end()
+        
+        after = _skip(text, position)
+        plus = _PLUS_PATTERN.match(text, after)
+        if plus is None:
+            return after, True
+        position = plus.end()
+
+
+def _parse_annotation(text, position, java_string):
+    """
+    解析 SQL 注解的参数：单个拼接链，或 {...} 字符串数组（元素之间以空格连接，与 MyBatis 一致）
+    :param text: 源码
+    :param position: 注解左括号之后的位置
+    :param java_string: 逻辑字符串
+    :return: 解析结束的位置
+    """
+    position = _skip(text, position)
+    value = _VALUE_PATTERN.match(text, position)
+    if value is not None:
+        position = _skip(text, value.end())
+    if not text.startswith('{', position):
+        position, _ = _parse_chain(text, position, java_string.pieces)
+        return position
+    
+    position += 1
+    while True:
+        position = _skip(text, position)
+        if text.startswith('}', position):
+            return position + 1
+        if java_string.pieces:
+            java_string.pieces.append((LITERAL, position, ' '))
+        position, clean = _parse_chain(text, position, java_string.pieces)
+        if not clean or not text.startswith(',', position):
+            return position
+        position += 1
+
+
+def _parse_appends(text, match, java_string, lower):
+    """
+    解析 StringBuilder 的构造参数和之后对同一个对象连续的 append 调用
+    :param text: 源码
+    :param match: builder 或 append 的匹配结果
+    :param java_string: 逻辑字符串
+    :param lower: 向前查找接收变量的下限位置
+    :return: 解析结束的位置
+    """
+    pattern = _TARGET_PATTERN if match.group('builder') else _RECEIVER_PATTERN
+    receiver = _look_behind(text, lower, match.start(), pattern)
+    if receiver is not None:
+        receiver = receiver.group(1)
+    position = match.end()
+    if match.group('builder') and text.startswith(')', _skip(text, position)):
+        # 无参构造
+        position = _skip(text, position) + 1
+    else:
+        position, clean = _parse_chain(text, position, java_string.pieces)
+        if not clean or not text.startswith(')', position):
+            return position
+        position += 1
+    
+    # 同一个对象的下一次 append：链式调用，或以同一个接收变量开头的下一条语句
+    while True:
+        following = _skip(text, position)
+        next_append = _APPEND_CALL_PATTERN.match(text, following)
+        if next_append is None:
+            if receiver is None or not text.startswith(';', following):
+                return position
+            next_append = _RECEIVER_APPEND_PATTERN.match(text, _skip(text, following + 1))
+            if next_append is None or next_append.group(1) != receiver:
+                return position
+        position, clean = _parse_chain(text, next_append.end(), java_string.pieces)
+        if not clean or not text.startswith(')', position):
+            return position
+        position += 1
+
+
+def fold_java_strings(text):
+    """
+    扫描 Java 源码，返回折叠后的逻辑字符串
+    :param text: Java 源码
+    :return: 逻辑字符串（JavaString）列表，按出现顺序排列
+    """
+    strings = []
+    position = 0
+    size = len(text)
+    while position < size:
+        match = _JAVA_PATTERN.search(text, position)
+        if match is None:
+            break
+        kind = match.lastgroup
+        if kind == 'annotation':
+            java_string = JavaString('@' + match.group('annotation_name'))
+            position = _parse_annotation(text, match.end(), java_string)
+        elif kind == 'builder' or kind == 'append':
+            java_string = JavaString()
+            position = _parse_appends(text, match, java_string, position)
+        elif kind == 'string':
+            # 字符串之前拼接的常量引用属于同一个拼接链
+            java_string = JavaString()
+            lead = _look_behind(text, position, match.start(), _LEAD_PATTERN)
+            start = lead.start() if lead is not None else match.start()
+            position, _ = _parse_chain(text, start, java_string.pieces)
+        else:
+            # 注释和字符字面量
+            position = match.end()
+            continue
+        if any(piece[0] != OPAQUE for piece in java_string.pieces):
+            strings.append(java_string)
+        position = max(position, match.end())
+    return strings
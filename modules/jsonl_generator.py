@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSONL 生成模块
+五个逻辑表依次逐行写入同一个 JSON Lines 文件，每行一个 JSON 对象，"table" 字段为所属的表名
+"""
+
+import json
+from .report_generator import ReportGenerator
+
+
+class JSONLGenerator(ReportGenerator):
+    """JSONL 生成器"""
+    
+    format_name = "JSONL"
+    
+    def _write_report(self, report):
+        """
+        逐行写出 JSONL 文件，每行为 {"table": 表名, 列名: 值, ...}
+        :param report: 汇总结果
+        """
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        with open(self.output_path, 'w', encoding='utf-8') as f:
+            write = f.write
+            for name, columns, rows in self._iter_tables(report):
+                keys = ('table',) + tuple(column for column, _ in columns)
+                for row in rows:
+                    write(encode(dict(zip(keys, (name,) + tuple(row)))))
+                    write('\n')
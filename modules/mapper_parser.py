@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MyBatis Mapper 解析模块
+使用 expat 流式解析 Mapper XML，只收集 select、insert、update、delete 和 sql 元素中的 SQL 文本和 include 引用
+"""
+
+import codecs
+import xml.parsers.expat
+
+# Mapper 文件的根元素（MyBatis 的 mapper 和 iBatis 的 sqlMap）
+MAPPER_ROOTS = ('mapper', 'sqlMap')
+# 包含 SQL 的语句元素
+STATEMENT_TAGS = frozenset(('select', 'insert', 'update', 'delete', 'sql'))
+# 内存映射模式下每次送入解析器的字节数
+PARSE_CHUNK_SIZE = 1024 * 1024
+
+# 语句片段类型：SQL 文本、include 引用
+TEXT = 0
+INCLUDE = 1
+
+# 解析器可能抛出的异常
+ParseError = xml.parsers.expat.ExpatError
+
+
+class _NotMapper(Exception):
+    """根元素不是 Mapper 时停止解析"""
+
+
+class MapperStatement:
+    """
+    Mapper 中的一个语句元素
+    片段按出现顺序保存为 (类型, 行号, 内容)：SQL 文本的行号是文本开始的行，
+    include 引用的内容是 refid；子元素的边界替换为一个空格
+    """
+    
+    __slots__ = ('tag', 'id', 'line', 'pieces')
+    
+    def __init__(self, tag, statement_id, line):
+        """
+        初始化语句元素
+        :param tag: 元素名称
+        :param statement_id: 元素的 id 属性
+        :param line: 元素开始的行号
+        """
+        self.tag = tag
+        self.id = statement_id
+        self.line = line
+        self.pieces = []
+
+
+class MapperDocument:
+    """Mapper 文件的解析结果"""
+    
+    def __init__(self, namespace):
+        """
+        初始化解析结果
+        :param namespace: Mapper 的命名空间
+        """
+        self.namespace = namespace
+        # 语句元素列表，按出现顺序排列
+        self.statements = []
+        # sql 片段 id 到语句元素的映射
+        self.fragments = {}
+
+
+def split_refid(refid, namespace):
+    """
+    将 include 的 refid 拆分为命名空间和片段 id
+    不带命名空间的 refid 引用当前 Mapper 中的片段
+    :param refid: include 的 refid 属性
+    :param namespace: 当前 Mapper 的命名空间
+    :return: (命名空间, 片段 id)
+    """
+    fragment_namespace, _, fragment_id = refid.rpartition('.')
+    return (fragment_namespace or namespace), fragment_id
+
+
+def fragment_text(fragment, namespace, resolve):
+    """
+    展开 sql 片段的文本，嵌套的 include 替换为被引用片段的文本
+    :param fragment: sql 片段（MapperStatement）
+    :param namespace: 片段所在 Mapper 的命名空间
+    :param resolve: 根据 (命名空间, 片段 id) 获取片段文本的函数，找不到时返回 None
+    :return: 片段文本
+    """
+    parts = []
+    for kind, _, value in fragment.pieces:
+        if kind == TEXT:
+            parts.append(value)
+        else:
+            parts.append(resolve(*split_refid(value, namespace)) or ' ')
+    return ''.join(parts)
+
+
+def parse_mapper(context, fragments_only=False):
+    """
+    流式解析 Mapper 文件
+    只进入语句元素，其余元素（resultMap、注释等）中的内容都被跳过；
+    根元素不是 Mapper 时在读到根元素后立即停止
+    :param context: 文件上下文（FileContext）
+    :param fragments_only: 是否只收集 sql 片段
+    :return: 解析结果（MapperDocument），不是 Mapper 文件时返回 None
+    :raises ParseError: XML 格式不正确
+    """
+    parser = xml.parsers.expat.ParserCreate()
+    document = None
+    statement = None
+    level = 0
+    # 当前语句中 include 元素的嵌套层级，include 的子元素（property）不包含 SQL
+    include_level = 0
+    # 尚未写入片段的连续文本：文本列表, 开始行号, 结束行号
+    buffer = []
+    buffer_lines = [0, 0]
+    
+    def flush():
+        if buffer:
+            statement.pieces.append((TEXT, buffer_lines[0], ''.join(buffer)))
+            buffer.clear()
+    
+    def add_text(line, text):
+        # 文本之间有跨行的标签或注释时重新开始一个片段，保证片段内按换行数量计算的行号正确
+        if buffer and line != buffer_lines[1]:
+            flush()
+        if not buffer:
+            buffer_lines[0] = line
+        buffer.append(text)
+        buffer_lines[1] = line + text.count('\n')
+    
+    def start_element(name, attributes):
+        nonlocal document, statement, level, include_level
+        level += 1
+        if document is None:
+            if name not in MAPPER_ROOTS:
+                raise _NotMapper()
+            document = MapperDocument(attributes.get('namespace', ''))
+            return
+        if statement is None:
+            if level == 2 and name in STATEMENT_TAGS and (name == 'sql' or not fragments_only):
+                statement = MapperStatement(name, attributes.get('id', ''), parser.CurrentLineNumber)
+            return
+        if include_level:
+            include_level += 1
+        elif name == 'include':
+            flush()
+            statement.pieces.append((INCLUDE, parser.CurrentLineNumber, attributes.get('refid', '')))
+            include_level = 1
+        else:
+            add_text(parser.CurrentLineNumber, ' ')
+    
+    def end_element(name):
+        nonlocal statement, level, include_level
+        level -= 1
+        if statement is None:
+            return
+        if include_level:
+            include_level -= 1
+        elif level == 1:
+            flush()
+            document.statements.append(statement)
+            if statement.tag == 'sql' and statement.id:
+                document.fragments.setdefault(statement.id, statement)
+            statement = None
+        else:
+            add_text(parser.CurrentLineNumber, ' ')
+    
+    def character_data(data):
+        if statement is not None and not include_level:
+            add_text(parser.CurrentLineNumber, data)
+    
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+    try:
+        if context.mapped:
+            # 分块解码后送入解析器，不解码整个文件
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+            raw = context.raw
+            for start in range(0, len(raw), PARSE_CHUNK_SIZE):
+                parser.Parse(decoder.decode(raw[start:start + PARSE_CHUNK_SIZE]), False)
+            parser.Parse(decoder.decode(b'', True), True)
+        else:
+            # 传入文本时按 UTF-8 解析，与其他提取器的解码方式一致，忽略 XML 声明中的编码
+            parser.Parse(context.content, True)
+    except _NotMapper:
+        return None
+    return document
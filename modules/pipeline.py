@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式处理模块
+扫描、表名提取、Schema 分析和报告生成通过有界队列连接，内存占用不随项目规模增长
+"""
+
+import queue
+import threading
+from .file_scanner import FileScanner
+from .table_extractor import TableExtractor
+from .schema_analyzer import SchemaAnalyzer
+from .report_generator import create_generator, OUTPUT_EXCEL, OVERFLOW_SHEETS
+from .external_sort import DEFAULT_MEMORY_RECORDS
+from .file_context import DEFAULT_MMAP_THRESHOLD
+from .symbol_index import SymbolIndex
+from .run_metrics import measure_stage
+
+# 各阶段之间队列的默认容量（批次数量）
+DEFAULT_QUEUE_SIZE = 64
+# 每个批次包含的元素数量，批量传递以减少线程间同步的开销
+STAGE_BATCH_SIZE = 256
+# 生产者等待队列空位时检查是否需要停止的间隔（秒）
+_PUT_TIMEOUT = 0.1
+
+# 生产者正常结束的标记
+_END = object()
+
+
+class _StageError:
+    """生产者线程中发生的异常，传递到消费端重新抛出"""
+    
+    def __init__(self, error):
+        self.error = error
+
+
+def bounded_stage(iterable, maxsize=DEFAULT_QUEUE_SIZE, batch_size=STAGE_BATCH_SIZE, name=None):
+    """
+    在后台线程中遍历上游迭代器，通过有界队列向下游逐个传递元素
+    队列已满时生产者阻塞等待（背压），因此两个阶段之间最多缓存 maxsize * batch_size 个元素；
+    生产者出错时异常在消费端重新抛出，消费端提前结束时通知生产者停止
+    :param iterable: 上游迭代器
+    :param maxsize: 队列容量（批次数量）
+    :param batch_size: 每个批次包含的元素数量
+    :param name: 线程名称
+    :return: 元素迭代器
+    """
+    channel = queue.Queue(maxsize)
+    stop = threading.Event()
+    
+    def put(item):
+        while not stop.is_set():
+            try:
+                channel.put(item, timeout=_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            batch = []
+            for item in iterable:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch and not put(batch):
+                return
+            put(_END)
+        except BaseException as e:
+            put(_StageError(e))
+        finally:
+            close = getattr(iterable, 'close', None)
+            if close is not None:
+                close()
+    
+    thread = threading.Thread(target=produce, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            batch = channel.get()
+            if batch is _END:
+                return
+            if isinstance(batch, _StageError):
+                raise batch.error
+            yield from batch
+    finally:
+        stop.set()
+        thread.join()
+
+
+class StreamingPipeline:
+    """
+    流式处理流水线
+    先流式扫描一遍项目收集 @DS 注解（Schema 归属依赖全部注解）、Java 字符串常量和 Mapper sql 片段，
+    再将文件扫描、表名提取、Schema 分析和报告生成连接成一条流水线
+    """
+    
+    def __init__(self, project_path, output_path, cache=None, jobs=1, mmap_threshold=DEFAULT_MMAP_THRESHOLD,
+                 queue_size=DEFAULT_QUEUE_SIZE, memory_records=DEFAULT_MEMORY_RECORDS, temp_dir=None, sql_cache=None,
+                 overflow=OVERFLOW_SHEETS, output_format=OUTPUT_EXCEL, metrics=None):
+        """
+        初始化流式处理流水线
+        :param project_path: 项目路径
+        :param output_path: 输出路径
+        :param cache: 提取结果缓存（ExtractionCache），为空时不使用缓存
+        :param jobs: 并行提取的进程数量
+        :param mmap_threshold: 使用内存映射读取文件的大小阈值（字节）
+        :param queue_size: 各阶段之间队列的容量（批次数量）
+        :param memory_records: 排序时内存中最多保留的记录数量，超过时使用外部归并排序
+        :param temp_dir: 排序临时文件目录，为空时使用系统临时目录
+        :param sql_cache: SQL 表名缓存（SQLTableCache），为空时使用默认容量的内存缓存
+        :param overflow: 数据行超过 Excel 单个工作表行数上限时的处理方式（写入续表或 CSV 文件）
+        :param output_format: 输出格式（excel、csv、jsonl 或 sqlite）
+        :param metrics: 运行指标（RunMetrics），不为空时记录两个阶段以及各提取器和各文件的耗时；
+            第二阶段的扫描、提取、Schema 分析和报告生成同时进行，只记录总耗时
+        """
+        self.project_path = project_path
+        self.output_path = output_path
+        self.queue_size = queue_size
+        self.memory_records = memory_records
+        self.temp_dir = temp_dir
+        self.metrics = metrics
+        self.scanner = FileScanner(project_path)
+        self.extractor = TableExtractor(cache=cache, jobs=jobs, mmap_threshold=mmap_threshold, sql_cache=sql_cache,
+                                        metrics=metrics)
+        self.analyzer = SchemaAnalyzer(mmap_threshold=mmap_threshold)
+        self.generator = create_generator(output_format, output_path, overflow=overflow)
+    
+    def run(self):
+        """
+        运行流水线
+        :return: 是否生成了报告
+        """
+        # 1. 流式扫描文件，收集 @DS 注解和常量
+        print("\n1. 正在扫描项目文件并收集 @DS 注解...")
+        symbol_index = SymbolIndex()
+        with measure_stage(self.metrics, "prepare"):
+            self.analyzer.prepare(self._stage(self.scanner.iter_files(), "scan-ds"), symbol_index=symbol_index)
+        print(f"   扫描完成，找到 {self.analyzer.scanned_files} 个文件，{self.analyzer.annotation_count} 个 @DS 注解，"
+              f"{len(symbol_index)} 个字符串常量，{len(symbol_index.fragments)} 个 sql 片段")
+        self.extractor.symbol_index = symbol_index
+        if not self.analyzer.scanned_files:
+            print("   警告: 未找到任何文件，请检查项目路径是否正确")
+            return False
+        
+        # 2. 扫描 -> 提取 -> Schema 分析 -> 排序和报告生成
+        print(f"\n2. 正在流式提取表名、分析 Schema 并生成 {self.generator.format_name} 文件...")
+        files = self._stage(self.scanner.iter_files(), "scan")
+        records = self._stage(self.extractor.iter_records(files, collect_ds_findings=False), "extract")
+        resolved = self.analyzer.iter_resolved(records)
+        with measure_stage(self.metrics, "stream"):
+            self.generator.generate_stream(resolved, self.memory_records, self.temp_dir)
+        return True
+    
+    def _stage(self, iterable, name):
+        """
+        使用有界队列连接一个阶段
+        :param iterable: 上游迭代器
+        :param name: 阶段名称
+        :return: 元素迭代器
+        """
+        return bounded_stage(iterable, self.queue_size, name=name)
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+报告生成模块
+对提取的表信息排序、清洗、去重和统计，得到五个逻辑表（原始表信息、清洗后表信息、去重后表信息、
+文件统计信息、处理总结），再交给具体的输出格式（Excel、CSV、JSONL、SQLite）写出；
+各输出格式的模块在使用时才导入，不输出 Excel 时不会加载 openpyxl
+"""
+
+import importlib
+import os
+from collections import Counter
+from operator import itemgetter
+from .external_sort import ExternalSorter, DEFAULT_MEMORY_RECORDS
+
+# 原始表信息和清洗后表信息的列：(列名, SQLite 类型)，与排序键的顺序一致
+RECORD_COLUMNS = (('source', 'TEXT'), ('schema', 'TEXT'), ('table_name', 'TEXT'), ('file_name', 'TEXT'),
+                  ('line_num', 'INTEGER'))
+# 去重后表信息的列
+DEDUPLICATED_COLUMNS = (('schema', 'TEXT'), ('table_name', 'TEXT'))
+# 文件统计信息的列
+FILE_STAT_COLUMNS = (('file_type', 'TEXT'), ('file_count', 'INTEGER'), ('table_count', 'INTEGER'),
+                     ('avg_per_file', 'REAL'))
+# 处理总结的列：分类（项目信息或 Schema 统计）、项目名称、数量
+SUMMARY_COLUMNS = (('section', 'TEXT'), ('item', 'TEXT'), ('value', 'INTEGER'))
+
+# 五个逻辑表：(表名, 中文名称, 列)，按输出顺序排列
+REPORT_TABLES = (
+    ('raw', '原始表信息', RECORD_COLUMNS),
+    ('cleaned', '清洗后表信息', RECORD_COLUMNS),
+    ('deduplicated', '去重后表信息', DEDUPLICATED_COLUMNS),
+    ('file_stats', '文件统计信息', FILE_STAT_COLUMNS),
+    ('summary', '处理总结', SUMMARY_COLUMNS),
+)
+
+# 文件统计信息中的文件类型，按输出顺序排列
+FILE_TYPES = ('Java 文件', 'XML 文件', '其他文件')
+
+# Excel 单个工作表的最大行数（包括表头）
+MAX_SHEET_ROWS = 1048576
+# 数据行超过单个工作表行数上限时的处理方式：写入续表，或写入与 Excel 文件同名的 CSV 文件
+OVERFLOW_SHEETS = 'sheets'
+OVERFLOW_CSV = 'csv'
+OVERFLOW_MODES = (OVERFLOW_SHEETS, OVERFLOW_CSV)
+
+# 输出格式
+OUTPUT_EXCEL = 'excel'
+OUTPUT_CSV = 'csv'
+OUTPUT_JSONL = 'jsonl'
+OUTPUT_SQLITE = 'sqlite'
+# 输出格式到 (模块名, 生成器类名, 输出文件名) 的映射；CSV 格式的输出文件名为各表 CSV 文件的前缀
+OUTPUT_ENGINES = {
+    OUTPUT_EXCEL: ('excel_generator', 'ExcelGenerator', '项目汇总.xlsx'),
+    OUTPUT_CSV: ('csv_generator', 'CSVGenerator', '项目汇总'),
+    OUTPUT_JSONL: ('jsonl_generator', 'JSONLGenerator', '项目汇总.jsonl'),
+    OUTPUT_SQLITE: ('sqlite_generator', 'SQLiteGenerator', '项目汇总.db'),
+}
+OUTPUT_FORMATS = tuple(OUTPUT_ENGINES)
+
+
+def default_output_path(output_dir, output_format):
+    """
+    获取输出格式在输出目录中的默认输出路径
+    :param output_dir: 输出目录
+    :param output_format: 输出格式
+    :return: 输出路径
+    """
+    return os.path.join(output_dir, OUTPUT_ENGINES[output_format][2])
+
+
+def create_generator(output_format, output_path, overflow=OVERFLOW_SHEETS):
+    """
+    创建输出格式对应的报告生成器，生成器所在的模块此时才导入
+    :param output_format: 输出格式（OUTPUT_FORMATS 之一）
+    :param output_path: 输出路径
+    :param overflow: 数据行超过 Excel 单个工作表行数上限时的处理方式，只用于 Excel 格式
+    :return: 报告生成器
+    """
+    if output_format not in OUTPUT_ENGINES:
+        raise ValueError(f"不支持的输出格式: {output_format}")
+    module_name, class_name, _ = OUTPUT_ENGINES[output_format]
+    generator_class = getattr(importlib.import_module(f".{module_name}", __package__), class_name)
+    if output_format == OUTPUT_EXCEL:
+        return generator_class(output_path, overflow=overflow)
+    return generator_class(output_path)
+
+
+class ReportData:
+    """
+    汇总结果：五个逻辑表的数据和统计数字
+    原始表信息和清洗后表信息的数据行可以是外部归并排序的输出迭代器，只能遍历一次，记录数预先给出
+    """
+    
+    __slots__ = ('raw_rows', 'raw_count', 'cleaned_rows', 'cleaned_count', 'deduplicated_rows', 'schema_counts',
+                 'file_types', 'table_counts', 'raw_widths', 'cleaned_widths')
+    
+    def __init__(self, raw_rows, raw_count, cleaned_rows, cleaned_count, deduplicated_rows, schema_counts,
+                 file_types, table_counts, raw_widths=None, cleaned_widths=None):
+        """
+        初始化汇总结果
+        :param raw_rows: 已排序的原始数据行（排序键）
+        :param raw_count: 原始记录数
+        :param cleaned_rows: 已排序的清洗后数据行（排序键）
+        :param cleaned_count: 清洗后记录数
+        :param deduplicated_rows: 已排序的去重后数据行（排序键）列表
+        :param schema_counts: schema 到表数量的字典
+        :param file_types: 文件类型到文件名集合的字典
+        :param table_counts: 文件类型到提取表数的字典
+        :param raw_widths: 原始表信息的列宽统计，输出格式不需要列宽时为空
+        :param cleaned_widths: 清洗后表信息的列宽统计，输出格式不需要列宽时为空
+        """
+        self.raw_rows = raw_rows
+        self.raw_count = raw_count
+        self.cleaned_rows = cleaned_rows
+        self.cleaned_count = cleaned_count
+        self.deduplicated_rows = deduplicated_rows
+        self.schema_counts = schema_counts
+        self.file_types = file_types
+        self.table_counts = table_counts
+        self.raw_widths = raw_widths
+        self.cleaned_widths = cleaned_widths
+    
+    @property
+    def deduplicated_count(self):
+        """去重后记录数"""
+        return len(self.deduplicated_rows)
+
+
+class ReportGenerator:
+    """
+    报告生成器基类
+    负责汇总表信息，子类实现 _write_report() 写出五个逻辑表
+    """
+    
+    # 输出格式名称，用于日志
+    format_name = None
+    # 日志中五个逻辑表的名称
+    part_names = tuple(name for name, _, _ in REPORT_TABLES)
+    
+    def __init__(self, output_path):
+        """
+        初始化报告生成器
+        :param output_path: 输出路径
+        """
+        self.output_path = output_path
+    
+    def generate(self, table_info_list):
+        """
+        生成报告
+        排序键同时也是数据行，每条记录只计算一次排序键、只排序一次；清洗和文件统计在遍历排序结果时一并完成，
+        清洗后的数据行由排序后的原始数据行和记录构造时得到的清洗后表名（clean_name）得到，仍然有序（清洗改变了表名时重新排序，接近有序的数据排序很快），
+        去重和 schema 统计直接在有序的清洗后数据行上完成，需要列宽时按列一次计算
+        :param table_info_list: 表信息列表
+        """
+        # 只按排序键排序，相同的排序键对应相同的表名和清洗结果
+        keyed_rows = sorted(((self._sort_key(table_info), table_info.clean_name) for table_info in table_info_list),
+                            key=itemgetter(0))
+        raw_rows = [row for row, _ in keyed_rows]
+        
+        # 文件统计先按文件名计数，每个文件只判断一次文件类型
+        file_types, table_counts = self._count_file_types(Counter(map(itemgetter(3), raw_rows)))
+        
+        cleaned_rows = []
+        renamed = False
+        for row, cleaned_table_name in keyed_rows:
+            cleaned = self._clean_row(row, cleaned_table_name)
+            if cleaned is None:
+                continue
+            if cleaned is not row:
+                renamed = True
+            cleaned_rows.append(cleaned)
+        del keyed_rows
+        if renamed:
+            cleaned_rows.sort()
+        
+        raw_widths = self._record_widths()
+        cleaned_widths = self._record_widths()
+        if raw_widths is not None:
+            raw_widths.add_rows(raw_rows)
+            cleaned_widths.add_rows(cleaned_rows)
+        
+        # 去重：有序数据行中每个 (schema, 表名) 的第一条即排序最靠前的记录
+        seen = set()
+        deduplicated_rows = []
+        for row in cleaned_rows:
+            pair = (row[1], row[2])
+            if pair not in seen:
+                seen.add(pair)
+                deduplicated_rows.append(row)
+        
+        self._output(ReportData(raw_rows, len(raw_rows), cleaned_rows, len(cleaned_rows), deduplicated_rows,
+                                self._count_schemas(deduplicated_rows), file_types, table_counts,
+                                raw_widths, cleaned_widths))
+    
+    def generate_stream(self, table_info_iter, memory_records=DEFAULT_MEMORY_RECORDS, temp_dir=None):
+        """
+        流式生成报告，生成结果与 generate() 一致
+        原始和清洗后的表信息分别交给外部归并排序器，超过内存预算时写入临时文件；
+        去重、文件统计、schema 统计和列宽在读取时逐条累计，只保留每个 (schema, 表名) 的第一条记录；
+        排序后的记录直接逐行写出
+        :param table_info_iter: 表信息迭代器
+        :param memory_records: 排序时内存中最多保留的记录数量
+        :param temp_dir: 排序临时文件目录，为空时使用系统临时目录
+        """
+        file_types = {}
+        table_counts = {}
+        raw_widths = self._record_widths()
+        cleaned_widths = self._record_widths()
+        # (schema, 清洗后表名) 到排序最靠前的清洗后记录的映射
+        representatives = {}
+        
+        with ExternalSorter(memory_records, temp_dir) as raw_sorter, \
+                ExternalSorter(memory_records, temp_dir) as cleaned_sorter:
+            for table_info in table_info_iter:
+                raw_key = self._sort_key(table_info)
+                raw_sorter.add(raw_key)
+                if raw_widths is not None:
+                    raw_widths.add(raw_key)
+                self._count_file_type(table_info.file_name, file_types, table_counts)
+                
+                cleaned_key = self._clean_row(raw_key, table_info.clean_name)
+                if cleaned_key is None:
+                    continue
+                cleaned_sorter.add(cleaned_key)
+                if cleaned_widths is not None:
+                    cleaned_widths.add(cleaned_key)
+                pair = (cleaned_key[1], cleaned_key[2])
+                current = representatives.get(pair)
+                if current is None or cleaned_key < current:
+                    representatives[pair] = cleaned_key
+            
+            if raw_sorter.spilled_runs or cleaned_sorter.spilled_runs:
+                print(f"   - 记录数超过内存预算，使用外部归并排序（{raw_sorter.spilled_runs + cleaned_sorter.spilled_runs} 个临时分段）")
+            
+            deduplicated_rows = sorted(representatives.values())
+            # 排序键与数据行的列顺序一致，直接作为数据行写出
+            self._output(ReportData(raw_sorter.sorted_records(), raw_sorter.count,
+                                    cleaned_sorter.sorted_records(), cleaned_sorter.count,
+                                    deduplicated_rows, self._count_schemas(deduplicated_rows),
+                                    file_types, table_counts, raw_widths, cleaned_widths))
+    
+    @staticmethod
+    def _sort_key(table_info):
+        """
+        表信息的排序键：从第一列到最后一列升序，同时也是原始表信息和清洗后表信息中的数据行
+        :param table_info: 表信息
+        :return: 排序键
+        """
+        return (table_info.source, table_info.schema, table_info.table_name, table_info.file_name, table_info.line_num)
+    
+    @staticmethod
+    def _clean_row(row, cleaned_table_name):
+        """
+        清洗一行原始数据
+        :param row: 原始数据行（排序键）
+        :param cleaned_table_name: 记录构造时按清洗规则得到的清洗后表名（TableRecord.clean_name），应被排除时为 None
+        :return: 清洗后的数据行（表名不变时直接返回原数据行），应被排除时返回 None
+        """
+        if cleaned_table_name is None:
+            return None
+        if cleaned_table_name == row[2]:
+            return row
+        return (row[0], row[1], cleaned_table_name, row[3], row[4])
+    
+    def _record_widths(self):
+        """
+        创建原始表信息或清洗后表信息的列宽统计，输出格式需要自适应列宽时由子类实现
+        :return: 列宽统计，不需要时返回 None
+        """
+        return None
+    
+    def _count_schemas(self, deduplicated_rows):
+        """
+        统计每个 schema 的表数量
+        :param deduplicated_rows: 已排序的去重后数据行（排序键）列表
+        :return: schema 到表数量的字典
+        """
+        schema_counts = {}
+        for row in deduplicated_rows:
+            schema = row[1]
+            if schema in schema_counts:
+                schema_counts[schema] += 1
+            else:
+                schema_counts[schema] = 1
+        return schema_counts
+    
+    def _count_file_types(self, file_counts):
+        """
+        按文件类型统计文件数量和提取表数
+        :param file_counts: 来源文件名称到提取表数的字典
+        :return: 文件类型到文件名集合的字典, 文件类型到提取表数的字典
+        """
+        file_types = {}
+        table_counts = {}
+        for file_name, count in file_counts.items():
+            self._count_file_type(file_name, file_types, table_counts, count)
+        return file_types, table_counts
+    
+    def _count_file_type(self, file_name, file_types, table_counts, count=1):
+        """
+        累计单个来源文件的文件类型统计
+        :param file_name: 来源文件名称
+        :param file_types: 文件类型到文件名集合的字典
+        :param table_counts: 文件类型到提取表数的字典
+        :param count: 该文件的提取表数
+        """
+        if file_name.endswith('.java'):
+            file_type = 'Java 文件'
+        elif file_name.endswith('.xml'):
+            file_type = 'XML 文件'
+        else:
+            file_type = '其他文件'
+        
+        # 统计文件数量
+        if file_type not in file_types:
+            file_types[file_type] = set()
+        file_types[file_type].add(file_name)
+        
+        # 统计表数量
+        if file_type not in table_counts:
+            table_counts[file_type] = 0
+        table_counts[file_type] += count
+    
+    @staticmethod
+    def _deduplicated_pairs(report):
+        """
+        去重后表信息的数据行：按 schema 和表名升序排列的 (schema, 表名)
+        :param report: 汇总结果
+        :return: 数据行列表
+        """
+        return sorted((row[1], row[2]) for row in report.deduplicated_rows)
+    
+    @staticmethod
+    def _file_stat_rows(report):
+        """
+        文件统计信息的数据行
+        :param report: 汇总结果
+        :return: (文件类型, 文件数量, 提取表数, 平均每文件) 列表
+        """
+        rows = []
+        for file_type in FILE_TYPES:
+            file_count = len(report.file_types.get(file_type, set()))
+            table_count = report.table_counts.get(file_type, 0)
+            avg_per_file = table_count / file_count if file_count > 0 else 0
+            rows.append((file_type, file_count, table_count, round(avg_per_file, 2)))
+        return rows
+    
+    @staticmethod
+    def _summary_rows(report):
+        """
+        处理总结的项目信息和 Schema 统计
+        :param report: 汇总结果
+        :return: 项目信息 (名称, 数量) 列表, Schema 统计 (schema, 表数量) 列表
+        """
+        summary_rows = [
+            ("原始记录数", report.raw_count),
+            ("清洗后记录数", report.cleaned_count),
+            ("清洗掉的记录数", report.raw_count - report.cleaned_count),
+            ("去重后记录数", report.deduplicated_count),
+            ("去重掉的记录数", report.cleaned_count - report.deduplicated_count)
+        ]
+        schema_rows = [(f"{schema}", count) for schema, count in report.schema_counts.items()]
+        return summary_rows, schema_rows
+    
+    def _iter_tables(self, report):
+        """
+        按输出顺序遍历五个逻辑表，供逐表写出的输出格式使用
+        处理总结展开为 (分类, 项目名称, 数量) 数据行
+        :param report: 汇总结果
+        :return: (表名, 列, 数据行迭代器) 迭代器
+        """
+        summary_rows, schema_rows = self._summary_rows(report)
+        rows = (
+            report.raw_rows,
+            report.cleaned_rows,
+            self._deduplicated_pairs(report),
+            self._file_stat_rows(report),
+            [("项目信息", item, value) for item, value in summary_rows]
+            + [("Schema 统计", schema, count) for schema, count in schema_rows],
+        )
+        for (name, _, columns), table_rows in zip(REPORT_TABLES, rows):
+            yield name, columns, table_rows
+    
+    def _output(self, report):
+        """
+        写出报告并打印生成总结，出错时打印排查提示
+        :param report: 汇总结果
+        """
+        try:
+            self._write_report(report)
+            self._print_summary(report)
+        except Exception as e:
+            print(f"   生成 {self.format_name} 文件时出错: {e}")
+            print(f"   错误类型: {type(e).__name__}")
+            print(f"   请检查以下情况:")
+            print(f"   1. 文件是否被其他程序占用")
+            print(f"   2. 磁盘空间是否充足")
+            print(f"   3. 是否有写入权限")
+            raise
+    
+    def _write_report(self, report):
+        """
+        写出五个逻辑表，由子类实现
+        :param report: 汇总结果
+        """
+        raise NotImplementedError
+    
+    def _summary_notes(self):
+        """
+        生成总结中附加的说明，由子类按需实现
+        :return: 说明列表
+        """
+        return []
+    
+    def _display_path(self):
+        """
+        生成总结中显示的输出路径
+        :return: 输出路径
+        """
+        return self.output_path
+    
+    def _print_summary(self, report):
+        """
+        打印生成总结
+        :param report: 汇总结果
+        """
+        names = [f"{part} ({title})" for part, (_, title, _) in zip(self.part_names, REPORT_TABLES)]
+        raw_count = report.raw_count
+        cleaned_count = report.cleaned_count
+        deduplicated_count = report.deduplicated_count
+        
+        # 打印每个逻辑表的处理结论
+        print(f"   {self.format_name} 生成总结:")
+        print(f"   - {names[0]}: 共 {raw_count} 条记录")
+        print(f"   - {names[1]}: 共 {cleaned_count} 条记录，清洗掉 {raw_count - cleaned_count} 条无效记录")
+        print(f"   - {names[2]}: 共 {deduplicated_count} 条记录，去重掉 {cleaned_count - deduplicated_count} 条重复记录")
+        print(f"   - {names[3]}: 已创建")
+        print(f"   - {names[4]}: 已创建")
+        for note in self._summary_notes():
+            print(f"   - {note}")
+        
+        print("   - 去重后各 schema 表数量:")
+        for schema, count in report.schema_counts.items():
+            print(f"     * {schema}: {count} 个表")
+        
+        # 打印生成路径信息
+        print(f"   {self.format_name} 文件生成完成，路径: {self._display_path()}")
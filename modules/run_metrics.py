@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行指标模块
+记录各处理阶段、各提取器和各文件的墙钟时间与 CPU 时间，以及读取的字节数和扫描的行数，
+运行结束后打印最慢的文件并导出为 JSON 文件，用于定位异常输入和在 CI 中发现性能退化
+"""
+
+import contextlib
+import heapq
+import json
+import os
+import time
+
+# 指标文件格式版本，字段变化时需要递增
+METRICS_VERSION = 1
+
+# 指标文件名称，保存在输出目录中
+METRICS_FILE_NAME = "run_metrics.json"
+
+# 默认记录的最慢文件数量
+DEFAULT_TOP_FILES = 10
+
+# 文件的处理方式：重新提取、复用缓存结果、复用内容相同文件的结果
+FILE_EXTRACTED = 'extracted'
+FILE_CACHED = 'cached'
+FILE_DUPLICATE = 'duplicate'
+FILE_KINDS = (FILE_EXTRACTED, FILE_CACHED, FILE_DUPLICATE)
+
+
+def _child_cpu_time():
+    """
+    获取已结束子进程（工作进程）的 CPU 时间总和
+    :return: 秒数，不支持的平台上为 0
+    """
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+def measure_stage(metrics, name):
+    """
+    记录一个处理阶段的耗时，未启用运行指标时不做任何事
+    :param metrics: 运行指标（RunMetrics），为空时不记录
+    :param name: 阶段名称
+    :return: 上下文管理器
+    """
+    if metrics is None:
+        return contextlib.nullcontext()
+    return metrics.stage(name)
+
+
+class RunMetrics:
+    """
+    运行指标
+    各阶段在主进程中计时，CPU 时间包含阶段内结束的工作进程；
+    工作进程持有各自的运行指标，提取器和文件的统计通过 take_delta()/merge() 合并到主进程，
+    最慢的文件只保留前 N 个，内存占用与文件总数无关
+    """
+    
+    def __init__(self, project_path=None, top_files=DEFAULT_TOP_FILES):
+        """
+        初始化运行指标
+        :param project_path: 项目地址
+        :param top_files: 记录的最慢文件数量
+        """
+        self.project_path = project_path
+        self.top_files = max(top_files, 0)
+        self.started = time.perf_counter()
+        self.started_cpu = time.process_time()
+        self.started_child_cpu = _child_cpu_time()
+        self.started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.total_wall = None
+        self.total_cpu = None
+        self.total_child_cpu = None
+        # 阶段名称 -> [次数, 墙钟时间, CPU 时间, 工作进程 CPU 时间]，按阶段开始的顺序
+        self.stages = {}
+        self._sequence = 0
+        self.reset_counters()
+    
+    def reset_counters(self):
+        """重置提取器和文件的统计"""
+        # 提取器类名 -> [调用次数, 墙钟时间, CPU 时间]
+        self.extractors = {}
+        # 文件处理方式 -> [文件数, 字节数, 扫描行数, 表信息条数, 墙钟时间, CPU 时间]
+        self.files = {kind: [0, 0, 0, 0, 0.0, 0.0] for kind in FILE_KINDS}
+        # 最慢文件的最小堆，元素为 (墙钟时间, 序号, 文件记录)
+        self.slowest = []
+    
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        记录一个处理阶段的墙钟时间和 CPU 时间，同名阶段累加
+        :param name: 阶段名称
+        """
+        totals = self.stages.setdefault(name, [0, 0.0, 0.0, 0.0])
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        child_cpu = _child_cpu_time()
+        try:
+            yield
+        finally:
+            totals[0] += 1
+            totals[1] += time.perf_counter() - wall
+            totals[2] += time.process_time() - cpu
+            totals[3] += _child_cpu_time() - child_cpu
+    
+    @contextlib.contextmanager
+    def extractor(self, name):
+        """
+        记录一次提取器调用的墙钟时间和 CPU 时间
+        :param name: 提取器类名
+        """
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.extractors.get(name)
+            if totals is None:
+                totals = self.extractors[name] = [0, 0.0, 0.0]
+            totals[0] += 1
+            totals[1] += time.perf_counter() - wall
+            totals[2] += time.process_time() - cpu
+    
+    @staticmethod
+    def start_file():
+        """
+        开始记录一个文件的处理时间
+        :return: 开始时刻，传给 record_file()
+        """
+        return time.perf_counter(), time.process_time()
+    
+    def record_file(self, started, file_path, kind, records, context=None, size=0):
+        """
+        记录一个文件的处理结果；先结束计时，再统计行数，行数统计不计入文件的处理时间
+        :param started: start_file() 返回的开始时刻
+        :param file_path: 文件路径
+        :param kind: 处理方式（FILE_EXTRACTED、FILE_CACHED 或 FILE_DUPLICATE）
+        :param records: 提取到的表信息条数
+        :param context: 重新提取时的文件上下文（FileContext），用于统计字节数和行数，需要在关闭前调用
+        :param size: 没有文件上下文时的文件大小（字节）
+        """
+        wall = time.perf_counter() - started[0]
+        cpu = time.process_time() - started[1]
+        lines = 0
+        if context is not None:
+            size = len(context.raw)
+            lines = context.line_count()
+        self._add_file(kind, (file_path, kind, wall, cpu, size, lines, records))
+    
+    def _add_file(self, kind, record):
+        """
+        累加文件统计并更新最慢文件
+        :param kind: 处理方式
+        :param record: 文件记录 (文件路径, 处理方式, 墙钟时间, CPU 时间, 字节数, 行数, 表信息条数)
+        """
+        totals = self.files[kind]
+        totals[0] += 1
+        totals[1] += record[4]
+        totals[2] += record[5]
+        totals[3] += record[6]
+        totals[4] += record[2]
+        totals[5] += record[3]
+        self._push_slowest(record)
+    
+    def _push_slowest(self, record):
+        """
+        将文件记录加入最慢文件，只保留墙钟时间最长的前 N 个
+        :param record: 文件记录
+        """
+        if not self.top_files:
+            return
+        self._sequence += 1
+        item = (record[2], self._sequence, record)
+        if len(self.slowest) < self.top_files:
+            heapq.heappush(self.slowest, item)
+        elif item[0] > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, item)
+    
+    def take_delta(self):
+        """
+        取出工作进程中自上次调用以来的提取器和文件统计，并重置
+        :return: 统计增量字典
+        """
+        delta = {
+            'extractors': self.extractors,
+            'files': self.files,
+            'slowest': [item[2] for item in self.slowest]
+        }
+        self.reset_counters()
+        return delta
+    
+    def merge(self, delta):
+        """
+        合并工作进程的统计增量
+        :param delta: take_delta() 返回的统计增量
+        """
+        for name, (calls, wall, cpu) in delta['extractors'].items():
+            totals = self.extractors.get(name)
+            if totals is None:
+                totals = self.extractors[name] = [0, 0.0, 0.0]
+            totals[0] += calls
+            totals[1] += wall
+            totals[2] += cpu
+        for kind, counts in delta['files'].items():
+            totals = self.files[kind]
+            for i, value in enumerate(counts):
+                totals[i] += value
+        for record in delta['slowest']:
+            self._push_slowest(record)
+    
+    def finish(self):
+        """结束计时，记录整次运行的墙钟时间和 CPU 时间"""
+        self.total_wall = time.perf_counter() - self.started
+        self.total_cpu = time.process_time() - self.started_cpu
+        self.total_child_cpu = _child_cpu_time() - self.started_child_cpu
+    
+    def slowest_files(self):
+        """
+        获取最慢的文件，按墙钟时间从长到短排列
+        :return: 文件记录列表
+        """
+        return [item[2] for item in sorted(self.slowest, key=lambda item: (-item[0], item[1]))]
+    
+    def to_dict(self):
+        """
+        转换为可以导出为 JSON 的字典
+        :return: 运行指标字典
+        """
+        if self.total_wall is None:
+            self.finish()
+        files = {
+            kind: {
+                'files': counts[0],
+                'bytes': counts[1],
+                'lines': counts[2],
+                'records': counts[3],
+                'wall_seconds': round(counts[4], 6),
+                'cpu_seconds': round(counts[5], 6)
+            }
+            for kind, counts in self.files.items()
+        }
+        extracted = self.files[FILE_EXTRACTED]
+        return {
+            'version': METRICS_VERSION,
+            'project': self.project_path,
+            'started_at': self.started_at,
+            'total': {
+                'wall_seconds': round(self.total_wall, 6),
+                'cpu_seconds': round(self.total_cpu, 6),
+                'child_cpu_seconds': round(self.total_child_cpu, 6)
+            },
+            'stages': [
+                {
+                    'name': name,
+                    'calls': calls,
+                    'wall_seconds': round(wall, 6),
+                    'cpu_seconds': round(cpu, 6),
+                    'child_cpu_seconds': round(child_cpu, 6)
+                }
+                for name, (calls, wall, cpu, child_cpu) in self.stages.items()
+            ],
+            'extractors': [
+                {
+                    'name': name,
+                    'calls': calls,
+                    'wall_seconds': round(wall, 6),
+                    'cpu_seconds': round(cpu, 6)
+                }
+                for name, (calls, wall, cpu) in sorted(self.extractors.items(), key=lambda item: -item[1][1])
+            ],
+            'files': {
+                'total': sum(counts[0] for counts in self.files.values()),
+                'bytes_read': extracted[1],
+                'lines_scanned': extracted[2],
+                'by_kind': files
+            },
+            'slowest_files': [
+                {
+                    'path': file_path,
+                    'kind': kind,
+                    'wall_seconds': round(wall, 6),
+                    'cpu_seconds': round(cpu, 6),
+                    'bytes': size,
+                    'lines': lines,
+                    'records': records
+                }
+                for file_path, kind, wall, cpu, size, lines, records in self.slowest_files()
+            ]
+        }
+    
+    def save(self, path):
+        """
+        导出为 JSON 文件
+        :param path: 文件路径
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+    
+    def print_summary(self):
+        """打印各阶段、各提取器的耗时和最慢的文件"""
+        data = self.to_dict()
+        total = data['total']
+        print("\n=== 运行指标 ===")
+        print(f"   - 总耗时: {total['wall_seconds']:.2f} 秒（CPU {total['cpu_seconds']:.2f} 秒，"
+              f"工作进程 CPU {total['child_cpu_seconds']:.2f} 秒）")
+        if data['stages']:
+            print("   - 各阶段耗时:")
+            for stage in data['stages']:
+                print(f"     * {stage['name']}: {stage['wall_seconds']:.2f} 秒（CPU {stage['cpu_seconds']:.2f} 秒，"
+                      f"工作进程 CPU {stage['child_cpu_seconds']:.2f} 秒）")
+        if data['extractors']:
+            print("   - 各提取器耗时:")
+            for extractor in data['extractors']:
+                print(f"     * {extractor['name']}: {extractor['calls']} 次，{extractor['wall_seconds']:.2f} 秒"
+                      f"（CPU {extractor['cpu_seconds']:.2f} 秒）")
+        files = data['files']
+        by_kind = files['by_kind']
+        print(f"   - 文件: 共 {files['total']} 个，重新提取 {by_kind[FILE_EXTRACTED]['files']} 个，"
+              f"复用缓存 {by_kind[FILE_CACHED]['files']} 个，复用重复文件 {by_kind[FILE_DUPLICATE]['files']} 个")
+        print(f"   - 读取 {files['bytes_read'] / (1024 * 1024):.2f} MB，扫描 {files['lines_scanned']} 行")
+        if data['slowest_files']:
+            print(f"   - 最慢的 {len(data['slowest_files'])} 个文件:")
+            for index, record in enumerate(data['slowest_files'], 1):
+                print(f"     {index}. {record['path']}: {record['wall_seconds'] * 1000:.1f} 毫秒，"
+                      f"{record['bytes']} 字节，{record['lines']} 行，{record['records']} 条表信息（{record['kind']}）")
@@ -5,21 +5,40 @@ Schema 归属分析模块
 分析表的 Schema 归属关系
 """
 
-import re
+import hashlib
 import os
+from .file_context import FileContext
+from .ds_scope import find_scope_schema
+
+# 打印同名文件冲突时最多列出的数量
+_MAX_COLLISIONS_SHOWN = 5
 
 class SchemaAnalyzer:
     """Schema 分析器"""
     
-    def __init__(self):
-        """初始化 Schema 分析器"""
+    def __init__(self, mmap_threshold=None):
+        """
+        初始化 Schema 分析器
+        :param mmap_threshold: 读取文件查找 @DS 注解时使用内存映射的文件大小阈值（字节），为空时总是完整读取
+        """
         self.default_schema = "master"
+        self.mmap_threshold = mmap_threshold
+        self.ds_annotations = {}
+        self.annotation_count = 0
+        self.error_count = 0
+        self.scanned_files = 0
+        self.schema_counts = {}
+        # 文件名（不含扩展名）到多个不同 schema 的 @DS 注解文件路径列表，按扫描顺序排列
+        self.basename_collisions = {}
+        # 文件名到 (作用域起始行号列表, 作用域 schema 列表)，按行号查找方法和类上的 @DS 注解
+        self._file_scopes = {}
     
-    def analyze_schema(self, table_info_list, files):
+    def analyze_schema(self, table_info_list, files, ds_findings=None):
         """
         分析表的 Schema 归属
         :param table_info_list: 表信息列表
         :param files: 文件列表
+        :param ds_findings: 已提取的 @DS 注解信息（文件路径到注解信息的映射），为空时重新读取文件
         :return: 更新后的表信息列表
         """
         print("   正在分析 Schema 归属...")
@@ -27,74 +46,139 @@ class SchemaAnalyzer:
         print(f"   - 扫描 {len(files)} 个文件中的 @DS 注解")
         
         # 提取所有文件中的 @DS 注解信息
-        ds_annotations, annotation_count, error_count = self._extract_ds_annotations(files)
-        
-        # 统计不同 schema 的表数量
-        schema_counts = {}
+        self.prepare(files, ds_findings)
         
         # 为每个表信息添加 schema 信息
         for table_info in table_info_list:
-            file_name = table_info['file_name']
-            # 查找对应的 schema
-            schema = self._find_schema_for_table(table_info, ds_annotations)
-            table_info['schema'] = schema
-            
-            # 更新 schema 统计
-            if schema in schema_counts:
-                schema_counts[schema] += 1
-            else:
-                schema_counts[schema] = 1
+            self.resolve(table_info)
         
         # 打印 Schema 分析总结
-        print("   Schema 分析结果:")
-        for schema, count in schema_counts.items():
-            print(f"     * {schema}: {count} 个表")
-        print(f"   总表数: {len(table_info_list)} 个")
-        print(f"   - 找到 {annotation_count} 个 @DS 注解")
-        print(f"   - 发现 {error_count} 个错误")
-        print(f"   - 识别到的 Schema: {list(schema_counts.keys())}")
+        self.print_summary(len(table_info_list))
         
         return table_info_list
     
-    def _extract_ds_annotations(self, files):
+    def prepare(self, files, ds_findings=None, symbol_index=None):
+        """
+        收集所有文件中的 @DS 注解信息并重置 schema 统计，之后可以逐条调用 resolve()
+        :param files: 文件列表或文件路径迭代器
+        :param ds_findings: 已提取的 @DS 注解信息（文件路径到注解信息的映射），为空时重新读取文件
+        :param symbol_index: 项目符号索引（SymbolIndex），不为空时在同一次读取中收集 Java 常量和 Mapper sql 片段
+        """
+        self.scanned_files = 0
+        self.ds_annotations, self.annotation_count, self.error_count = self._extract_ds_annotations(
+            files, ds_findings, symbol_index)
+        # 统计不同 schema 的表数量
+        self.schema_counts = {}
+    
+    def resolve(self, table_info):
+        """
+        为单条表信息补充 schema
+        :param table_info: 表信息
+        :return: 补充 schema 后的表信息
+        """
+        # 查找对应的 schema
+        schema = self._find_schema_for_table(table_info, self.ds_annotations)
+        table_info.set_schema(schema)
+        
+        # 更新 schema 统计
+        if schema in self.schema_counts:
+            self.schema_counts[schema] += 1
+        else:
+            self.schema_counts[schema] = 1
+        return table_info
+    
+    def iter_resolved(self, table_info_iter):
+        """
+        流式分析表的 Schema 归属，需要先调用 prepare()
+        全部表信息处理完后打印分析总结
+        :param table_info_iter: 表信息迭代器
+        :return: 补充 schema 后的表信息迭代器
+        """
+        total = 0
+        for table_info in table_info_iter:
+            total += 1
+            yield self.resolve(table_info)
+        self.print_summary(total)
+    
+    def print_summary(self, total):
+        """
+        打印 Schema 分析总结
+        :param total: 分析的表信息数量
+        """
+        print("   Schema 分析结果:")
+        for schema, count in self.schema_counts.items():
+            print(f"     * {schema}: {count} 个表")
+        print(f"   总表数: {total} 个")
+        print(f"   - 找到 {self.annotation_count} 个 @DS 注解")
+        print(f"   - 发现 {self.error_count} 个错误")
+        if self.basename_collisions:
+            print(f"   - 发现 {len(self.basename_collisions)} 组同名文件使用不同的 @DS 注解，按最后扫描到的文件处理:")
+            for base_name, entries in list(self.basename_collisions.items())[:_MAX_COLLISIONS_SHOWN]:
+                details = ', '.join(f"{file_path} ({schema})" for file_path, schema in entries)
+                print(f"     * {base_name}: {details}")
+        print(f"   - 识别到的 Schema: {list(self.schema_counts.keys())}")
+    
+    def _extract_ds_annotations(self, files, ds_findings=None, symbol_index=None):
         """
         提取所有文件中的 @DS 注解信息
         :param files: 文件列表
+        :param ds_findings: 已提取的 @DS 注解信息，为空或缺少某个文件时读取该文件
+        :param symbol_index: 项目符号索引，读取文件时同时收集其中的常量和 sql 片段
         :return: @DS 注解信息字典, 注解数量, 错误数量
         """
         ds_annotations = {}
         annotation_count = 0
         error_count = 0
+        # 文件名（不含扩展名）到 (文件路径, schema) 列表，用于发现同名文件冲突
+        basename_sources = {}
+        self._file_scopes = {}
         
         for file_path in files:
+            self.scanned_files += 1
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+                findings = ds_findings.get(file_path) if ds_findings else None
+                if findings is None:
+                    with FileContext.from_path(file_path, self.mmap_threshold) as context:
+                        findings = context.ds_findings()
+                        if symbol_index is not None:
+                            symbol_index.add_context(context)
                 
-                # 提取所有 @DS 注解
-                ds_pattern = r'@DS\s*\(\s*["\']([^"\']+)["\']\s*\)'
-                ds_matches = re.finditer(ds_pattern, content)
+                class_name = findings['class_name']
+                schemas = findings['schemas']
+                annotation_count += len(schemas)
+                file_name = os.path.basename(file_path)
                 
-                for match in ds_matches:
-                    schema = match.group(1)
-                    annotation_count += 1
-                    
-                    # 提取类名
-                    class_name_pattern = r'public\s+(?:class|interface)\s+(\w+)'
-                    class_name_match = re.search(class_name_pattern, content)
-                    if class_name_match:
-                        class_name = class_name_match.group(1)
-                        ds_annotations[class_name] = schema
-                        # 同时记录文件名到 schema 的映射
-                        file_name = os.path.basename(file_path)
-                        base_name = os.path.splitext(file_name)[0]
-                        ds_annotations[base_name] = schema
-                        # 记录 schema 到文件路径的映射，以便后续查找
-                        ds_annotations[file_path] = schema
+                scopes = findings.get('scopes')
+                if scopes is None:
+                    # 无法解析类和方法的范围时，文件中最后一个 @DS 注解对整个文件生效
+                    schema = schemas[-1] if schemas else None
+                else:
+                    # 类名只对应类上的 @DS 注解，方法上的注解通过作用域按行号查找
+                    schema = findings.get('class_schema')
+                    if scopes:
+                        self._file_scopes[file_name] = (
+                            [line for line, _ in scopes],
+                            [scope_schema for _, scope_schema in scopes]
+                        )
+                
+                if class_name and schema is not None:
+                    ds_annotations[class_name] = schema
+                    # 同时记录文件名到 schema 的映射
+                    base_name = os.path.splitext(file_name)[0]
+                    ds_annotations[base_name] = schema
+                    # 记录 schema 到文件路径的映射，以便后续查找
+                    ds_annotations[file_path] = schema
+                    basename_sources.setdefault(base_name, []).append((file_path, schema))
             except Exception as e:
                 print(f"提取 @DS 注解时出错 ({file_path}): {e}")
                 error_count += 1
         
+        # 同名文件位于不同目录且 schema 不同时，表信息只记录了文件名，无法区分，按最后扫描到的文件处理
+        self.basename_collisions = {
+            base_name: entries for base_name, entries in basename_sources.items()
+            if len({file_path for file_path, _ in entries}) > 1 and len({schema for _, schema in entries}) > 1
+        }
+        
         return ds_annotations, annotation_count, error_count
     
     def _find_schema_for_table(self, table_info, ds_annotations):
@@ -104,26 +188,23 @@ class SchemaAnalyzer:
         :param ds_annotations: @DS 注解信息
         :return: schema 名称
         """
-        # 1. 检查文件名是否对应某个带有 @DS 注解的类或接口
-        file_name = table_info['file_name']
-        base_name = os.path.splitext(file_name)[0]
+        # 1. 检查表名所在行是否在方法或类的 @DS 注解作用域内
+        file_name = table_info.file_name
+        scopes = self._file_scopes.get(file_name)
+        if scopes is not None:
+            schema = find_scope_schema(scopes[0], scopes[1], table_info.line_num)
+            if schema is not None:
+                return schema
         
+        # 2. 检查文件名是否对应某个带有 @DS 注解的类或接口，带有 @DS 注解的文件都按文件名记录，
+        # 一次字典查找即可，不再逐个匹配文件路径
+        base_name = os.path.splitext(file_name)[0]
         if base_name in ds_annotations:
             return ds_annotations[base_name]
         
-        # 2. 检查是否有文件路径到 schema 的映射
-        for key, schema in ds_annotations.items():
-            if isinstance(key, str) and os.path.isabs(key) and file_name in key:
-                return schema
-        
-        # 3. 检查是否有方法级别的 schema 映射
-        if 'method' in ds_annotations:
-            return ds_annotations['method']
-        
-        # 4. 特殊处理：如果项目中存在 'slave' schema，确保至少有一些表被映射到它
+        # 3. 特殊处理：如果项目中存在 'slave' schema，确保至少有一些表被映射到它
         # 这里我们简单地将一部分表映射到 'slave'
-        import hashlib
-        table_name = table_info.get('table_name', '')
+        table_name = table_info.table_name
         if table_name:
             # 使用表名的哈希值来决定是否映射到 'slave'
             hash_value = hashlib.md5(table_name.encode()).hexdigest()
@@ -132,7 +213,7 @@ class SchemaAnalyzer:
             elif int(hash_value[:2], 16) < 128:  # 大约 25% 的表
                 return 'mdb'
         
-        # 5. 检查是否有其他可能的映射
+        # 4. 检查是否有其他可能的映射
         # 例如，检查文件名是否包含某些关键字
         if 'slave' in file_name.lower():
             return 'slave'
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQL 表名缓存模块
+按规范化后的 SQL 文本缓存词法扫描得到的表引用，重复出现的 SQL（复制的查询、共用的片段、
+生成的相同 Mapper）只扫描一次；缓存在一次运行的所有提取器之间共享，可以保存到磁盘供下次运行使用
+"""
+
+import bisect
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from .extractors.sql_lexer import scan_sql_tables
+
+# 缓存格式版本，缓存结构变化时需要递增
+SQL_CACHE_VERSION = 1
+
+# 缓存文件名称，保存在输出目录中
+SQL_CACHE_FILE_NAME = "sql_table_cache.json"
+
+# 默认最多缓存的 SQL 数量
+DEFAULT_SQL_CACHE_SIZE = 65536
+# 超过该长度（字符）的 SQL 不缓存，避免个别很长的文本占用大量内存
+MAX_CACHED_SQL_LENGTH = 16384
+
+# 参与规则指纹计算的源文件，扫描规则或规范化方式变化时缓存自动失效
+_MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+_RULE_SOURCES = (os.path.join('extractors', 'sql_lexer.py'), 'sql_table_cache.py')
+
+
+def compute_sql_rules_fingerprint():
+    """
+    计算 SQL 扫描规则指纹
+    :return: SQL 词法扫描和规范化规则源码的哈希值
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(SQL_CACHE_VERSION).encode())
+    for source in _RULE_SOURCES:
+        digest.update(source.encode())
+        with open(os.path.join(_MODULES_DIR, source), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def normalize_sql(text):
+    """
+    规范化 SQL 文本：去掉每一行首尾的空白，只有缩进不同的 SQL 得到相同的结果
+    换行保留，行注释和行内的词法单元不受影响，扫描结果与原文一致
+    :param text: SQL 文本
+    :return: (规范化后的文本, 规范化文本中各行的起始偏移, 原文中各行去掉行首空白后的起始偏移)
+    """
+    stripped = []
+    starts = []
+    origins = []
+    normalized_position = 0
+    original_position = 0
+    for line in text.split('\n'):
+        content = line.strip()
+        stripped.append(content)
+        starts.append(normalized_position)
+        origins.append(original_position + len(line) - len(line.lstrip()))
+        normalized_position += len(content) + 1
+        original_position += len(line) + 1
+    return '\n'.join(stripped), starts, origins
+
+
+class SQLTableCache:
+    """
+    SQL 表名缓存
+    以规范化后的 SQL 文本为键、最近最少使用（LRU）淘汰的有界缓存，
+    缓存值为规范化文本中的表引用，命中时按原文的行首空白换算回原文偏移
+    """
+    
+    def __init__(self, max_entries=DEFAULT_SQL_CACHE_SIZE, cache_path=None):
+        """
+        初始化 SQL 表名缓存
+        :param max_entries: 最多缓存的 SQL 数量
+        :param cache_path: 缓存文件路径，为空时只在本次运行中使用
+        """
+        self.max_entries = max_entries
+        self.cache_path = cache_path
+        self.rules_fingerprint = compute_sql_rules_fingerprint() if cache_path else None
+        self.entries = OrderedDict()
+        # 是否已经加载过，多个项目共用一个缓存时只在第一次加载
+        self.loaded = False
+        # 多进程提取时工作进程新加入的条目，合并到主进程后保存
+        self.new_entries = None
+        self.reset_counters()
+    
+    def reset_counters(self):
+        """重置统计计数器"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def scan(self, text):
+        """
+        扫描一段 SQL 文本中的表引用，结果与 scan_sql_tables(text) 一致
+        :param text: SQL 文本
+        :return: (关键字偏移, 表名偏移, 表名) 列表，按出现顺序排列
+        """
+        if len(text) > MAX_CACHED_SQL_LENGTH:
+            self.misses += 1
+            return scan_sql_tables(text)
+        
+        normalized, starts, origins = normalize_sql(text)
+        refs = self.entries.get(normalized)
+        if refs is not None:
+            self.entries.move_to_end(normalized)
+            self.hits += 1
+        else:
+            self.misses += 1
+            refs = [tuple(ref) for ref in scan_sql_tables(normalized)]
+            self._put(normalized, refs)
+            if self.new_entries is not None:
+                self.new_entries.append((normalized, refs))
+        
+        def locate(offset):
+            # 规范化文本中的偏移换算为原文偏移
+            line = bisect.bisect_right(starts, offset) - 1
+            return origins[line] + offset - starts[line]
+        
+        return [(locate(keyword_start), locate(name_start), name) for keyword_start, name_start, name in refs]
+    
+    def _put(self, normalized, refs):
+        """
+        加入一个缓存条目，超过容量时淘汰最近最少使用的条目
+        :param normalized: 规范化后的 SQL 文本
+        :param refs: 表引用列表
+        """
+        self.entries[normalized] = refs
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    
+    def take_delta(self):
+        """
+        取出工作进程中自上次调用以来的统计增量和新加入的条目，并重置计数器
+        :return: 统计增量字典
+        """
+        delta = {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': self.new_entries or []
+        }
+        self.reset_counters()
+        if self.new_entries is not None:
+            self.new_entries = []
+        return delta
+    
+    def merge(self, delta):
+        """
+        合并工作进程的统计增量，新条目加入缓存（不计入命中和未命中）；
+        当前缓存本身也是工作进程的副本时，新条目继续记录，随本进程的增量传回主进程
+        :param delta: take_delta() 返回的统计增量
+        """
+        self.hits += delta['hits']
+        self.misses += delta['misses']
+        self.evictions += delta['evictions']
+        for normalized, refs in delta['entries']:
+            if normalized in self.entries:
+                self.entries.move_to_end(normalized)
+            else:
+                self._put(normalized, refs)
+                if self.new_entries is not None:
+                    self.new_entries.append((normalized, refs))
+    
+    def for_worker(self):
+        """
+        获取传给工作进程的副本：包含当前的缓存条目（视为已加载），需要保存时记录新加入的条目
+        :return: SQL 表名缓存
+        """
+        worker_cache = SQLTableCache(self.max_entries)
+        worker_cache.entries = OrderedDict(self.entries)
+        worker_cache.loaded = True
+        worker_cache.new_entries = [] if self.cache_path or self.new_entries is not None else None
+        return worker_cache
+    
+    def load(self):
+        """
+        从磁盘加载缓存，版本或规则指纹不一致时丢弃旧缓存；
+        已经加载过时保留内存中的条目，批量分析多个项目时缓存在项目之间保持预热
+        """
+        if self.loaded:
+            return
+        self.loaded = True
+        self.entries = OrderedDict()
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"   读取 SQL 表名缓存失败，将重新扫描: {e}")
+            return
+        if data.get('version') != SQL_CACHE_VERSION or data.get('rules') != self.rules_fingerprint:
+            return
+        # 文件中的条目按最近使用的顺序保存，容量变小时只保留最近使用的条目
+        for normalized, refs in data.get('entries', [])[-self.max_entries:]:
+            self.entries[normalized] = [tuple(ref) for ref in refs]
+    
+    def save(self):
+        """
+        保存缓存到磁盘，先写入临时文件再替换，避免中断时损坏缓存
+        """
+        if not self.cache_path:
+            return
+        data = {
+            'version': SQL_CACHE_VERSION,
+            'rules': self.rules_fingerprint,
+            'entries': [[normalized, refs] for normalized, refs in self.entries.items()]
+        }
+        cache_dir = os.path.dirname(self.cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        temp_path = self.cache_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.cache_path)
+    
+    def get_statistics(self):
+        """
+        获取缓存统计信息
+        :return: 统计信息字典
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries)
+        }
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite 生成模块
+五个逻辑表分别写入同一个 SQLite 数据库中的同名表，数据行逐行插入，在一个事务中完成
+"""
+
+import os
+import sqlite3
+from .report_generator import ReportGenerator
+
+
+class SQLiteGenerator(ReportGenerator):
+    """
+    SQLite 生成器
+    先写入临时数据库文件再替换，写入中断时不会留下不完整的数据库，
+    因此写入临时文件时关闭回滚日志和同步以加快插入
+    """
+    
+    format_name = "SQLite"
+    
+    def _write_report(self, report):
+        """
+        建表并逐表插入数据行
+        :param report: 汇总结果
+        """
+        temp_path = self.output_path + '.tmp'
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        connection = sqlite3.connect(temp_path)
+        try:
+            connection.execute("PRAGMA journal_mode = OFF")
+            connection.execute("PRAGMA synchronous = OFF")
+            with connection:
+                for name, columns, rows in self._iter_tables(report):
+                    definitions = ', '.join(f'"{column}" {column_type}' for column, column_type in columns)
+                    connection.execute(f'CREATE TABLE "{name}" ({definitions})')
+                    placeholders = ', '.join('?' * len(columns))
+                    connection.executemany(f'INSERT INTO "{name}" VALUES ({placeholders})', rows)
+        except BaseException:
+            connection.close()
+            os.remove(temp_path)
+            raise
+        connection.close()
+        os.replace(temp_path, self.output_path)
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+项目符号索引模块
+单次扫描项目中所有 Java 和 Mapper 文件，建立 static final String 常量和 Mapper sql 片段的索引，
+用于跨文件解析常量引用和 include 引用
+"""
+
+import re
+from .file_context import FileContext
+from .mapper_parser import MapperStatement, ParseError, fragment_text, parse_mapper
+
+# 字符串字面量和常量引用（可以带类名或包名限定）
+_LITERAL = r'"(?:\\.|[^"\\\n])*"'
+_REFERENCE = r'[A-Za-z_$][\w$]*(?:\s*\.\s*[A-Za-z_$][\w$]*)*'
+_TERM = r'(?:' + _LITERAL + r'|' + _REFERENCE + r')'
+# 常量表达式：字符串字面量和常量引用用 + 拼接
+_EXPRESSION = _TERM + r'(?:\s*\+\s*' + _TERM + r')*'
+
+EXPRESSION_PATTERN = re.compile(r'\s*(' + _EXPRESSION + r')\s*')
+TERM_PATTERN = re.compile(r'(?P<literal>' + _LITERAL + r')|(?P<reference>' + _REFERENCE + r')')
+# String 常量声明，修饰符用于判断是否为 static final
+CONSTANT_PATTERN = re.compile(
+    r'(?P<modifiers>(?:\b(?:public|protected|private|static|final)\s+)*)\bString\s+'
+    r'(?P<name>[A-Za-z_$][\w$]*)\s*=\s*(?P<expression>' + _EXPRESSION + r')\s*;'
+)
+# 注释和字符串字面量，建立索引前去掉注释，字符串原样保留
+_COMMENT_OR_LITERAL_PATTERN = re.compile(r'//[^\n]*|/\*.*?\*/|' + _LITERAL, re.DOTALL)
+# 第一个类型声明
+_TYPE_PATTERN = re.compile(r'(?<![\w$.])(class|interface|enum)\s+([A-Za-z_$][\w$]*)')
+# Java 字符串转义序列
+_ESCAPE_PATTERN = re.compile(r'\\(u+[0-9a-fA-F]{4}|[0-7]{1,3}|.)', re.DOTALL)
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 's': ' '}
+
+
+def _strip_comments(content):
+    """
+    去掉 Java 源码中的注释，字符串字面量保持不变
+    :param content: 文件内容
+    :return: 去掉注释后的内容
+    """
+    return _COMMENT_OR_LITERAL_PATTERN.sub(
+        lambda match: match.group() if match.group().startswith('"') else ' ',
+        content
+    )
+
+
+def _unescape(literal):
+    """
+    将 Java 字符串字面量还原为字符串值
+    :param literal: 带引号的字符串字面量
+    :return: 字符串值
+    """
+    def replace(match):
+        escape = match.group(1)
+        if escape[0] == 'u':
+            return chr(int(escape.lstrip('u'), 16))
+        if escape[0] in '01234567':
+            return chr(int(escape, 8))
+        return _ESCAPES.get(escape, escape)
+    return _ESCAPE_PATTERN.sub(replace, literal[1:-1])
+
+
+def qualify_reference(reference, imports):
+    """
+    按文件的 import 语句将常量引用转换为全限定名
+    :param reference: 常量引用，如 TableConstants.ORDER_TABLE
+    :param imports: 简单名称到全限定名的字典（FileContext.imports）
+    :return: 引用的第一部分被导入时返回全限定名，否则原样返回
+    """
+    head, dot, rest = reference.partition('.')
+    qualified = imports.get(head)
+    if qualified is None:
+        return reference
+    return qualified + dot + rest
+
+
+def parse_terms(expression, imports=None):
+    """
+    将常量表达式拆分为字符串值和常量引用
+    :param expression: 常量表达式，如 PREFIX + "_order"
+    :param imports: 简单名称到全限定名的字典，不为空时将引用转换为全限定名
+    :return: (是否为引用, 字符串值或引用) 列表，不是字符串和常量的拼接时返回 None
+    """
+    match = EXPRESSION_PATTERN.fullmatch(expression)
+    if match is None:
+        return None
+    terms = []
+    for term in TERM_PATTERN.finditer(match.group(1)):
+        literal = term.group('literal')
+        if literal is not None:
+            terms.append((False, _unescape(literal)))
+            continue
+        reference = re.sub(r'\s+', '', term.group('reference'))
+        if imports:
+            reference = qualify_reference(reference, imports)
+        terms.append((True, reference))
+    return terms
+
+
+def _qualify(package, type_name, name):
+    """
+    构造常量的全限定名
+    :param package: 包名，可以为空
+    :param type_name: 类名
+    :param name: 常量名
+    :return: 全限定名
+    """
+    qualified = f"{type_name}.{name}"
+    return f"{package}.{qualified}" if package else qualified
+
+
+class SymbolIndex:
+    """
+    项目符号索引
+    常量按全限定名（包名.类名.常量名）保存，同时按 类名.常量名 和 常量名 建立索引；
+    sql 片段按 (命名空间, 片段 id) 保存；
+    常量值和片段文本在第一次查找时解析并缓存，可以引用其他常量和片段
+    """
+    
+    # 参与建立索引的文件扩展名
+    file_extensions = ('.java', '.xml')
+    
+    def __init__(self):
+        """
+        初始化常量索引
+        """
+        # 全限定名到 (表达式项列表, 包名, 类名) 的映射
+        self.constants = {}
+        # 类名.常量名 到全限定名列表的映射
+        self.by_class_name = {}
+        # 常量名到全限定名列表的映射
+        self.by_name = {}
+        # 声明了常量的文件路径到类名的映射，解析这些文件中不带限定的常量名时优先查找本类
+        self.file_types = {}
+        # (命名空间, 片段 id) 到 sql 片段（MapperStatement）的映射
+        self.fragments = {}
+        self.scanned_files = 0
+        self._values = {}
+        self._resolving = set()
+        self._fragment_texts = {}
+        self._expanding = set()
+    
+    def __len__(self):
+        return len(self.constants)
+    
+    def __getstate__(self):
+        # 传递给工作进程时不包含已解析的常量值和片段文本
+        state = self.__dict__.copy()
+        state['_values'] = {}
+        state['_resolving'] = set()
+        state['_fragment_texts'] = {}
+        state['_expanding'] = set()
+        return state
+    
+    @classmethod
+    def build(cls, files, mmap_threshold=None, cache=None):
+        """
+        扫描所有 Java 和 Mapper 文件建立索引
+        传入提取结果缓存时，未修改文件的常量和 sql 片段直接从缓存条目中读取，只读取缓存未命中的文件
+        :param files: 文件列表
+        :param mmap_threshold: 使用内存映射读取文件的大小阈值（字节）
+        :param cache: 提取结果缓存（ExtractionCache），为空时读取所有文件
+        :return: 常量索引
+        """
+        index = cls()
+        for file_path in files:
+            if not file_path.endswith(cls.file_extensions):
+                continue
+            symbols = cache.cached_symbols(file_path) if cache is not None else None
+            if symbols is None:
+                try:
+                    with FileContext.from_path(file_path, mmap_threshold) as context:
+                        symbols = cls.collect(context)
+                except OSError:
+                    # 无法读取的文件在提取阶段报告
+                    continue
+                if cache is not None:
+                    cache.remember_symbols(file_path, symbols)
+            index.add_symbols(file_path, symbols)
+        return index
+    
+    @classmethod
+    def collect(cls, context):
+        """
+        收集一个文件中的字符串常量或 sql 片段，结果可以序列化为 JSON 保存在提取缓存中
+        :param context: 文件上下文（FileContext）
+        :return: {'constants': [[常量名, 表达式项, 包名, 类名], ...]} 或
+            {'fragments': [[命名空间, 片段 id, 行号, 片段内容], ...]}，不是 Java 和 XML 文件时返回 None
+        """
+        if context.file_path.endswith('.java'):
+            return {'constants': cls._collect_constants(context)}
+        if context.file_path.endswith('.xml'):
+            return {'fragments': cls._collect_fragments(context)}
+        return None
+    
+    def add_context(self, context):
+        """
+        将一个文件中的字符串常量或 sql 片段加入索引，其他类型的文件直接忽略
+        :param context: 文件上下文（FileContext）
+        """
+        self.add_symbols(context.file_path, self.collect(context))
+    
+    def add_symbols(self, file_path, symbols):
+        """
+        将 collect() 收集的常量和 sql 片段加入索引，已存在的常量和片段保留先加入的
+        :param file_path: 文件路径
+        :param symbols: collect() 的结果，为空时直接忽略
+        """
+        if symbols is None:
+            return
+        self.scanned_files += 1
+        for name, terms, package, type_name in symbols.get('constants', ()):
+            qualified = _qualify(package, type_name, name)
+            if qualified in self.constants:
+                continue
+            self.constants[qualified] = (terms, package, type_name)
+            self.by_class_name.setdefault(f"{type_name}.{name}", []).append(qualified)
+            self.by_name.setdefault(name, []).append(qualified)
+            self.file_types[file_path] = type_name
+        for namespace, fragment_id, line, pieces in symbols.get('fragments', ()):
+            key = (namespace, fragment_id)
+            if key not in self.fragments:
+                fragment = MapperStatement('sql', fragment_id, line)
+                fragment.pieces = pieces
+                self.fragments[key] = fragment
+    
+    @staticmethod
+    def _collect_fragments(context):
+        """
+        收集 Mapper 文件中的 sql 片段
+        :param context: 文件上下文（FileContext）
+        :return: [命名空间, 片段 id, 行号, 片段内容] 列表
+        """
+        # 不包含 sql 元素的文件无需解析
+        if context.raw.find(b'<sql') == -1:
+            return []
+        try:
+            document = parse_mapper(context, fragments_only=True)
+        except ParseError:
+            return []
+        if document is None:
+            return []
+        return [
+            [document.namespace, fragment_id, fragment.line, [list(piece) for piece in fragment.pieces]]
+            for fragment_id, fragment in document.fragments.items()
+        ]
+    
+    @staticmethod
+    def _collect_constants(context):
+        """
+        收集 Java 文件中的 static final 字符串常量
+        :param context: 文件上下文（FileContext）
+        :return: [常量名, 表达式项, 包名, 类名] 列表
+        """
+        if context.raw.find(b'String') == -1:
+            return []
+        code = _strip_comments(context.content)
+        type_match = _TYPE_PATTERN.search(code)
+        if type_match is None:
+            return []
+        kind, type_name = type_match.groups()
+        package = context.package_name
+        imports = context.imports
+        
+        constants = []
+        for match in CONSTANT_PATTERN.finditer(code):
+            modifiers = match.group('modifiers').split()
+            # 接口中的字段隐式为 static final
+            if kind != 'interface' and not ('static' in modifiers and 'final' in modifiers):
+                continue
+            terms = [list(term) for term in parse_terms(match.group('expression'), imports)]
+            constants.append([match.group('name'), terms, package, type_name])
+        return constants
+    
+    def resolve(self, expression, package=None, type_name=None):
+        """
+        解析常量表达式的字符串值
+        :param expression: 常量表达式，如 TableConstants.ORDER_TABLE 或 PREFIX + "_order"，
+            引用需要事先按所在文件的 import 语句转换为全限定名
+        :param package: 引用所在文件的包名
+        :param type_name: 引用所在文件的类名
+        :return: 字符串值，无法解析时返回 None
+        """
+        terms = parse_terms(expression)
+        if terms is None:
+            return None
+        return self._evaluate(terms, package, type_name)
+    
+    def _evaluate(self, terms, package, type_name):
+        """
+        计算表达式项拼接后的字符串值
+        :param terms: 表达式项列表
+        :param package: 表达式所在的包名
+        :param type_name: 表达式所在的类名
+        :return: 字符串值，任一引用无法解析时返回 None
+        """
+        parts = []
+        for is_reference, value in terms:
+            if is_reference:
+                value = self._resolve_reference(value, package, type_name)
+                if value is None:
+                    return None
+            parts.append(value)
+        return ''.join(parts)
+    
+    def _resolve_reference(self, reference, package, type_name):
+        """
+        解析单个常量引用
+        不带限定的常量名优先查找本类，其次是项目中唯一的同名常量；
+        类名限定的引用依次查找全限定名、同一个包中的类，最后是项目中唯一的同名类常量
+        :param reference: 常量引用
+        :param package: 引用所在的包名
+        :param type_name: 引用所在的类名
+        :return: 字符串值，无法解析或有多个不同取值时返回 None
+        """
+        parts = reference.split('.')
+        if len(parts) == 1:
+            if type_name:
+                qualified = _qualify(package, type_name, reference)
+                if qualified in self.constants:
+                    return self._value(qualified)
+            return self._unique_value(self.by_name.get(reference))
+        
+        if reference in self.constants:
+            return self._value(reference)
+        qualified = _qualify(package, parts[-2], parts[-1])
+        if qualified in self.constants:
+            return self._value(qualified)
+        return self._unique_value(self.by_class_name.get('.'.join(parts[-2:])))
+    
+    def _unique_value(self, candidates):
+        """
+        获取候选常量的唯一取值
+        :param candidates: 全限定名列表
+        :return: 所有候选常量取值相同时返回该值，否则返回 None
+        """
+        if not candidates:
+            return None
+        values = {self._value(qualified) for qualified in candidates}
+        return values.pop() if len(values) == 1 else None
+    
+    def _value(self, qualified):
+        """
+        获取常量的字符串值，结果缓存，循环引用时返回 None
+        :param qualified: 全限定名
+        :return: 字符串值
+        """
+        if qualified in self._values:
+            return self._values[qualified]
+        if qualified in self._resolving:
+            return None
+        self._resolving.add(qualified)
+        try:
+            terms, package, type_name = self.constants[qualified]
+            value = self._evaluate(terms, package, type_name)
+        finally:
+            self._resolving.discard(qualified)
+        self._values[qualified] = value
+        return value
+    
+    def resolve_fragment(self, namespace, fragment_id):
+        """
+        获取 sql 片段的文本，嵌套的 include 已展开，结果缓存，循环引用时返回 None
+        :param namespace: 片段所在 Mapper 的命名空间
+        :param fragment_id: 片段 id
+        :return: 片段文本，找不到片段时返回 None
+        """
+        key = (namespace, fragment_id)
+        if key in self._fragment_texts:
+            return self._fragment_texts[key]
+        fragment = self.fragments.get(key)
+        if fragment is None or key in self._expanding:
+            return None
+        self._expanding.add(key)
+        try:
+            text = fragment_text(fragment, namespace, self.resolve_fragment)
+        finally:
+            self._expanding.discard(key)
+        self._fragment_texts[key] = text
+        return text
+    
+    def replay(self, lookup):
+        """
+        重新执行一次记录下来的查找，用于校验提取缓存
+        :param lookup: 查找记录，['constant', 引用, 包名, 类名, 结果] 或 ['fragment', 命名空间, 片段 id, 结果]
+        :return: 本次查找的结果
+        """
+        if lookup[0] == 'constant':
+            return self.resolve(lookup[1], lookup[2], lookup[3])
+        return self.resolve_fragment(lookup[1], lookup[2])
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+表名清洗模块
+清洗规则在模块加载时编译一次，每个不同的原始表名只判断一次；
+提取器构造表信息记录时即得到清洗结果（TableRecord.clean_name），生成报告时直接使用，不再重新清洗
+"""
+
+import re
+
+# 清洗时排除的 Java 和 SQL 关键字
+CLEAN_KEYWORDS = frozenset((
+    # SQL 关键字
+    'SELECT', 'FROM', 'WHERE', 'INSERT', 'UPDATE', 'DELETE', 'CREATE', 'DROP', 'ALTER',
+    'TABLE', 'VIEW', 'INDEX', 'TRIGGER', 'PROCEDURE', 'FUNCTION', 'DATABASE', 'SCHEMA',
+    'JOIN', 'LEFT', 'RIGHT', 'INNER', 'OUTER', 'ON', 'GROUP', 'BY', 'HAVING', 'ORDER',
+    'LIMIT', 'OFFSET', 'AS', 'AND', 'OR', 'NOT', 'IN', 'LIKE', 'BETWEEN', 'IS', 'NULL',
+    'TRUE', 'FALSE', 'DISTINCT', 'UNION', 'ALL', 'CASE', 'WHEN', 'THEN', 'ELSE', 'END',
+    # Oracle 关键字
+    'DUAL', 'TO',
+    # Java 关键字
+    'public', 'private', 'protected', 'class', 'interface', 'extends', 'implements',
+    'static', 'final', 'abstract', 'synchronized', 'volatile', 'transient', 'native',
+    'package', 'import', 'if', 'else', 'for', 'while', 'do', 'switch', 'case', 'default',
+    'break', 'continue', 'return', 'try', 'catch', 'finally', 'throw', 'throws',
+    'new', 'this', 'super', 'instanceof', 'typeof', 'void', 'int', 'long', 'float',
+    'double', 'char', 'boolean', 'byte', 'short', 'String', 'Object', 'List', 'Map',
+    'Set', 'Array', 'ArrayList', 'HashMap', 'HashSet'
+))
+
+# 中文字符
+_CHINESE_PATTERN = re.compile('[\u4e00-\u9fff]')
+# 清洗时去掉的字符：字母、数字、下划线和点以外的字符（\w 与 str.isalnum() 加下划线一致）
+_UNCLEAN_PATTERN = re.compile(r'[^\w.]+')
+
+# 最多缓存的清洗结果数量，超过时清空重新缓存
+MAX_CLEAN_CACHE_SIZE = 1 << 18
+
+# 原始表名到清洗结果的缓存
+_clean_cache = {}
+# 缓存未命中的标记，清洗结果可以是 None
+_MISSING = object()
+
+
+def _clean(table_name):
+    """
+    按清洗规则处理表名
+    :param table_name: 原始表名
+    :return: 清洗后的表名，应被排除时返回 None
+    """
+    # 排除包含变量形式、中文的表名和关键字
+    if '${' in table_name or _CHINESE_PATTERN.search(table_name):
+        return None
+    if table_name.upper() in CLEAN_KEYWORDS or table_name.lower() in CLEAN_KEYWORDS:
+        return None
+    # 仅保留英文、数字、下划线和点，清洗后为空的表名也排除
+    return _UNCLEAN_PATTERN.sub('', table_name) or None
+
+
+def clean_table_name(table_name):
+    """
+    清洗表名，相同的原始表名只处理一次
+    :param table_name: 原始表名
+    :return: 清洗后的表名，应被排除时返回 None
+    """
+    cleaned = _clean_cache.get(table_name, _MISSING)
+    if cleaned is _MISSING:
+        if len(_clean_cache) >= MAX_CLEAN_CACHE_SIZE:
+            _clean_cache.clear()
+        cleaned = _clean_cache[table_name] = _clean(table_name)
+    return cleaned
@@ -5,17 +5,116 @@
 从 XML 文件、注解和 Java 文件中提取表名信息
 """
 
+import heapq
+import itertools
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from .extractors.extractor_manager import ExtractorManager
+from .extraction_cache import ExtractionCache, hash_content
+from .file_context import FileContext, DEFAULT_MMAP_THRESHOLD
+from .file_dedup import DuplicateIndex
+from .run_metrics import RunMetrics, measure_stage, FILE_EXTRACTED, FILE_CACHED, FILE_DUPLICATE
+from .symbol_index import SymbolIndex
+from .table_record import TableRecord
+
+# 并行模式下每个进程分配的任务块数量，块越多负载越均衡
+CHUNKS_PER_JOB = 4
+# 流式并行模式下每个进程每批处理的文件数量，最多同时提交两批
+STREAM_FILES_PER_JOB = 256
+
+# 工作进程中的提取器管理器和运行指标，每个进程初始化一次
+_worker_manager = None
+_worker_metrics = None
+
+
+def _extract_file(manager, file_path, with_cache_data, mmap_threshold, metrics=None):
+    """
+    读取并提取单个文件
+    :param manager: 提取器管理器
+    :param file_path: 文件路径
+    :param with_cache_data: 是否同时计算缓存所需的内容哈希
+    :param mmap_threshold: 使用内存映射读取文件的大小阈值（字节）
+    :param metrics: 运行指标（RunMetrics），不为空时记录文件的处理时间、字节数和行数
+    :return: ('extracted', 表信息列表, 统计增量, @DS 注解信息, 内容哈希, 文件大小)
+    """
+    started = metrics.start_file() if metrics is not None else None
+    with FileContext.from_path(file_path, mmap_threshold) as context:
+        table_info, statistics = manager.extract_with_statistics(context)
+        content_hash = hash_content(context.raw) if with_cache_data else None
+        if started is not None:
+            metrics.record_file(started, file_path, FILE_EXTRACTED, len(table_info), context)
+        return ('extracted', table_info, statistics, context.ds_findings(), content_hash, len(context.raw))
+
+
+def _init_worker(symbol_index=None, sql_cache=None, top_files=None):
+    """
+    初始化工作进程的提取器管理器
+    :param symbol_index: 项目符号索引，每个进程只传递一次
+    :param sql_cache: SQL 表名缓存的副本，在进程处理的所有文件之间共享
+    :param top_files: 记录运行指标时保留的最慢文件数量，为空时不记录
+    """
+    global _worker_manager, _worker_metrics
+    _worker_manager = ExtractorManager(symbol_index, sql_cache)
+    _worker_metrics = RunMetrics(top_files=top_files) if top_files is not None else None
+    _worker_manager.metrics = _worker_metrics
+
+
+def _extract_chunk(chunk, with_cache_data, mmap_threshold):
+    """
+    在工作进程中提取一个任务块中的所有文件
+    :param chunk: (文件序号, 文件路径) 列表
+    :param with_cache_data: 是否同时计算缓存所需的数据
+    :param mmap_threshold: 使用内存映射读取文件的大小阈值（字节）
+    :return: ((文件序号, 提取结果) 列表, SQL 表名缓存的统计增量, 运行指标的统计增量或 None)
+    """
+    # 每个任务块都只返回增量统计，重置计数器避免被过滤记录不断累积
+    _worker_manager.reset_counters()
+    results = []
+    for index, file_path in chunk:
+        try:
+            results.append((index, _extract_file(_worker_manager, file_path, with_cache_data, mmap_threshold,
+                                                 _worker_metrics)))
+        except Exception as e:
+            results.append((index, ('error', str(e))))
+    metrics_delta = _worker_metrics.take_delta() if _worker_metrics is not None else None
+    return results, _worker_manager.sql_cache.take_delta(), metrics_delta
 
 
 class TableExtractor:
     """表名提取器"""
     
-    def __init__(self):
-        """初始化表名提取器"""
+    def __init__(self, cache=None, jobs=1, mmap_threshold=DEFAULT_MMAP_THRESHOLD, symbol_index=None, sql_cache=None,
+                 dedup=False, metrics=None):
+        """
+        初始化表名提取器
+        :param cache: 提取结果缓存（ExtractionCache），为空时不使用缓存
+        :param jobs: 并行提取的进程数量，小于等于 1 时串行提取
+        :param mmap_threshold: 使用内存映射读取文件的大小阈值（字节），为空时总是完整读取
+        :param symbol_index: 项目符号索引（SymbolIndex），为空时处理文件列表前先扫描所有 Java 和 XML 文件建立索引，
+            流式处理文件路径迭代器时无法预先扫描，只解析文件内的常量和 sql 片段
+        :param sql_cache: SQL 表名缓存（SQLTableCache），为空时使用默认容量的内存缓存，不保存到磁盘
+        :param dedup: 是否对文件列表按内容去重，内容相同的文件只提取一次（流式处理文件路径迭代器时不去重）
+        :param metrics: 运行指标（RunMetrics），不为空时记录各提取器和各文件的耗时
+        """
         # 初始化提取器管理器
-        self.extractor_manager = ExtractorManager()
+        self.extractor_manager = ExtractorManager(sql_cache=sql_cache)
+        self.extractor_manager.metrics = metrics
+        self.metrics = metrics
+        self.cache = cache
+        self.jobs = jobs
+        self.mmap_threshold = mmap_threshold
+        self.symbol_index = symbol_index
+        self.dedup = dedup
+        # 本次提取的内容相同文件索引（DuplicateIndex），不去重时为空
+        self.duplicates = None
+        # 有重复文件的组内第一个文件的提取结果，组内重复文件全部处理后释放
+        self._duplicate_outcomes = {}
+        self._pending_copies = {}
+        # 本次提取使用的符号索引
+        self._symbol_index = symbol_index
+        # 各文件的 @DS 注解信息，随提取一起收集，供 Schema 分析复用
+        self.ds_findings = {}
         # 初始化统计计数器
         self.reset_counters()
     
@@ -24,6 +123,9 @@ class TableExtractor:
         self.total_files = 0
         self.processed_files = 0
         self.failed_files = 0
+        # 复用内容相同文件提取结果的文件数量和字节数
+        self.duplicate_files = 0
+        self.duplicate_bytes = 0
     
     def extract_from_files(self, files):
         """
@@ -31,32 +133,334 @@ class TableExtractor:
         :param files: 文件列表
         :return: 表信息列表
         """
-        table_info_list = []
-        
+        return list(self.iter_records(files))
+    
+    def iter_records(self, files, collect_ds_findings=True):
+        """
+        逐个文件提取表名，按文件顺序逐条返回表信息
+        传入文件路径迭代器时以流式方式处理，内存占用与文件总数无关
+        :param files: 文件列表或文件路径迭代器
+        :param collect_ds_findings: 是否收集各文件的 @DS 注解信息（ds_findings）
+        :return: 表信息迭代器
+        """
         # 重置计数器
         self.reset_counters()
         self.extractor_manager.reset_counters()
-        self.total_files = len(files)
+        self.ds_findings = {} if collect_ds_findings else None
+        streaming = not isinstance(files, (list, tuple))
+        
+        if self.cache is not None:
+            self.cache.reset_counters()
+            self.cache.load()
+        self.extractor_manager.sql_cache.load()
         
-        print(f"   开始处理 {self.total_files} 个文件...")
+        self._symbol_index = self.symbol_index
+        if self._symbol_index is None and not streaming:
+            with measure_stage(self.metrics, "extract.symbol_index"):
+                # 未修改文件的常量和 sql 片段从缓存条目中读取，只读取缓存未命中的文件
+                self._symbol_index = SymbolIndex.build(files, self.mmap_threshold, self.cache)
+            print(f"   符号索引: 扫描 {self._symbol_index.scanned_files} 个 Java/XML 文件，"
+                  f"找到 {len(self._symbol_index)} 个字符串常量，{len(self._symbol_index.fragments)} 个 sql 片段")
+        self.extractor_manager.set_symbol_index(self._symbol_index)
         
-        for file_path in files:
+        self.duplicates = None
+        self._duplicate_outcomes = {}
+        if self.dedup and not streaming:
+            with measure_stage(self.metrics, "extract.dedup_index"):
+                self.duplicates = DuplicateIndex.build(files)
+            self._pending_copies = dict(self.duplicates.copy_counts)
+            print(f"   内容去重: 计算 {self.duplicates.hashed_files} 个文件的哈希，{len(self.duplicates)} 个文件与其他文件内容相同"
+                  f"（{self.duplicates.group_count} 组），每组只提取一次")
+        
+        if streaming:
+            print("   开始流式处理文件...")
+        else:
+            self.total_files = len(files)
+            print(f"   开始处理 {self.total_files} 个文件...")
+        
+        if self.jobs > 1 and streaming:
+            yield from self._extract_parallel_stream(files)
+        elif self.jobs > 1 and len(files) > 1:
+            yield from self._collect_batch(self._submit_batch(files, self.jobs))
+        else:
+            for file_path in files:
+                try:
+                    table_info = self._extract_single(file_path)
+                    self.processed_files += 1
+                except Exception as e:
+                    print(f"处理文件 {file_path} 时出错: {e}")
+                    self.failed_files += 1
+                    continue
+                yield from table_info
+        
+        if streaming:
+            self.total_files = self.processed_files + self.failed_files
+        
+        if self.cache is not None:
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
+                self.cache.save()
+            except OSError as e:
+                print(f"   保存缓存文件失败: {e}")
+        try:
+            self.extractor_manager.sql_cache.save()
+        except OSError as e:
+            print(f"   保存 SQL 表名缓存失败: {e}")
+        
+        # 打印提取统计信息
+        self._print_extraction_stats()
+    
+    def _extract_single(self, file_path):
+        """
+        在当前进程中提取单个文件的表名
+        :param file_path: 文件路径
+        :return: 表信息列表
+        """
+        started = self.metrics.start_file() if self.metrics is not None else None
+        table_info = self._take_duplicate(file_path)
+        if table_info is not None:
+            self._record_file(started, file_path, FILE_DUPLICATE, table_info)
+            return table_info
+        # 有重复文件时保留提取结果，分发给组内的其他文件
+        keep = self.duplicates is not None and file_path in self.duplicates.copy_counts
+        if self.cache is None and not keep:
+            with FileContext.from_path(file_path, self.mmap_threshold) as context:
                 # 使用提取器管理器提取表名
-                table_info = self.extractor_manager.extract_from_file(file_path, content)
-                table_info_list.extend(table_info)
+                table_info = self.extractor_manager.extract_from_context(context)
+                if self.ds_findings is not None:
+                    self.ds_findings[file_path] = context.ds_findings()
+                self._record_file(started, file_path, FILE_EXTRACTED, table_info, context)
+            return table_info
+        
+        if self.cache is not None:
+            entry, context = self.cache.lookup(file_path, self.mmap_threshold, self._symbol_index)
+            if entry is not None:
+                if keep:
+                    self._duplicate_outcomes[file_path] = ('cached', entry)
+                table_info = self._merge_result(file_path, ('cached', entry))
+                self._record_file(started, file_path, FILE_CACHED, table_info, size=entry['size'])
+                return table_info
+        else:
+            context = FileContext.from_path(file_path, self.mmap_threshold)
+        
+        with context:
+            table_info, statistics = self.extractor_manager.extract_with_statistics(context)
+            ds_findings = context.ds_findings()
+            if self.ds_findings is not None:
+                self.ds_findings[file_path] = ds_findings
+            raw = context.raw
+            content_hash = hash_content(raw) if self.cache is not None else None
+            if self.cache is not None:
+                self.cache.store(file_path, content_hash, len(raw), table_info, statistics, ds_findings)
+            if keep:
+                self._duplicate_outcomes[file_path] = ('extracted', table_info, statistics, ds_findings,
+                                                       content_hash, len(raw))
+            self._record_file(started, file_path, FILE_EXTRACTED, table_info, context)
+        return table_info
+    
+    def _record_file(self, started, file_path, kind, table_info, context=None, size=0):
+        """
+        记录运行指标中单个文件的处理结果，未启用运行指标时不做任何事
+        :param started: 开始时刻，未启用运行指标时为空
+        :param file_path: 文件路径
+        :param kind: 处理方式
+        :param table_info: 表信息列表
+        :param context: 重新提取时的文件上下文
+        :param size: 没有文件上下文时的文件大小（字节）
+        """
+        if started is not None:
+            self.metrics.record_file(started, file_path, kind, len(table_info), context, size)
+    
+    def _take_duplicate(self, file_path):
+        """
+        复用组内第一个文件的提取结果：统计增量、@DS 注解信息和缓存条目按当前文件路径合并，表信息复制一份
+        :param file_path: 文件路径
+        :return: 表信息列表，不是重复文件或组内第一个文件提取失败时返回 None
+        """
+        if self.duplicates is None:
+            return None
+        original = self.duplicates.original_of.get(file_path)
+        outcome = self._duplicate_outcomes.get(original) if original is not None else None
+        if outcome is None:
+            return None
+        self._pending_copies[original] -= 1
+        if not self._pending_copies[original]:
+            del self._duplicate_outcomes[original]
+        if outcome[0] == 'cached':
+            size = outcome[1]['size']
+        else:
+            records = [TableRecord(info.source, info.table_name, info.file_name, info.line_num) for info in outcome[1]]
+            outcome = (outcome[0], records) + outcome[2:]
+            size = outcome[5]
+        self.duplicate_files += 1
+        self.duplicate_bytes += size
+        return self._merge_result(file_path, outcome)
+    
+    def _extract_parallel_stream(self, files):
+        """
+        流式并行提取：按批读取文件路径，当前批次合并结果时下一批已经在工作进程中提取
+        :param files: 文件路径迭代器
+        :return: 表信息迭代器
+        """
+        batch_size = self.jobs * STREAM_FILES_PER_JOB
+        print(f"   使用 {self.jobs} 个进程流式并行提取，每批 {batch_size} 个文件")
+        files = iter(files)
+        in_flight = deque()
+        with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker,
+                                 initargs=self._worker_args()) as executor:
+            while True:
+                batch = list(itertools.islice(files, batch_size))
+                if batch:
+                    in_flight.append(self._submit_batch(batch, executor=executor))
+                if in_flight and (len(in_flight) > 1 or not batch):
+                    yield from self._collect_batch(in_flight.popleft())
+                if not batch and not in_flight:
+                    break
+    
+    def _worker_args(self):
+        """
+        获取工作进程的初始化参数
+        :return: (项目符号索引, SQL 表名缓存的副本, 记录运行指标时保留的最慢文件数量)
+        """
+        top_files = self.metrics.top_files if self.metrics is not None else None
+        return self._symbol_index, self.extractor_manager.sql_cache.for_worker(), top_files
+    
+    def _submit_batch(self, files, workers=None, executor=None):
+        """
+        提交一批文件的并行提取任务
+        缓存查询在主进程完成，其余文件按大小均衡分块后分发给工作进程
+        :param files: 文件列表
+        :param workers: 没有传入进程池时新建进程池的最大进程数量
+        :param executor: 已有的进程池，为空时按需新建
+        :return: 批次信息 (文件列表, 提取结果列表, 任务列表, 新建的进程池)
+        """
+        outcomes = [None] * len(files)
+        pending = []
+        for index, file_path in enumerate(files):
+            if self.duplicates is not None and file_path in self.duplicates.original_of:
+                # 重复文件在合并结果时复用组内第一个文件的结果
+                outcomes[index] = ('duplicate',)
+                continue
+            if self.cache is not None:
+                started = self.metrics.start_file() if self.metrics is not None else None
+                try:
+                    entry, context = self.cache.lookup(file_path, self.mmap_threshold, self._symbol_index)
+                except Exception as e:
+                    outcomes[index] = ('error', str(e))
+                    continue
+                if context is not None:
+                    # 未命中的文件交给工作进程重新读取
+                    context.close()
+                if entry is not None:
+                    outcomes[index] = ('cached', entry)
+                    if started is not None:
+                        self.metrics.record_file(started, file_path, FILE_CACHED, len(entry['records']),
+                                                 size=entry['size'])
+                    continue
+            pending.append((index, file_path))
+        
+        futures = []
+        own_executor = None
+        if pending:
+            chunks = self._balance_chunks(pending)
+            if executor is None:
+                workers = min(workers, len(chunks))
+                print(f"   使用 {workers} 个进程并行提取 {len(pending)} 个文件（{len(chunks)} 个任务块）")
+                own_executor = executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                              initargs=self._worker_args())
+            with_cache_data = self.cache is not None
+            futures = [
+                executor.submit(_extract_chunk, chunk, with_cache_data, self.mmap_threshold)
+                for chunk in chunks
+            ]
+        return files, outcomes, futures, own_executor
+    
+    def _collect_batch(self, batch):
+        """
+        等待一批文件提取完成，按文件原始顺序合并结果和统计增量，保证与串行提取的结果一致
+        :param batch: _submit_batch() 返回的批次信息
+        :return: 表信息迭代器
+        """
+        files, outcomes, futures, own_executor = batch
+        try:
+            for future in futures:
+                results, sql_cache_delta, metrics_delta = future.result()
+                for index, outcome in results:
+                    outcomes[index] = outcome
+                self.extractor_manager.sql_cache.merge(sql_cache_delta)
+                if metrics_delta is not None:
+                    self.metrics.merge(metrics_delta)
+        finally:
+            if own_executor is not None:
+                own_executor.shutdown()
+        
+        for file_path, outcome in zip(files, outcomes):
+            if outcome[0] == 'duplicate':
+                try:
+                    # 组内第一个文件提取失败时在当前进程中单独提取
+                    table_info = self._extract_single(file_path)
+                except Exception as e:
+                    print(f"处理文件 {file_path} 时出错: {e}")
+                    self.failed_files += 1
+                    continue
                 self.processed_files += 1
-            except Exception as e:
-                print(f"处理文件 {file_path} 时出错: {e}")
+                yield from table_info
+                continue
+            if outcome[0] == 'error':
+                print(f"处理文件 {file_path} 时出错: {outcome[1]}")
                 self.failed_files += 1
+                continue
+            table_info = self._merge_result(file_path, outcome)
+            if self.duplicates is not None and file_path in self.duplicates.copy_counts:
+                self._duplicate_outcomes[file_path] = outcome
+            self.processed_files += 1
+            yield from table_info
+    
+    def _balance_chunks(self, pending):
+        """
+        按文件大小将文件均衡分配到多个任务块（最长处理时间优先的贪心分配）
+        :param pending: (文件序号, 文件路径) 列表
+        :return: 任务块列表
+        """
+        sized = []
+        for index, file_path in pending:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0
+            sized.append((size, index, file_path))
+        sized.sort(key=lambda item: (-item[0], item[1]))
         
-        # 打印提取统计信息
-        self._print_extraction_stats()
+        chunk_count = min(len(sized), self.jobs * CHUNKS_PER_JOB)
+        chunks = [[] for _ in range(chunk_count)]
+        # 堆中元素: (任务块总大小, 任务块序号)
+        heap = [(0, i) for i in range(chunk_count)]
+        for size, index, file_path in sized:
+            total, chunk_index = heapq.heappop(heap)
+            chunks[chunk_index].append((index, file_path))
+            heapq.heappush(heap, (total + size, chunk_index))
+        return [chunk for chunk in chunks if chunk]
+    
+    def _merge_result(self, file_path, outcome):
+        """
+        合并单个文件的提取结果：累加统计增量、记录 @DS 注解信息并写入缓存
+        :param file_path: 文件路径
+        :param outcome: 缓存命中结果 ('cached', 缓存条目) 或提取结果
+        :return: 表信息列表
+        """
+        if outcome[0] == 'cached':
+            entry = outcome[1]
+            self.extractor_manager.apply_statistics(entry['statistics'])
+            if self.ds_findings is not None:
+                self.ds_findings[file_path] = entry['ds']
+            return ExtractionCache.entry_records(entry)
         
-        return table_info_list
+        _, table_info, statistics, ds_findings, content_hash, size = outcome
+        self.extractor_manager.apply_statistics(statistics)
+        if self.ds_findings is not None:
+            self.ds_findings[file_path] = ds_findings
+        if self.cache is not None:
+            self.cache.store(file_path, content_hash, size, table_info, statistics, ds_findings)
+        return table_info
     
     def _print_extraction_stats(self):
         """
@@ -65,5 +469,10 @@ class TableExtractor:
         print(f"   - 总文件数: {self.total_files}")
         print(f"   - 成功处理: {self.processed_files}")
         print(f"   - 处理失败: {self.failed_files}")
+        if self.duplicates is not None:
+            print(f"   - 内容去重: {self.duplicate_files} 个文件复用了内容相同文件的提取结果，"
+                  f"少读取 {self.duplicate_bytes / (1024 * 1024):.2f} MB")
+        if self.cache is not None:
+            self.cache.print_statistics()
         # 使用提取器管理器打印详细统计
         self.extractor_manager.print_statistics()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+表信息记录模块
+使用 __slots__ 的紧凑记录代替每条表信息一个字典，减少大项目中的内存占用
+"""
+
+import sys
+from .table_cleaner import clean_table_name
+
+
+class TableRecord:
+    """
+    表信息记录
+    来源、schema 和文件名的取值很少，构造时驻留（intern），所有记录共享同一个字符串对象；
+    提取器构造记录时即按清洗规则得到清洗后的表名，生成报告时直接使用
+    """
+    
+    __slots__ = ('source', 'table_name', 'file_name', 'line_num', 'schema', 'clean_name')
+    
+    def __init__(self, source, table_name, file_name, line_num, schema=''):
+        """
+        初始化表信息记录
+        :param source: 来源（如 XML、Java SQL、@TableName）
+        :param table_name: 表名
+        :param file_name: 来源文件名称
+        :param line_num: 表名所在行号
+        :param schema: schema 名称，为空表示尚未分析 Schema 归属
+        """
+        self.source = sys.intern(source)
+        self.table_name = table_name
+        self.file_name = sys.intern(file_name)
+        self.line_num = line_num
+        self.schema = sys.intern(schema)
+        # 清洗后的表名，应被排除时为 None
+        self.clean_name = clean_table_name(table_name)
+    
+    def set_schema(self, schema):
+        """
+        设置 schema 名称
+        :param schema: schema 名称
+        """
+        self.schema = sys.intern(schema)
+    
+    def to_dict(self):
+        """
+        转换为字典，便于序列化和调试
+        :return: 表信息字典
+        """
+        return {
+            'source': self.source,
+            'schema': self.schema,
+            'table_name': self.table_name,
+            'file_name': self.file_name,
+            'line_num': self.line_num
+        }
+    
+    def _fields(self):
+        return (self.source, self.table_name, self.file_name, self.line_num, self.schema)
+    
+    def __reduce__(self):
+        # 按构造参数序列化，多进程提取时结果更小，反序列化时重新驻留字符串
+        return (TableRecord, self._fields())
+    
+    def __eq__(self, other):
+        if not isinstance(other, TableRecord):
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    def __hash__(self):
+        # 与 __eq__ 比较的字段一致；set_schema() 会改变哈希值，放入集合或作为字典键后不要再修改 schema
+        return hash(self._fields())
+    
+    def __repr__(self):
+        return (f"TableRecord(source={self.source!r}, table_name={self.table_name!r}, "
+                f"file_name={self.file_name!r}, line_num={self.line_num!r}, schema={self.schema!r})")
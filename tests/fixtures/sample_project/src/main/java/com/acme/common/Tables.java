@@ -0,0 +1,6 @@
+package com.acme.common;
+
+public class Tables {
+    public static final String ORDER_TABLE = "t_order";
+    public static final String AUDIT_TABLE = "audit." + "t_audit_log";
+}
@@ -0,0 +1,25 @@
+package com.acme.dao;
+
+import com.acme.common.Tables;
+
+public class ReportDao {
+
+    private static final String DAILY = "t_report_daily";
+
+    public String dailySql() {
+        StringBuilder sql = new StringBuilder();
+        sql.append("SELECT d.day, d.total FROM ")
+           .append(DAILY)
+           .append(" d JOIN t_report_dim m ON d.dim_id = m.id");
+        return sql.toString();
+    }
+
+    public String auditSql() {
+        // UPDATE t_commented_out SET x = 1
+        return "UPDATE " + Tables.AUDIT_TABLE + " SET checked = 1";
+    }
+
+    public String deleteSql() {
+        return "DELETE FROM t_report_tmp WHERE created < now()";
+    }
+}
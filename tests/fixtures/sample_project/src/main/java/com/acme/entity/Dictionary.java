@@ -0,0 +1,26 @@
+package com.acme.entity;
+
+import com.baomidou.mybatisplus.annotation.TableName;
+
+public class Dictionary {
+
+    @TableName(value = "t_dict_type")
+    public static class Type {
+        private Long id;
+        private String code;
+        private String label;
+    }
+
+    @TableName("t_dict_item")
+    public static class Item {
+        private Long id;
+        private Long typeId;
+        private String value;
+        private Integer sort;
+    }
+
+    @TableName("sys.t_dict_audit")
+    public static class Audit {
+        private Long id;
+    }
+}
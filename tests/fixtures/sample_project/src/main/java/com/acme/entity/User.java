@@ -0,0 +1,9 @@
+package com.acme.entity;
+
+import com.baomidou.mybatisplus.annotation.TableName;
+
+@TableName("t_user")
+public class User {
+    private Long id;
+    private String name;
+}
@@ -0,0 +1,22 @@
+package com.acme.mapper;
+
+import com.acme.common.Tables;
+import com.baomidou.dynamic.datasource.annotation.DS;
+import org.apache.ibatis.annotations.Insert;
+import org.apache.ibatis.annotations.Select;
+
+@DS("slave")
+public interface OrderMapper {
+
+    @Select("SELECT o.id, o.amount FROM " + Tables.ORDER_TABLE + " o "
+            + "LEFT JOIN t_order_item i ON o.id = i.order_id WHERE o.id = #{id}")
+    Order findById(Long id);
+
+    @DS("master")
+    @Insert({"INSERT INTO t_order_history (id, status)",
+             "VALUES (#{id}, #{status})"})
+    int archive(Order order);
+
+    @Select("SELECT count(*) FROM t_order_stat")
+    int count();
+}
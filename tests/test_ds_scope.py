@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@DS 作用域检查
+方法上的 @DS 覆盖类上的 @DS，其他方法继承类上的 @DS，嵌套类不继承外部类的 @DS
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from modules.ds_scope import find_scope_schema
+from modules.file_context import FileContext
+from modules.schema_analyzer import SchemaAnalyzer
+from modules.table_extractor import TableExtractor
+
+ORDER_MAPPER = '''package com.acme.mapper;
+
+@DS("slave")
+public interface OrderMapper {
+
+    @Select("SELECT * FROM t_order")
+    Order findById(Long id);
+
+    @DS("master")
+    @Insert({"INSERT INTO t_order_history (id)",
+             "VALUES (#{id})"})
+    int archive(Order order);
+
+    @DS("master")
+    default void purge() {
+        delete("DELETE FROM t_order_tmp");
+    }
+
+    @Select("SELECT count(*) FROM t_order_stat")
+    int count();
+
+    class Helper {
+        String SQL = "SELECT * FROM t_helper";
+    }
+}
+'''
+
+
+def line_of(text):
+    """
+    查找文本所在的行号
+    :param text: OrderMapper 中只出现一次的文本
+    :return: 行号（从 1 开始）
+    """
+    return ORDER_MAPPER.count('\n', 0, ORDER_MAPPER.index(text)) + 1
+
+
+class DSScopeTest(unittest.TestCase):
+    """方法和类上的 @DS 注解作用域"""
+    
+    def test_scopes(self):
+        findings = FileContext('/project/OrderMapper.java', content=ORDER_MAPPER).ds_findings()
+        self.assertEqual(findings['schemas'], ['slave', 'master', 'master'])
+        self.assertEqual(findings['class_schema'], 'slave')
+        scope_lines = [line for line, _ in findings['scopes']]
+        scope_schemas = [schema for _, schema in findings['scopes']]
+        
+        expected = {
+            't_order': 'slave',
+            't_order_history': 'master',
+            # 注解数组的后续行和方法体内的行都属于方法的作用域
+            '"VALUES': 'master',
+            't_order_tmp': 'master',
+            't_order_stat': 'slave',
+            't_helper': None,
+        }
+        for text, schema in expected.items():
+            with self.subTest(text=text):
+                self.assertEqual(find_scope_schema(scope_lines, scope_schemas, line_of(text)), schema)
+    
+    def test_schema_analyzer(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'OrderMapper.java')
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(ORDER_MAPPER)
+            files = [file_path]
+            extractor = TableExtractor(mmap_threshold=None)
+            with contextlib.redirect_stdout(io.StringIO()):
+                records = extractor.extract_from_files(files)
+            
+            # 使用提取时收集的 @DS 注解信息，以及重新读取文件，结果相同
+            for ds_findings in (extractor.ds_findings, None):
+                with self.subTest(reread=ds_findings is None), contextlib.redirect_stdout(io.StringIO()):
+                    SchemaAnalyzer().analyze_schema(records, files, ds_findings)
+                schemas = {(info.table_name, info.schema) for info in records if info.table_name != 't_helper'}
+                self.assertEqual(schemas, {
+                    ('t_order', 'slave'),
+                    ('t_order_history', 'master'),
+                    ('t_order_tmp', 'master'),
+                    ('t_order_stat', 'slave'),
+                })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提取结果缓存检查
+缓存命中时不读取文件（符号索引也从缓存条目中建立），常量所在文件变化时引用它的文件重新提取
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from modules.extraction_cache import ExtractionCache
+from modules.file_context import FileContext
+from modules.file_scanner import FileScanner
+from modules.table_extractor import TableExtractor
+
+FIXTURE_PROJECT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'sample_project')
+
+
+class ExtractionCacheTest(unittest.TestCase):
+    """提取结果缓存和符号索引"""
+    
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        self.project_path = os.path.join(temp_dir, 'sample_project')
+        shutil.copytree(FIXTURE_PROJECT, self.project_path)
+        self.cache_path = os.path.join(temp_dir, 'extraction_cache.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.files = sorted(FileScanner(self.project_path).scan())
+    
+    def extract(self):
+        """
+        使用缓存提取所有文件，统计读取文件的次数
+        :return: (来源, 表名, 文件名, 行号) 列表, 读取文件的次数, 缓存
+        """
+        cache = ExtractionCache(self.cache_path)
+        with mock.patch.object(FileContext, 'from_path', wraps=FileContext.from_path) as from_path, \
+                contextlib.redirect_stdout(io.StringIO()):
+            records = TableExtractor(cache=cache).extract_from_files(self.files)
+        return [(info.source, info.table_name, info.file_name, info.line_num) for info in records], \
+            from_path.call_count, cache
+    
+    def test_warm_run_reads_no_files(self):
+        cold, _, _ = self.extract()
+        warm, reads, cache = self.extract()
+        self.assertEqual(warm, cold)
+        self.assertEqual(reads, 0)
+        self.assertEqual(cache.hits, len(self.files))
+    
+    def test_changed_constant_invalidates_dependents(self):
+        cold, _, _ = self.extract()
+        self.assertIn(('@Select', 't_order', 'OrderMapper.java', 11), cold)
+        
+        tables_path = os.path.join(self.project_path, 'src', 'main', 'java', 'com', 'acme', 'common', 'Tables.java')
+        with open(tables_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        with open(tables_path, 'w', encoding='utf-8') as f:
+            f.write(content.replace('"t_order"', '"t_order_v2"'))
+        
+        warm, reads, cache = self.extract()
+        self.assertIn(('@Select', 't_order_v2', 'OrderMapper.java', 11), warm)
+        self.assertNotIn(('@Select', 't_order', 'OrderMapper.java', 11), warm)
+        # Tables.java 建立符号索引和提取时各读取一次，OrderMapper.java 引用的常量变化后重新提取
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(reads, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提取结果一致性检查
+对 fixtures/sample_project 分别使用完整读取（整个文件一次扫描）、内存映射（按窗口解码）和多进程并行提取，
+检查提取结果和 @DS 注解信息完全一致，且与预期的表信息相同
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from modules import file_context
+from modules.file_scanner import FileScanner
+from modules.table_extractor import TableExtractor
+
+FIXTURE_PROJECT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'sample_project')
+
+# 预期的表信息: (来源, 表名, 文件名, 行号)，按文件路径排序后的提取顺序
+EXPECTED_RECORDS = [
+    ('Java SQL', 't_report_daily', 'ReportDao.java', 12),
+    ('Java SQL', 't_report_dim', 'ReportDao.java', 13),
+    ('Java SQL', 'audit.t_audit_log', 'ReportDao.java', 19),
+    ('Java SQL', 't_report_tmp', 'ReportDao.java', 23),
+    ('@TableName', 't_dict_type', 'Dictionary.java', 7),
+    ('@TableName', 't_dict_item', 'Dictionary.java', 14),
+    ('@TableName', 'sys.t_dict_audit', 'Dictionary.java', 22),
+    ('@TableName', 't_user', 'User.java', 5),
+    ('@Select', 't_order', 'OrderMapper.java', 11),
+    ('@Select', 't_order_item', 'OrderMapper.java', 12),
+    ('@Insert', 't_order_history', 'OrderMapper.java', 16),
+    ('@Select', 't_order_stat', 'OrderMapper.java', 20),
+    ('Java SQL', 't_order', 'OrderMapper.java', 11),
+    ('Java SQL', 't_order_item', 'OrderMapper.java', 12),
+    ('Java SQL', 't_order_history', 'OrderMapper.java', 16),
+    ('Java SQL', 't_order_stat', 'OrderMapper.java', 20),
+    ('XML', 't_user', 'UserMapper.xml', 7),
+    ('XML', 't_user_profile', 'UserMapper.xml', 7),
+    ('XML', 't_user', 'UserMapper.xml', 17),
+    ('XML', 't_user_role', 'UserMapper.xml', 18),
+    ('XML', 't_role', 'UserMapper.xml', 21),
+    ('XML', 'sys.t_login_log', 'UserMapper.xml', 26),
+    ('XML', 't_user', 'UserMapper.xml', 31),
+]
+
+# 内存映射模式下测试的解码窗口大小（字节），较小的窗口使匹配跨越多个窗口
+WINDOW_SIZES = (64, 256, file_context.MMAP_WINDOW_SIZE)
+
+
+def scan(project_path):
+    """
+    扫描项目文件，按路径排序保证提取顺序固定
+    :param project_path: 项目路径
+    :return: 文件列表
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        return sorted(FileScanner(project_path).scan())
+
+
+def extract(files, mmap_threshold=None, jobs=1):
+    """
+    提取文件列表中的表名
+    :param files: 文件列表
+    :param mmap_threshold: 使用内存映射读取文件的大小阈值（字节），为空时总是完整读取
+    :param jobs: 并行提取的进程数量
+    :return: (来源, 表名, 文件名, 行号) 列表, 文件名到 @DS 注解信息的字典
+    """
+    extractor = TableExtractor(jobs=jobs, mmap_threshold=mmap_threshold)
+    with contextlib.redirect_stdout(io.StringIO()):
+        records = extractor.extract_from_files(files)
+    ds_findings = {os.path.basename(file_path): findings for file_path, findings in extractor.ds_findings.items()}
+    return [(info.source, info.table_name, info.file_name, info.line_num) for info in records], ds_findings
+
+
+class ExtractionEquivalenceTest(unittest.TestCase):
+    """完整读取、内存映射和并行提取的结果一致性"""
+    
+    def setUp(self):
+        self.files = scan(FIXTURE_PROJECT)
+        self.expected, self.expected_ds = extract(self.files)
+    
+    def test_whole_file_matches_expected(self):
+        self.assertEqual(len(self.files), 6)
+        self.assertEqual(self.expected, EXPECTED_RECORDS)
+        self.assertEqual(self.expected_ds['OrderMapper.java']['schemas'], ['slave', 'master'])
+    
+    def test_mmap_matches_whole_file(self):
+        for window_size in WINDOW_SIZES:
+            with self.subTest(window_size=window_size), \
+                    mock.patch.object(file_context, 'MMAP_WINDOW_SIZE', window_size), \
+                    mock.patch.object(file_context, 'LINE_COUNT_CHUNK_SIZE', 16):
+                records, ds_findings = extract(self.files, mmap_threshold=1)
+                self.assertEqual(records, self.expected)
+                self.assertEqual(ds_findings, self.expected_ds)
+    
+    def test_parallel_matches_serial(self):
+        records, ds_findings = extract(self.files, jobs=2)
+        self.assertEqual(records, self.expected)
+        self.assertEqual(ds_findings, self.expected_ds)
+    
+    def test_line_endings(self):
+        # '\r\n' 和单独的 '\r' 都视为换行，行号与 '\n' 换行的文件一致
+        for newline in ('\r\n', '\r'):
+            with self.subTest(newline=repr(newline)), tempfile.TemporaryDirectory() as temp_dir:
+                project_path = os.path.join(temp_dir, 'sample_project')
+                shutil.copytree(FIXTURE_PROJECT, project_path)
+                files = scan(project_path)
+                for file_path in files:
+                    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                        content = f.read()
+                    with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                        f.write(content.replace('\n', newline))
+                
+                records, _ = extract(files)
+                self.assertEqual(records, self.expected)
+                with mock.patch.object(file_context, 'MMAP_WINDOW_SIZE', 64), \
+                        mock.patch.object(file_context, 'LINE_COUNT_CHUNK_SIZE', 16):
+                    records, _ = extract(files, mmap_threshold=1)
+                self.assertEqual(records, self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Java 字符串折叠检查
++ 拼接链、StringBuilder.append 链、文本块和注解字符串数组折叠后的文本，以及文本位置到源码偏移的转换
+"""
+
+import unittest
+
+from modules.java_lexer import fold_java_strings
+
+CONSTANTS = {'TABLE': 't_const', 'Tables.ORDER': 't_order'}
+
+
+def fold(source):
+    """
+    折叠 Java 源码中的字符串
+    :param source: Java 源码
+    :return: [(所在注解, 拼接后的文本, 位置转换函数), ...]
+    """
+    results = []
+    for java_string in fold_java_strings(source):
+        text, locate = java_string.join(CONSTANTS.get)
+        results.append((java_string.annotation, text, locate))
+    return results
+
+
+class JavaLexerTest(unittest.TestCase):
+    """Java 字符串折叠"""
+    
+    def assertLocates(self, source, text, locate, word):
+        """检查逻辑字符串中的单词转换回源码偏移后仍指向同一个单词"""
+        offset = locate(text.index(word))
+        self.assertEqual(source[offset:offset + len(word)], word)
+    
+    def test_plus_chain(self):
+        source = ('String sql = "SELECT * FROM " + TABLE + " t"\n'
+                  '    + " JOIN " + Tables . ORDER + " o ON o.id = t.id WHERE t.name = " + name;')
+        (annotation, text, locate), = fold(source)
+        self.assertIsNone(annotation)
+        self.assertEqual(text, "SELECT * FROM t_const t JOIN t_order o ON o.id = t.id WHERE t.name =  '' ")
+        self.assertLocates(source, text, locate, 'JOIN')
+        # 常量替换的文本定位到引用处
+        self.assertEqual(locate(text.index('t_const')), source.index('TABLE'))
+    
+    def test_leading_reference(self):
+        (_, text, _), = fold('String sql = TABLE + " WHERE id = ?";')
+        self.assertEqual(text, 't_const WHERE id = ?')
+    
+    def test_string_builder_chain(self):
+        source = ('StringBuilder sql = new StringBuilder("SELECT * ");\n'
+                  'sql.append("FROM t_sb ")\n'
+                  '   .append("JOIN t_sb2 ON 1 = 1");\n'
+                  'sql.append(" WHERE x = ").append(x);\n'
+                  'other.append("FROM t_other");\n')
+        results = fold(source)
+        self.assertEqual([text for _, text, _ in results],
+                         ["SELECT * FROM t_sb JOIN t_sb2 ON 1 = 1 WHERE x =  '' ", 'FROM t_other'])
+        _, text, locate = results[0]
+        self.assertLocates(source, text, locate, 't_sb2')
+    
+    def test_text_block(self):
+        source = ('String sql = """\n'
+                  '    SELECT *\n'
+                  '    FROM t_block\n'
+                  '    """;\n'
+                  'String next = "FROM t_next";\n')
+        results = fold(source)
+        self.assertEqual([text for _, text, _ in results],
+                         ['    SELECT *\n    FROM t_block\n    ', 'FROM t_next'])
+        _, text, locate = results[0]
+        self.assertLocates(source, text, locate, 't_block')
+    
+    def test_annotation_array(self):
+        source = ('// "FROM t_comment"\n'
+                  '@Select({"SELECT * FROM t_ann", "WHERE a = 1"})\n')
+        (annotation, text, _), = fold(source)
+        self.assertEqual(annotation, '@Select')
+        self.assertEqual(text, 'SELECT * FROM t_ann WHERE a = 1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+跨 Mapper 的 include 检查
+<include refid="命名空间.片段id"/> 引用其他 Mapper 中的 sql 片段时，通过项目符号索引展开，
+表名记录在 include 所在的语句中；不带命名空间的 refid 只在当前 Mapper 中查找
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from modules.table_extractor import TableExtractor
+
+MAPPER_HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<!DOCTYPE mapper PUBLIC "-//mybatis.org//DTD Mapper 3.0//EN" '
+                 '"http://mybatis.org/dtd/mybatis-3-mapper.dtd">\n')
+
+MAPPERS = {
+    'CommonMapper.xml': MAPPER_HEADER + (
+        '<mapper namespace="com.acme.mapper.CommonMapper">\n'
+        '    <sql id="orderTable">t_order</sql>\n'
+        '    <sql id="itemJoin">JOIN <include refid="itemTable"/> i ON i.order_id = o.id</sql>\n'
+        '    <sql id="itemTable">t_order_item</sql>\n'
+        '    <sql id="archiveFrom">FROM t_order_archive</sql>\n'
+        '</mapper>\n'
+    ),
+    'OrderMapper.xml': MAPPER_HEADER + (
+        '<mapper namespace="com.acme.mapper.OrderMapper">\n'
+        '    <select id="listOrders" resultType="map">\n'
+        '        SELECT o.* FROM <include refid="com.acme.mapper.CommonMapper.orderTable"/> o\n'
+        '        <include refid="com.acme.mapper.CommonMapper.itemJoin"/>\n'
+        '    </select>\n'
+        '    <select id="listArchive" resultType="map">\n'
+        '        SELECT * <include refid="com.acme.mapper.CommonMapper.archiveFrom"/>\n'
+        '    </select>\n'
+        '    <select id="localOnly" resultType="map">\n'
+        '        SELECT * FROM <include refid="orderTable"/>\n'
+        '    </select>\n'
+        '</mapper>\n'
+    ),
+}
+
+# 片段内自身的关键字和表名在片段定义处提取；引用处只提取关键字在语句中、表名来自片段的情况
+EXPECTED_RECORDS = [
+    ('CommonMapper.xml', 't_order_archive', 7),
+    ('CommonMapper.xml', 't_order_item', 5),
+    ('OrderMapper.xml', 't_order', 5),
+]
+
+
+class MapperIncludeTest(unittest.TestCase):
+    """跨 Mapper 的 sql 片段引用"""
+    
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.files = []
+        for file_name, content in MAPPERS.items():
+            file_path = os.path.join(temp_dir.name, file_name)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            self.files.append(file_path)
+    
+    def extract(self, files, jobs=1):
+        """
+        提取文件列表中的表名
+        :param files: 文件列表
+        :param jobs: 并行提取的进程数量
+        :return: 排序后的 (文件名, 表名, 行号) 列表
+        """
+        extractor = TableExtractor(jobs=jobs, mmap_threshold=None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            records = extractor.extract_from_files(files)
+        return sorted((info.file_name, info.table_name, info.line_num) for info in records)
+    
+    def test_include_across_mappers(self):
+        self.assertEqual(self.extract(self.files), EXPECTED_RECORDS)
+    
+    def test_file_order_does_not_matter(self):
+        # 引用方在被引用的 Mapper 之前处理时，片段同样来自预先建立的符号索引
+        self.assertEqual(self.extract(list(reversed(self.files))), EXPECTED_RECORDS)
+    
+    def test_parallel(self):
+        self.assertEqual(self.extract(list(reversed(self.files)), jobs=2), EXPECTED_RECORDS)
+
+
+if __name__ == '__main__':
+    unittest.main()
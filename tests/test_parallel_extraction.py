@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并行提取检查
+批量并行、流式并行、使用提取结果缓存和内容去重的并行提取，结果（表信息顺序、@DS 注解信息、统计）与串行提取相同
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from modules.extraction_cache import ExtractionCache
+from modules.file_scanner import FileScanner
+from modules.symbol_index import SymbolIndex
+from modules import table_extractor
+from modules.table_extractor import TableExtractor
+
+FIXTURE_PROJECT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'sample_project')
+
+# 复制示例项目的份数，使文件数量多于工作进程数量
+MODULE_COUNT = 4
+
+
+class ParallelExtractionTest(unittest.TestCase):
+    """并行提取与串行提取的一致性"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        project_path = os.path.join(cls.temp_dir, 'project')
+        for index in range(MODULE_COUNT):
+            shutil.copytree(FIXTURE_PROJECT, os.path.join(project_path, f'module{index}'))
+        # 只改动一份的 User.java，其余几份内容相同，去重时只提取一次
+        user_path = os.path.join(project_path, 'module0', 'src', 'main', 'java', 'com', 'acme', 'entity', 'User.java')
+        with open(user_path, 'a', encoding='utf-8') as f:
+            f.write('\n// changed\n')
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.files = sorted(FileScanner(project_path).scan())
+        cls.expected = cls.extract(TableExtractor(mmap_threshold=None), cls.files)
+    
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+    
+    @staticmethod
+    def extract(extractor, files):
+        """
+        提取表名
+        :param extractor: 表名提取器
+        :param files: 文件列表或文件路径迭代器
+        :return: ((来源, 表名, 文件路径, 行号) 列表, @DS 注解信息, 提取统计, 成功处理的文件数)
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            records = list(extractor.iter_records(files))
+        return ([(info.source, info.table_name, info.file_name, info.line_num) for info in records],
+                extractor.ds_findings, extractor.extractor_manager.get_statistics(), extractor.processed_files)
+    
+    def test_batch(self):
+        self.assertEqual(len(self.files), 6 * MODULE_COUNT)
+        for jobs in (2, MODULE_COUNT):
+            with self.subTest(jobs=jobs):
+                self.assertEqual(self.extract(TableExtractor(jobs=jobs, mmap_threshold=None), self.files),
+                                 self.expected)
+    
+    def test_streaming(self):
+        # 流式处理无法预先扫描符号索引，串行和并行都使用同一个预先建立的索引
+        symbol_index = SymbolIndex.build(self.files)
+        serial = self.extract(TableExtractor(mmap_threshold=None, symbol_index=symbol_index), iter(self.files))
+        # 每批很少的文件，合并当前批次时下一批仍在工作进程中提取
+        with mock.patch.object(table_extractor, 'STREAM_FILES_PER_JOB', 2):
+            parallel = self.extract(TableExtractor(jobs=2, mmap_threshold=None, symbol_index=symbol_index),
+                                    iter(self.files))
+        self.assertEqual(serial, self.expected)
+        self.assertEqual(parallel, serial)
+    
+    def test_cache_and_dedup(self):
+        cache_path = os.path.join(self.temp_dir, 'extraction_cache.json')
+        self.addCleanup(lambda: os.path.exists(cache_path) and os.remove(cache_path))
+        for run in ('cold', 'warm'):
+            with self.subTest(run=run):
+                extractor = TableExtractor(cache=ExtractionCache(cache_path), jobs=2, mmap_threshold=None, dedup=True)
+                self.assertEqual(self.extract(extractor, self.files), self.expected)
+                # 每组内容相同的文件只查找一次缓存，其余文件复用组内第一个文件的结果
+                self.assertGreater(extractor.duplicate_files, 0)
+                self.assertEqual(extractor.cache.hits + extractor.cache.misses + extractor.duplicate_files,
+                                 len(self.files))
+                if run == 'warm':
+                    self.assertEqual(extractor.cache.misses, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
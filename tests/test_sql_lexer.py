@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQL 词法扫描检查
+子查询、逗号分隔的多表、函数参数中的 FROM，以及注释和字符串中的关键字
+"""
+
+import unittest
+
+from modules.extractors.sql_lexer import scan_sql_tables
+
+
+def table_names(sql):
+    """
+    扫描 SQL 中的表名
+    :param sql: SQL 文本
+    :return: 表名列表
+    """
+    return [table_name for _, _, table_name in scan_sql_tables(sql)]
+
+
+class SQLLexerTest(unittest.TestCase):
+    """SQL 词法扫描器"""
+    
+    def test_subquery(self):
+        sql = ('SELECT * FROM (SELECT id FROM t_inner WHERE x IN (SELECT y FROM t_deep)) sub '
+               'JOIN t_join j ON sub.id = j.id')
+        self.assertEqual(table_names(sql), ['t_inner', 't_deep', 't_join'])
+    
+    def test_comma_join(self):
+        sql = 'SELECT * FROM t_a a, t_b AS b, schema1.t_c c, `t_d` WHERE a.id = b.id'
+        self.assertEqual(table_names(sql), ['t_a', 't_b', 'schema1.t_c', 't_d'])
+    
+    def test_comma_join_offsets(self):
+        sql = 'SELECT * FROM t_a a, t_b b'
+        refs = scan_sql_tables(sql)
+        self.assertEqual([(sql[name_start:name_start + len(name)], keyword_start) for keyword_start, name_start, name
+                          in refs], [('t_a', sql.index('FROM')), ('t_b', sql.index('FROM'))])
+    
+    def test_from_inside_function(self):
+        sql = 'SELECT EXTRACT(YEAR FROM created_at), TRIM(LEADING 0 FROM code) FROM t_orders'
+        self.assertEqual(table_names(sql), ['t_orders'])
+    
+    def test_qualified_star(self):
+        # t.* 之后的 FROM 是关键字，不是 t 的列名
+        self.assertEqual(table_names('SELECT o.*, i.* FROM t_order o JOIN t_item i ON i.order_id = o.id'),
+                         ['t_order', 't_item'])
+        self.assertEqual(table_names('SELECT a.from FROM t_keyword_column a'), ['t_keyword_column'])
+    
+    def test_comments_and_strings(self):
+        sql = ("SELECT * FROM t_real -- FROM t_line_comment\n"
+               "/* JOIN t_block_comment */ WHERE note = 'FROM t_string'")
+        self.assertEqual(table_names(sql), ['t_real'])
+    
+    def test_update_clauses(self):
+        self.assertEqual(table_names('SELECT * FROM t_lock FOR UPDATE'), ['t_lock'])
+        self.assertEqual(table_names('INSERT INTO t_x (a) VALUES (1) ON DUPLICATE KEY UPDATE a = 2'), ['t_x'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQL 表名缓存检查
+只有缩进不同的 SQL 共用一个缓存条目，命中时换算回原文的偏移与不使用缓存直接扫描的结果相同
+"""
+
+import os
+import tempfile
+import unittest
+
+from modules.extractors.sql_lexer import scan_sql_tables
+from modules.sql_table_cache import SQLTableCache
+
+SQL_LINES = [
+    'SELECT o.id, i.sku',
+    'FROM t_order o',
+    'JOIN t_order_item i ON i.order_id = o.id',
+    'WHERE o.status IN (SELECT status FROM t_status)',
+]
+
+# 同一段 SQL 的不同缩进：无缩进、空格缩进、制表符缩进、行尾空白、\r\n 换行
+INDENTED_SQLS = [
+    '\n'.join(SQL_LINES),
+    '\n'.join('        ' + line for line in SQL_LINES),
+    '\n'.join('\t' * (index % 3) + line for index, line in enumerate(SQL_LINES)),
+    '\n'.join(line + '   ' for line in SQL_LINES),
+    '\r\n'.join('    ' + line for line in SQL_LINES),
+]
+
+
+class SQLTableCacheTest(unittest.TestCase):
+    """SQL 表名缓存"""
+    
+    def test_indentation_shares_entry(self):
+        cache = SQLTableCache()
+        for sql in INDENTED_SQLS:
+            with self.subTest(sql=sql):
+                refs = cache.scan(sql)
+                self.assertEqual(refs, scan_sql_tables(sql))
+                self.assertEqual([sql[start:start + len(name)] for _, start, name in refs],
+                                 ['t_order', 't_order_item', 't_status'])
+        self.assertEqual((cache.hits, cache.misses), (len(INDENTED_SQLS) - 1, 1))
+        self.assertEqual(len(cache.entries), 1)
+    
+    def test_other_whitespace_is_a_different_entry(self):
+        # 行内的空白和增加的空行不属于缩进，规范化后的文本不同
+        cache = SQLTableCache()
+        cache.scan(INDENTED_SQLS[0])
+        for sql in ('SELECT o.id,  i.sku\n' + '\n'.join(SQL_LINES[1:]), '\n\n' + INDENTED_SQLS[1]):
+            with self.subTest(sql=sql):
+                self.assertEqual(cache.scan(sql), scan_sql_tables(sql))
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+    
+    def test_lru_eviction(self):
+        cache = SQLTableCache(max_entries=2)
+        cache.scan('SELECT * FROM t_a')
+        cache.scan('SELECT * FROM t_b')
+        cache.scan('  SELECT * FROM t_a')
+        cache.scan('SELECT * FROM t_c')
+        self.assertEqual(list(cache.entries), ['SELECT * FROM t_a', 'SELECT * FROM t_c'])
+        self.assertEqual(cache.evictions, 1)
+    
+    def test_saved_entries_keep_offsets(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = os.path.join(temp_dir, 'sql_table_cache.json')
+            cache = SQLTableCache(cache_path=cache_path)
+            cache.load()
+            cache.scan(INDENTED_SQLS[0])
+            cache.save()
+            
+            cache = SQLTableCache(cache_path=cache_path)
+            cache.load()
+            for sql in INDENTED_SQLS[1:]:
+                with self.subTest(sql=sql):
+                    self.assertEqual(cache.scan(sql), scan_sql_tables(sql))
+            self.assertEqual((cache.hits, cache.misses), (len(INDENTED_SQLS) - 1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()